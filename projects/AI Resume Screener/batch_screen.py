@@ -0,0 +1,129 @@
+"""Screen a whole directory of resumes against one job description.
+
+    python batch_screen.py resumes/ --job job.txt --required "Python, SQL" --nice "AWS, NLP" --output results.csv
+
+Text extraction runs in a process pool, scoring is rule based, and the reasoning is generated by
+flan-t5 in padded batches. Each row of the results CSV carries its own per-stage timings.
+Text and results are cached by content hash (see cache.py), so re-running a directory only
+processes new resumes, and a new job posting reuses the text already extracted.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from cache import ScreeningCache, digest, result_key
+from screening import backend_name, build_prompt, extract_text_from_pdf, load_model, parse_skills, rule_based_score
+
+
+def _extract(path):
+    """Worker: (text, seconds, error) for one PDF"""
+    start = time.perf_counter()
+    try:
+        text, error = extract_text_from_pdf(path), ""
+    except Exception as exc:  # a corrupt file should not sink the whole batch
+        text, error = "", f"{type(exc).__name__}: {exc}"
+    return text, time.perf_counter() - start, error
+
+
+def list_pdfs(directory):
+    return sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.lower().endswith(".pdf"))
+
+
+def screen_directory(directory, job_description, required_skills, nice_to_have, processes=None,
+                     batch_size=8, backend=None, output=None, cache=None):
+    """Screen every PDF in `directory`; returns one row per resume, best score first"""
+    paths = list_pdfs(directory)
+    if not paths:
+        raise ValueError(f"No PDF files found in {directory}")
+
+    # Only PDFs whose text is not cached go to the extraction pool
+    hashes, texts = [], {}
+    for path in paths:
+        with open(path, "rb") as f:
+            hashes.append(digest(f.read()))
+        cached = cache.get_text(hashes[-1]) if cache else None
+        if cached is not None:
+            texts[path] = (cached, 0.0, "")
+    todo = [p for p in paths if p not in texts]
+    hash_of = dict(zip(paths, hashes))
+    if todo:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            for path, extracted in zip(todo, pool.map(_extract, todo, chunksize=4)):
+                texts[path] = extracted
+                if cache and not extracted[2]:
+                    cache.put_text(hash_of[path], extracted[0])
+
+    # Cache keys need the backend name without forcing the model to load
+    model_name = backend.name if backend else backend_name()
+    rows, prompts, keys = [], [], []
+    for path, pdf_hash in zip(paths, hashes):
+        text, extract_s, error = texts[path]
+        key = result_key(pdf_hash, job_description, required_skills, nice_to_have, model_name)
+        hit = cache.get_result(key) if cache and not error else None
+        start = time.perf_counter()
+        result = hit[0] if hit else rule_based_score(text, required_skills, nice_to_have)
+        rows.append({
+            "file": os.path.basename(path),
+            "score": result["score"],
+            "recommendation": result["recommendation"],
+            "found_skills": ", ".join(result["found_skills"]),
+            "missing_skills": ", ".join(result["missing_skills"]),
+            "reasoning": hit[1] if hit else None,
+            "error": error,
+            "cached": hit is not None,
+            "extract_s": extract_s,
+            "score_s": time.perf_counter() - start,
+            "generate_s": 0.0 if hit else None,
+        })
+        prompts.append(build_prompt(text, job_description, result))
+        keys.append((key, pdf_hash, result))
+
+    # Unreadable resumes keep their (zero) score but are not sent to the model
+    todo = [i for i, row in enumerate(rows) if not row["error"] and not row["cached"]]
+    if todo:
+        backend = backend or load_model()
+        start = time.perf_counter()
+        reasoning = backend.generate([prompts[i] for i in todo], max_new_tokens=120, batch_size=batch_size)
+        per_resume = (time.perf_counter() - start) / len(todo)
+        for i, text in zip(todo, reasoning):
+            rows[i]["reasoning"] = text
+            rows[i]["generate_s"] = per_resume
+            if cache:
+                cache.put_result(keys[i][0], keys[i][1], keys[i][2], text)
+
+    results = pd.DataFrame(rows).sort_values(["score", "file"], ascending=[False, True], ignore_index=True)
+    if output:
+        results.to_csv(output, index=False)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Screen a directory of PDF resumes")
+    parser.add_argument("directory")
+    parser.add_argument("--job", required=True, help="job description text, or a path to a file containing it")
+    parser.add_argument("--required", default="Python, SQL, Machine Learning")
+    parser.add_argument("--nice", default="AWS, NLP, Cloud")
+    parser.add_argument("--output", default="screening_results.csv")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--mode", choices=["eager", "int8", "onnx"], default=None, help="flan-t5 execution mode")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the screening cache")
+    args = parser.parse_args()
+
+    job = open(args.job, encoding="utf-8").read() if os.path.isfile(args.job) else args.job
+    start = time.perf_counter()
+    if args.mode:
+        os.environ["FLAN_T5_MODE"] = args.mode
+    results = screen_directory(args.directory, job, parse_skills(args.required), parse_skills(args.nice),
+                               processes=args.processes, batch_size=args.batch_size, output=args.output,
+                               cache=None if args.no_cache else ScreeningCache())
+    total = time.perf_counter() - start
+
+    print(results[["file", "score", "recommendation"]].to_string(index=False))
+    print(f"\nScreened {len(results)} resumes ({int(results['cached'].sum())} from cache) in {total:.1f}s -> {args.output}")
+    for stage in ["extract_s", "score_s", "generate_s"]:
+        print(f"  {stage[:-2]:<9} {results[stage].sum():8.2f}s total")
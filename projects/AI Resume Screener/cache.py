@@ -0,0 +1,117 @@
+"""Persistent cache of screening work, keyed on content hashes.
+
+Extracted text is keyed on the PDF bytes alone, so it is reused across job postings. Scores and
+reasoning are keyed on the PDF, job description, skill lists and model together. Both live in one
+SQLite file; once it outgrows `max_bytes` the least recently used entries are evicted.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "screening.sqlite")
+
+
+def digest(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def result_key(pdf_hash, job_description, required_skills, nice_to_have, model_name):
+    payload = json.dumps([pdf_hash, job_description.strip(), list(required_skills), list(nice_to_have), model_name])
+    return digest(payload)
+
+
+class ScreeningCache:
+    """Size-bounded LRU cache of extracted text and screening results"""
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=256 * 1024 ** 2):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Streamlit reruns the script on different threads, so one connection is shared under a lock
+        self.con = sqlite3.connect(path, check_same_thread=False)
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.execute("""CREATE TABLE IF NOT EXISTS texts (
+            pdf_hash TEXT PRIMARY KEY, text TEXT, bytes INTEGER, used REAL)""")
+        self.con.execute("""CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY, pdf_hash TEXT, result TEXT, reasoning TEXT, bytes INTEGER, used REAL)""")
+        self.con.commit()
+
+    def _get(self, table, column, key_column, key):
+        with self._lock:
+            row = self.con.execute(f"SELECT {column} FROM {table} WHERE {key_column} = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.con.execute(f"UPDATE {table} SET used = ? WHERE {key_column} = ?", (time.time(), key))
+            self.con.commit()
+            return row
+
+    def get_text(self, pdf_hash):
+        row = self._get("texts", "text", "pdf_hash", pdf_hash)
+        return row[0] if row else None
+
+    def put_text(self, pdf_hash, text):
+        with self._lock:
+            self.con.execute("INSERT OR REPLACE INTO texts VALUES (?, ?, ?, ?)",
+                             (pdf_hash, text, len(text.encode("utf-8")), time.time()))
+            self._evict()
+
+    def text(self, pdf_bytes, extract):
+        """(pdf_hash, text), running extract(pdf_bytes) only for PDFs never seen before"""
+        pdf_hash = digest(pdf_bytes)
+        text = self.get_text(pdf_hash)
+        if text is None:
+            text = extract(pdf_bytes)
+            self.put_text(pdf_hash, text)
+        return pdf_hash, text
+
+    def get_result(self, key):
+        """(rule_result, reasoning) or None"""
+        row = self._get("results", "result, reasoning", "key", key)
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def put_result(self, key, pdf_hash, rule_result, reasoning):
+        result = json.dumps(rule_result)
+        with self._lock:
+            self.con.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                             (key, pdf_hash, result, reasoning, len(result) + len(reasoning.encode("utf-8")), time.time()))
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries (texts and results alike) once over max_bytes"""
+        total = self.con.execute(
+            "SELECT COALESCE((SELECT SUM(bytes) FROM texts), 0) + COALESCE((SELECT SUM(bytes) FROM results), 0)").fetchone()[0]
+        if total > self.max_bytes:
+            rows = self.con.execute("""SELECT 'texts', pdf_hash, bytes, used FROM texts
+                UNION ALL SELECT 'results', key, bytes, used FROM results ORDER BY used""").fetchall()
+            # Trim to 90% so the next few inserts do not each trigger another scan
+            for table, key, size, _ in rows:
+                if total <= 0.9 * self.max_bytes:
+                    break
+                column = "pdf_hash" if table == "texts" else "key"
+                self.con.execute(f"DELETE FROM {table} WHERE {column} = ?", (key,))
+                total -= size
+        self.con.commit()
+
+    def size(self):
+        with self._lock:
+            return self.con.execute(
+                "SELECT COALESCE((SELECT SUM(bytes) FROM texts), 0) + COALESCE((SELECT SUM(bytes) FROM results), 0)").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self.con.execute("DELETE FROM texts")
+            self.con.execute("DELETE FROM results")
+            self.con.commit()
+
+    def close(self):
+        self.con.close()
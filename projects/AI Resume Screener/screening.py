@@ -0,0 +1,110 @@
+"""Resume screening logic shared by the Streamlit app and the batch pipeline."""
+import os
+import sys
+
+import fitz  # PyMuPDF
+
+from cache import result_key
+from skills import compile_matcher
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.metrics import timed
+
+MODEL_NAME = "google/flan-t5-small"
+
+
+def load_model(mode=None):
+    """The shared flan-t5 backend (eager, int8 or onnx; FLAN_T5_MODE picks the default)"""
+    # Imported here so PDF extraction workers never pay for importing torch
+    from src.inference import get_backend
+
+    return get_backend(MODEL_NAME, mode)
+
+
+def backend_name(mode=None):
+    """Seq2SeqBackend.name of load_model(mode), without loading it"""
+    return f"{MODEL_NAME}:{mode or os.environ.get('FLAN_T5_MODE', 'eager')}"
+
+
+@timed("resume.extract_text")
+def extract_text_from_pdf(pdf_file):
+    """Text of every page; pdf_file may be a path, raw bytes or an uploaded file object"""
+    if isinstance(pdf_file, (bytes, bytearray)):
+        doc = fitz.open(stream=pdf_file, filetype="pdf")
+    elif hasattr(pdf_file, "read"):
+        doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
+    else:
+        doc = fitz.open(pdf_file)
+    with doc:
+        return "".join(page.get_text() for page in doc).strip()
+
+
+def parse_skills(text):
+    return [s.strip() for s in text.split(",") if s.strip()]
+
+
+def rule_based_score(resume_text, required_skills, nice_to_have):
+    # One compiled matcher per skill list, reused across every resume screened against it
+    matcher = compile_matcher(tuple(required_skills) + tuple(nice_to_have))
+    # Presence is all the score needs; matcher.positions() has the spans when they are wanted
+    present = matcher.found(resume_text)
+    score = 0
+    found_skills = []
+    missing_skills = []
+
+    for skill in required_skills:
+        if skill.strip() in present:
+            score += 10
+            found_skills.append(skill)
+        else:
+            missing_skills.append(skill)
+
+    for skill in nice_to_have:
+        if skill.strip() in present:
+            score += 5
+            found_skills.append(skill)
+
+    final_score = min(score, 100)
+    recommendation = "Interview" if final_score >= 60 else "Reject"
+    return {
+        "score": final_score,
+        "found_skills": found_skills,
+        "missing_skills": missing_skills,
+        "recommendation": recommendation
+    }
+
+
+def build_prompt(resume_text, job_description, rule_result):
+    return f"""
+    You are a technical recruiter.
+    Job Description: {job_description}
+    Resume Summary: {resume_text[:1000]}
+    Score: {rule_result['score']}
+    Found Skills: {rule_result['found_skills']}
+    Recommendation: {rule_result['recommendation']}
+    
+    In 2 sentences, explain why the candidate should be {rule_result['recommendation']}.
+    """
+
+
+@timed("resume.generate_reasoning")
+def generate_reasoning(resume_text, job_description, rule_result, backend):
+    return backend.generate(build_prompt(resume_text, job_description, rule_result), max_new_tokens=120)
+
+
+def screen_resume(pdf_bytes, job_description, required_skills, nice_to_have, backend, cache=None):
+    """(resume_text, rule_result, reasoning, cached) for one PDF, served from `cache` when possible"""
+    if cache is None:
+        resume_text = extract_text_from_pdf(pdf_bytes)
+        rule_result = rule_based_score(resume_text, required_skills, nice_to_have)
+        return resume_text, rule_result, generate_reasoning(resume_text, job_description, rule_result, backend), False
+
+    pdf_hash, resume_text = cache.text(pdf_bytes, extract_text_from_pdf)
+    key = result_key(pdf_hash, job_description, required_skills, nice_to_have, backend.name)
+    hit = cache.get_result(key)
+    if hit is not None:
+        return resume_text, hit[0], hit[1], True
+    rule_result = rule_based_score(resume_text, required_skills, nice_to_have)
+    reasoning = generate_reasoning(resume_text, job_description, rule_result, backend)
+    cache.put_result(key, pdf_hash, rule_result, reasoning)
+    return resume_text, rule_result, reasoning, False
@@ -0,0 +1,272 @@
+"""Compiled skill matching for the resume screener.
+
+Terms must stand on their own: "SQL" does not match inside "NoSQL", and "C" does not match "C++".
+Terms of one or two characters ("R", "Go", "ML") are matched case-sensitively so they do not fire
+on ordinary words, and not when glued to another word by "&" or a hyphen ("R&D", "Objective-C",
+"Go-to"; "ML-based" still counts). Short skill lists, like the app's handful, are searched the way the old
+`skill in text` check did it: a substring search per term, with the boundary checks applied only
+where the term turns up. found() stops at each skill's first occurrence, so it costs about the
+same as that check. Long lists are matched in one pass over the resume's words, so the cost stops
+growing with the number of skills.
+
+    python skills.py --resumes 2000 --skills 6 10 50 200 1000
+"""
+import re
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+# Each group lists interchangeable names for one skill, compared case-insensitively. Abbreviations
+# that mean something else in a resume are left out: "CV" (the resume itself), "DL", "TS"
+SYNONYMS = [
+    ("Machine Learning", "ML"),
+    ("Artificial Intelligence", "AI"),
+    ("NLP", "Natural Language Processing"),
+    ("AWS", "Amazon Web Services"),
+    ("GCP", "Google Cloud", "Google Cloud Platform"),
+    ("Azure", "Microsoft Azure"),
+    ("Kubernetes", "K8s"),
+    ("JavaScript", "JS"),
+    ("PostgreSQL", "Postgres"),
+    ("Scikit-learn", "sklearn", "scikit learn"),
+    ("TensorFlow", "TF"),
+    ("Power BI", "PowerBI"),
+    ("CI/CD", "CICD", "Continuous Integration"),
+    ("Large Language Models", "LLM", "LLMs"),
+]
+
+SkillMatch = namedtuple("SkillMatch", ["skill", "term", "start", "end"])
+
+_SEP = " "  # spaces and hyphens inside a term match any run of whitespace or hyphens (PDF line breaks)
+_WORD = re.compile(r"\w+")
+# Up to this many distinct anchors, one substring search each beats a pass over every word
+SCAN_ALL_MAX_ANCHORS = 96
+
+
+def _key(term):
+    return re.sub(r"[\s\-]+", _SEP, term.strip().lower())
+
+
+def _anchor(key):
+    """What a search for the term looks for: its leading word, or its first chunk when it opens
+    with punctuation (".net", "#hashtag")"""
+    word = _WORD.match(key)
+    return word.group() if word else key.split(_SEP)[0]
+
+
+def _lowered(text):
+    # Lowercasing once beats re.IGNORECASE; a few characters change length when lowercased,
+    # and positions must index the original text
+    lowered = text.lower()
+    return lowered if len(lowered) == len(text) else "".join(ch.lower()[0] for ch in text)
+
+
+def _stands_alone(text, start):
+    """Nothing word-like (a word character, + or #) right before `start`"""
+    return not start or not (text[start - 1].isalnum() or text[start - 1] in "_+#")
+
+
+def _joined(text, start, end):
+    """A short term glued to a neighbouring word: "R&D", "Objective-C", "Go-to" (but not "ML-based",
+    where an acronym leads a compound)"""
+    before, after = text[max(start - 2, 0):start], text[end:end + 2]
+    if len(before) == 2 and before[1] in "&-" and before[0].isalnum():
+        return True
+    if len(after) == 2 and after[0] in "&-" and after[1].isalnum():
+        spelled = text[start:end]
+        return after[0] == "&" or not (len(spelled) > 1 and spelled.isupper())
+    return False
+
+
+class SkillMatcher:
+    """Matches a fixed set of skills against any number of resumes"""
+
+    def __init__(self, skills, synonyms=SYNONYMS):
+        self.skills = list(dict.fromkeys(s.strip() for s in skills if s.strip()))
+        groups = {}
+        for group in synonyms:
+            for term in group:
+                groups[_key(term)] = group
+
+        # normalized term -> skills it counts for, and how the term is spelled
+        self.terms, spellings = {}, {}
+        for skill in self.skills:
+            for term in groups.get(_key(skill), ()) + (skill,):
+                self.terms.setdefault(_key(term), {})[skill] = None
+                spellings.setdefault(_key(term), term.strip())
+        self.case_sensitive = {k: {t, t.upper()} for k, t in spellings.items() if len(k) <= 2}
+
+        by_anchor = {}
+        for key in sorted(self.terms, key=len, reverse=True):
+            by_anchor.setdefault(_anchor(key), []).append(key)
+        # anchor -> (regex for all its terms, longest first, so "node.js" wins over "node"; terms).
+        # Only the trailing guard lives in the regex: one that opens with a lookbehind (or \b)
+        # loses the engine's literal-prefix search and runs ~30x slower, so the leading side is
+        # checked in Python on the few spots the search turns up
+        self.anchors = {}
+        for anchor, keys in by_anchor.items():
+            body = "|".join(r"[\s\-]+".join(map(re.escape, key.split(_SEP))) for key in keys)
+            self.anchors[anchor] = (re.compile(rf"(?:{body})(?![\w+#])"), keys)
+        self._anchor_skills = {anchor: {s for key in keys for s in self.terms[key]}
+                               for anchor, (_, keys) in self.anchors.items()}
+        # Anchors the word pass cannot see, because they do not start with a word character
+        self._punct = [anchor for anchor in self.anchors if not _WORD.match(anchor)]
+
+    def _search(self, lowered, anchor):
+        """Matches of the anchor's terms that stand alone, found by substring search"""
+        regex, keys = self.anchors[anchor]
+        pos = lowered.find(anchor)
+        if pos < 0:  # a plain substring miss: the common case, and as cheap as the old check
+            return
+        if len(anchor) <= 2:
+            # "c" or "ai" sits inside many words; let the regex skip those spots in C
+            for m in regex.finditer(lowered, pos):
+                if _stands_alone(lowered, m.start()):
+                    yield m, keys
+            return
+        while pos >= 0:
+            if _stands_alone(lowered, pos):
+                m = regex.match(lowered, pos)
+                if m is not None:
+                    yield m, keys
+            pos = lowered.find(anchor, pos + 1)
+
+    def _scan_words(self, lowered):
+        """Matches starting at any word of the text: one pass, whatever the number of skills"""
+        anchors = self.anchors
+        for word in _WORD.finditer(lowered):
+            entry = anchors.get(word.group())
+            if entry is None:
+                continue
+            start = word.start()
+            if start and lowered[start - 1] in "+#":
+                continue
+            m = entry[0].match(lowered, start)
+            if m is not None:
+                yield m, entry[1]
+
+    def _matches(self, lowered):
+        if len(self.anchors) <= SCAN_ALL_MAX_ANCHORS:
+            for anchor in self.anchors:
+                yield from self._search(lowered, anchor)
+        else:
+            for anchor in self._punct:
+                yield from self._search(lowered, anchor)
+            yield from self._scan_words(lowered)
+
+    def _term(self, text, m, keys):
+        """Which term `m` matched, or None when a short term has the wrong case or is part of a compound"""
+        key = keys[0] if len(keys) == 1 else _key(m.group())
+        allowed = self.case_sensitive.get(key)
+        if allowed is None:
+            return key
+        if text[m.start():m.end()] not in allowed or _joined(text, m.start(), m.end()):
+            return None
+        return key
+
+    def finditer(self, text):
+        """SkillMatch for every occurrence of every skill, in order of position"""
+        spans = []
+        for m, keys in self._matches(_lowered(text)):
+            key = self._term(text, m, keys)
+            if key is not None:
+                spans.append((m.start(), m.end(), key))
+        spans.sort()
+        for start, end, key in spans:
+            for skill in self.terms[key]:
+                yield SkillMatch(skill, text[start:end], start, end)
+
+    def positions(self, text):
+        """skill -> [(start, end), ...] for every skill found in text"""
+        found = {}
+        for match in self.finditer(text):
+            found.setdefault(match.skill, []).append((match.start, match.end))
+        return found
+
+    def found(self, text):
+        """Set of skills that occur in text; stops looking for a skill at its first occurrence"""
+        lowered = _lowered(text)
+        found = set()
+        if len(self.anchors) > SCAN_ALL_MAX_ANCHORS:
+            for m, keys in self._matches(lowered):
+                key = self._term(text, m, keys)
+                if key is not None:
+                    found.update(self.terms[key])
+            return found
+        for anchor, skills in self._anchor_skills.items():
+            if skills <= found:  # e.g. "ml" once "machine learning" has been seen
+                continue
+            for m, keys in self._search(lowered, anchor):
+                key = self._term(text, m, keys)
+                if key is not None:
+                    found.update(self.terms[key])
+                    if skills <= found:
+                        break
+        return found
+
+
+@lru_cache(maxsize=64)
+def compile_matcher(skills):
+    """Cached SkillMatcher for a tuple of skills, so repeated screenings reuse its checks"""
+    return SkillMatcher(skills)
+
+
+# ==========================================
+# Benchmark against plain substring checks
+# ------------------------------------------
+def substring_found(resume_text, skills):
+    """The original check: one `skill in text` scan per skill"""
+    text = resume_text.lower()
+    return [s for s in skills if s.lower() in text]
+
+
+def benchmark(n_resumes=2000, skill_counts=(6, 10, 50, 200, 1000), words=600, seed=0):
+    """Resumes/sec of substring scans vs the compiled matcher as the skill list grows"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    catalog = [t for group in SYNONYMS for t in group] + [
+        "Python", "SQL", "NoSQL", "Java", "C", "C++", "C#", "R", "Go", "Rust", "Scala", "Spark",
+        "Hadoop", "Kafka", "Airflow", "Docker", "Linux", "Git", "Pandas", "NumPy", "PyTorch",
+        "Tableau", "Excel", "MongoDB", "Redis", "Flask", "Django", "FastAPI", "React", "Node.js"]
+    # Made-up tool names pad the catalog out to the largest skill list
+    catalog += [f"Tool{i}x" for i in range(max(skill_counts))]
+    vocab = ["experience", "team", "project", "data", "built", "led", "analysis", "pipeline",
+             "model", "reporting", "design", "research", "delivered", "stakeholders", "for", "and"]
+    pool = np.array(vocab * 40 + catalog[:200], dtype=object)
+    resumes = [" ".join(rng.choice(pool, words)) for _ in range(n_resumes)]
+
+    print(f"{n_resumes:,} resumes of {words} words")
+    print(f"{'skills':>7} {'substring/s':>12} {'found/s':>9} {'positions/s':>12} {'compile ms':>11} {'false hits':>11}")
+    for n_skills in skill_counts:
+        skills = tuple(catalog[:n_skills])
+
+        start = time.perf_counter()
+        old = [substring_found(r, skills) for r in resumes]
+        old_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        compile_s = time.perf_counter() - start
+        start = time.perf_counter()
+        new = [matcher.found(r) for r in resumes]
+        found_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for r in resumes:
+            matcher.positions(r)
+        positions_s = time.perf_counter() - start
+
+        # Substring hits the compiled matcher rejects, e.g. "SQL" inside "NoSQL"
+        false_hits = sum(len(set(o) - n) for o, n in zip(old, new))
+        print(f"{n_skills:>7} {n_resumes / old_s:>12,.0f} {n_resumes / found_s:>9,.0f} "
+              f"{n_resumes / positions_s:>12,.0f} {compile_s * 1000:>11.1f} {false_hits:>11,}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the compiled skill matcher")
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--skills", type=int, nargs="+", default=[6, 10, 50, 200, 1000])
+    parser.add_argument("--words", type=int, default=600)
+    args = parser.parse_args()
+    benchmark(args.resumes, args.skills, args.words)
@@ -0,0 +1,88 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+SimulationResult = namedtuple("SimulationResult", ["bands", "final_values", "invested"])
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _simulate_chunk(task):
+    """Simulate one chunk of SIP paths; returns (years, paths) portfolio values at each year end.
+
+    Works month by month, so memory is O(paths x trading days per month x assets) regardless of
+    how many years are simulated.
+    """
+    seed, n_paths, months, monthly, weights, method, hist, mu, chol, days = task
+    rng = np.random.default_rng(seed)
+    n_assets = len(weights)
+    value = np.zeros(n_paths)
+    checkpoints = np.empty((months // 12, n_paths), dtype=np.float32)
+
+    for m in range(months):
+        if method == "bootstrap":
+            # Resample whole historical days, keeping the cross-asset co-movement of each day
+            daily = hist[rng.integers(0, len(hist), size=(n_paths, days))]
+        else:
+            z = rng.standard_normal((n_paths * days, n_assets))
+            daily = (mu + z @ chol.T).reshape(n_paths, days, n_assets)
+        # Buy-and-hold within the month, rebalanced to target weights at each SIP instalment
+        growth = np.prod(1 + daily, axis=1) @ weights
+        value = (value + monthly) * growth
+        if (m + 1) % 12 == 0:
+            checkpoints[m // 12] = value
+    return checkpoints
+
+
+class MonteCarloSimulator:
+    """Monte Carlo SIP outcomes from the joint daily returns of the selected stocks.
+
+    method="bootstrap" resamples historical days; method="gaussian" draws correlated normals through
+    a Cholesky factor of the return covariance. Paths are generated in seeded chunks, so results are
+    reproducible and independent of the number of worker processes.
+    """
+
+    def __init__(self, returns, weights=None, method="bootstrap", seed=42, chunk_size=5_000, days_per_month=21):
+        returns = returns.dropna(how="any")
+        if returns.empty:
+            raise ValueError("need at least one row of complete daily returns")
+        if method not in ("bootstrap", "gaussian"):
+            raise ValueError(f"unknown method '{method}'")
+        n = returns.shape[1]
+        weights = np.full(n, 1 / n) if weights is None else np.asarray(weights, dtype=float)
+        self.weights = weights / weights.sum()
+        self.hist = returns.to_numpy(dtype=float)
+        self.mu = self.hist.mean(axis=0)
+        cov = np.atleast_2d(np.cov(self.hist, rowvar=False)) if len(self.hist) > 1 else np.zeros((n, n))
+        # Jitter keeps the factorization valid for (near-)singular sample covariances
+        self.chol = np.linalg.cholesky(cov + np.eye(n) * 1e-12)
+        self.method = method
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.days_per_month = days_per_month
+
+    def simulate(self, monthly, years, n_paths=100_000, processes=1):
+        """Percentile bands of portfolio value at every year end, plus the final value of each path"""
+        months = int(years) * 12
+        sizes = [min(self.chunk_size, n_paths - start) for start in range(0, n_paths, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        tasks = [(seed, size, months, monthly, self.weights, self.method, self.hist,
+                  self.mu, self.chol, self.days_per_month) for seed, size in zip(seeds, sizes)]
+
+        if processes == 1 or len(tasks) == 1:
+            chunks = [_simulate_chunk(t) for t in tasks]
+        else:
+            with ProcessPoolExecutor(processes or os.cpu_count()) as pool:
+                chunks = list(pool.map(_simulate_chunk, tasks))
+
+        values = np.concatenate(chunks, axis=1)
+        year_index = pd.Index(np.arange(1, months // 12 + 1), name="Year")
+        bands = pd.DataFrame(
+            np.percentile(values, PERCENTILES, axis=1).T,
+            index=year_index, columns=[f"P{p}" for p in PERCENTILES],
+        )
+        invested = pd.Series(monthly * 12 * year_index.to_numpy(), index=year_index, name="Invested")
+        return SimulationResult(bands, values[-1].astype(float), invested)
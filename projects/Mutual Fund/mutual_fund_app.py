@@ -4,9 +4,18 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.data import load_dataset
+from src.metrics import debug_panel, instrument_app, timed
+from montecarlo import MonteCarloSimulator
+from portfolio import PortfolioOptimizer
+from sip import project_cached
 
 # Set page config
 st.set_page_config(page_title="Mutual Fund Planner", layout="wide", page_icon="📈")
+instrument_app("mutual_fund")
 
 st.title("📈 Mutual Fund Investment Planner")
 st.markdown("Analyze Nifty 50 stocks, evaluate risk/reward, and plan your long-term investments.")
@@ -14,13 +23,22 @@ st.markdown("Analyze Nifty 50 stocks, evaluate risk/reward, and plan your long-t
 # File Path
 CSV_PATH = "nifty50_closing_prices.csv"
 
+@st.cache_resource
+def get_optimizer(prices):
+    # Built once for the whole universe; subsets reuse slices of the cached covariance matrix
+    return PortfolioOptimizer(prices.pct_change().dropna(how="all"))
+
+@st.cache_data(show_spinner=False)
+@timed("mutual_fund.monte_carlo")  # under the cache, so only real simulations are timed
+def run_monte_carlo(returns, monthly, years, n_paths, method, parallel):
+    sim = MonteCarloSimulator(returns, method=method)
+    return sim.simulate(monthly, years, n_paths, processes=None if parallel else 1)
+
 if not os.path.exists(CSV_PATH):
     st.error(f"Data file '{CSV_PATH}' not found.")
 else:
     # Load Data
-    data = pd.read_csv(CSV_PATH)
-    data['Date'] = pd.to_datetime(data['Date'])
-    data.fillna(method='ffill', inplace=True)
+    data = load_dataset("nifty50", CSV_PATH)  # typed, forward-filled, cached until the CSV changes
     
     # Sidebar - Stock Selection
     st.sidebar.header("Select Stocks")
@@ -53,6 +71,29 @@ else:
         })
         st.table(metrics_df)
 
+        # Portfolio Optimization
+        st.subheader("Portfolio Optimization")
+        optimizer = get_optimizer(data.set_index('Date')[all_stocks])
+        opt_stocks = [s for s in selected_stocks if s in optimizer.assets]
+        if len(opt_stocks) < 2:
+            st.info("Select at least two stocks with complete price history to optimize weights.")
+        else:
+            max_weight = st.slider("Max Weight per Stock (%)", int(np.ceil(100 / len(opt_stocks))), 100, 100)
+            bounds = (0.0, max_weight / 100)
+            frontier = optimizer.frontier(opt_stocks, bounds=bounds)
+            min_var = optimizer.min_variance(opt_stocks, bounds=bounds)
+            max_sharpe = optimizer.max_sharpe(opt_stocks, bounds=bounds)
+
+            opt_col1, opt_col2 = st.columns([2, 1])
+            fig_frontier = go.Figure()
+            fig_frontier.add_trace(go.Scatter(x=frontier['Volatility']*100, y=frontier['Return']*100, mode='lines', name='Efficient Frontier'))
+            for label, weights in [("Min Variance", min_var), ("Max Sharpe", max_sharpe)]:
+                ret, vol, _ = optimizer.stats(weights)
+                fig_frontier.add_trace(go.Scatter(x=[vol*100], y=[ret*100], mode='markers', marker=dict(size=12), name=label))
+            fig_frontier.update_layout(title="Efficient Frontier (Annualized)", xaxis_title="Volatility (%)", yaxis_title="Return (%)", template="plotly_dark")
+            opt_col1.plotly_chart(fig_frontier, use_container_width=True)
+            opt_col2.dataframe(pd.DataFrame({"Min Variance": min_var, "Max Sharpe": max_sharpe}).style.format("{:.1%}"), use_container_width=True)
+
         # Investment Simulator
         st.divider()
         st.header("Investment Simulator (SIP)")
@@ -62,11 +103,17 @@ else:
         investment_years = col2.slider("Investment Duration (Years)", 1, 30, 10)
         expected_annual_return = col3.slider("Expected Annual Return (%)", 5, 30, 15)
 
-        # Calculation
-        r = (expected_annual_return / 100) / 12
-        n = investment_years * 12
-        future_value = monthly_investment * (((1 + r)**n - 1) / r) * (1 + r)
-        total_invested = monthly_investment * n
+        with st.expander("Advanced: Step-up, Lumpsum & Inflation"):
+            adv1, adv2, adv3 = st.columns(3)
+            step_up = adv1.slider("Annual Step-up (%)", 0, 25, 0)
+            lumpsum = adv2.number_input("Initial Lumpsum (INR)", min_value=0, value=0, step=10000)
+            inflation = adv3.slider("Inflation (%)", 0.0, 10.0, 0.0, step=0.5)
+
+        # Calculation (memoized per parameter tuple)
+        projection = project_cached(monthly_investment, investment_years, expected_annual_return,
+                                    step_up, lumpsum, inflation)
+        future_value = projection.value[-1]
+        total_invested = projection.invested[-1]
         wealth_gain = future_value - total_invested
 
         # Results Display
@@ -75,13 +122,50 @@ else:
         res_col2.metric("Estimated Wealth Gain", f"₹{wealth_gain:,.0f}")
         res_col3.metric("Total Value", f"₹{future_value:,.0f}", delta=f"{wealth_gain/total_invested*100:.1f}%")
 
+        if inflation:
+            st.caption(f"In today's money (at {inflation:.1f}% inflation) the final value is worth ₹{projection.real_value[-1]:,.0f}.")
+
         # Wealth Growth Chart
-        months = np.arange(1, n + 1)
-        growth = [monthly_investment * (((1 + r)**m - 1) / r) * (1 + r) for m in months]
-        invested_line = [monthly_investment * m for m in months]
+        months = projection.months
         
         fig_growth = go.Figure()
-        fig_growth.add_trace(go.Scatter(x=months/12, y=growth, mode='lines', name='Total Value'))
-        fig_growth.add_trace(go.Scatter(x=months/12, y=invested_line, mode='lines', name='Amount Invested', line=dict(dash='dash')))
+        fig_growth.add_trace(go.Scatter(x=months/12, y=projection.value, mode='lines', name='Total Value'))
+        fig_growth.add_trace(go.Scatter(x=months/12, y=projection.invested, mode='lines', name='Amount Invested', line=dict(dash='dash')))
+        if inflation:
+            fig_growth.add_trace(go.Scatter(x=months/12, y=projection.real_value, mode='lines', name="Value in Today's Money", line=dict(dash='dot')))
         fig_growth.update_layout(title="Projected Wealth Growth", xaxis_title="Years", yaxis_title="Amount (INR)", template="plotly_dark")
         st.plotly_chart(fig_growth, use_container_width=True)
+
+        # Monte Carlo Simulation
+        st.divider()
+        st.header("Monte Carlo Simulation (Historical Returns)")
+        st.markdown("Instead of a fixed return, simulate thousands of market paths from the selected stocks' joint daily returns (equal-weighted portfolio).")
+        mc1, mc2, mc3 = st.columns(3)
+        n_paths = mc1.selectbox("Number of Paths", [1_000, 10_000, 100_000], index=1)
+        method = mc2.radio("Sampling Method", ["bootstrap", "gaussian"], horizontal=True,
+                           help="bootstrap resamples historical days; gaussian draws correlated normals (Cholesky of the covariance)")
+        parallel = mc3.checkbox("Use all CPU cores", value=n_paths >= 100_000)
+
+        if len(returns) < 2:
+            st.info("Not enough price history to estimate returns.")
+        elif st.button("Run Simulation"):
+            with st.spinner(f"Simulating {n_paths:,} paths..."):
+                result = run_monte_carlo(returns, monthly_investment, investment_years, n_paths, method, parallel)
+            bands = result.bands
+
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Median Final Value", f"₹{bands['P50'].iloc[-1]:,.0f}")
+            m2.metric("5th-95th Percentile", f"₹{bands['P5'].iloc[-1]:,.0f} - ₹{bands['P95'].iloc[-1]:,.0f}")
+            m3.metric("Chance of Loss", f"{(result.final_values < result.invested.iloc[-1]).mean()*100:.1f}%")
+
+            fig_mc = go.Figure()
+            fig_mc.add_trace(go.Scatter(x=bands.index, y=bands['P95'], line=dict(width=0), showlegend=False))
+            fig_mc.add_trace(go.Scatter(x=bands.index, y=bands['P5'], fill='tonexty', line=dict(width=0), name='5th-95th Percentile'))
+            fig_mc.add_trace(go.Scatter(x=bands.index, y=bands['P75'], line=dict(width=0), showlegend=False))
+            fig_mc.add_trace(go.Scatter(x=bands.index, y=bands['P25'], fill='tonexty', line=dict(width=0), name='25th-75th Percentile'))
+            fig_mc.add_trace(go.Scatter(x=bands.index, y=bands['P50'], mode='lines', name='Median'))
+            fig_mc.add_trace(go.Scatter(x=bands.index, y=result.invested, mode='lines', name='Amount Invested', line=dict(dash='dash')))
+            fig_mc.update_layout(title="Simulated Portfolio Value", xaxis_title="Years", yaxis_title="Amount (INR)", template="plotly_dark")
+            st.plotly_chart(fig_mc, use_container_width=True)
+
+debug_panel()
@@ -0,0 +1,213 @@
+import heapq
+import itertools
+from math import comb
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+
+class PortfolioOptimizer:
+    """Mean-variance optimization over any subset of the stocks in a daily returns matrix.
+
+    Annualized mean returns and the covariance matrix are computed once for the whole universe;
+    every solve slices them (and caches the slice), so switching subsets never re-reads returns.
+    `bounds` is (low, high) for every asset, a {asset: (low, high)} dict, or None for an
+    unconstrained (shorting allowed) closed-form solution.
+    """
+
+    def __init__(self, returns, risk_free=0.0, periods=252, ridge=1e-10):
+        returns = returns.dropna(axis=1, how="all").dropna()
+        self.assets = list(returns.columns)
+        self.position = {a: i for i, a in enumerate(self.assets)}
+        self.mu = returns.mean().to_numpy() * periods
+        cov = np.cov(returns.to_numpy(), rowvar=False) * periods
+        # A tiny ridge keeps short samples (fewer days than stocks) invertible
+        self.cov = np.atleast_2d(cov) + np.eye(len(self.assets)) * ridge * max(np.trace(np.atleast_2d(cov)), 1e-12)
+        self.risk_free = risk_free
+        self._subsets = {}
+
+    # ------------------------------------------
+    # Helpers
+    # ------------------------------------------
+    def _subset(self, assets):
+        key = tuple(assets) if assets is not None else tuple(self.assets)
+        if key not in self._subsets:
+            missing = [a for a in key if a not in self.position]
+            if missing:
+                raise KeyError(f"no complete return history for {missing}")
+            idx = np.array([self.position[a] for a in key])
+            self._subsets[key] = (key, self.mu[idx], self.cov[np.ix_(idx, idx)])
+        return self._subsets[key]
+
+    @staticmethod
+    def _bounds(assets, bounds):
+        if isinstance(bounds, dict):
+            lo = np.array([bounds.get(a, (0.0, 1.0))[0] for a in assets], dtype=float)
+            hi = np.array([bounds.get(a, (0.0, 1.0))[1] for a in assets], dtype=float)
+        else:
+            lo = np.full(len(assets), float(bounds[0]))
+            hi = np.full(len(assets), float(bounds[1]))
+        if lo.sum() > 1 + 1e-9 or hi.sum() < 1 - 1e-9:
+            raise ValueError("weight bounds cannot sum to 100%")
+        return lo, hi
+
+    def stats(self, weights):
+        """(annual return, annual volatility, Sharpe) of a weight Series"""
+        _, mu, cov = self._subset(list(weights.index))
+        w = weights.to_numpy()
+        ret, vol = w @ mu, np.sqrt(w @ cov @ w)
+        return ret, vol, (ret - self.risk_free) / vol
+
+    # ------------------------------------------
+    # Single solves
+    # ------------------------------------------
+    def min_variance(self, assets=None, bounds=(0.0, 1.0)):
+        key, mu, cov = self._subset(assets)
+        if bounds is None:
+            w = np.linalg.solve(cov, np.ones(len(key)))
+            return pd.Series(w / w.sum(), index=key)
+        return self._solve(key, lambda w: w @ cov @ w, lambda w: 2 * cov @ w, bounds)
+
+    def max_sharpe(self, assets=None, bounds=(0.0, 1.0)):
+        key, mu, cov = self._subset(assets)
+        excess = mu - self.risk_free
+        if bounds is None:
+            w = np.linalg.solve(cov, excess)
+            return pd.Series(w / w.sum(), index=key)
+
+        def neg_sharpe(w):
+            return -(w @ excess) / np.sqrt(w @ cov @ w)
+
+        def grad(w):
+            var = w @ cov @ w
+            return -(excess * var - (w @ excess) * (cov @ w)) / var ** 1.5
+
+        return self._solve(key, neg_sharpe, grad, bounds)
+
+    def _solve(self, key, fun, jac, bounds):
+        lo, hi = self._bounds(key, bounds)
+        x0 = self._project(np.full((1, len(key)), 1 / len(key)), lo, hi)[0]
+        res = minimize(fun, x0, jac=jac, method="SLSQP", bounds=list(zip(lo, hi)),
+                       constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1, "jac": lambda w: np.ones_like(w)}],
+                       options={"maxiter": 500, "ftol": 1e-12})
+        return pd.Series(np.clip(res.x, lo, hi), index=key)
+
+    # ------------------------------------------
+    # Efficient frontier (all points solved together)
+    # ------------------------------------------
+    def frontier(self, assets=None, n_points=50, bounds=(0.0, 1.0), iterations=3000):
+        """Efficient frontier as a DataFrame of Return / Volatility / Sharpe + one column per weight"""
+        key, mu, cov = self._subset(assets)
+        if bounds is None:
+            weights = self._frontier_closed_form(mu, cov, n_points)
+        else:
+            lo, hi = self._bounds(key, bounds)
+            weights = self._frontier_batch(mu, cov, lo, hi, n_points, iterations)
+
+        ret = weights @ mu
+        vol = np.sqrt(np.einsum("pi,ij,pj->p", weights, cov, weights))
+        table = pd.DataFrame(weights, columns=key)
+        table.insert(0, "Sharpe", (ret - self.risk_free) / vol)
+        table.insert(0, "Volatility", vol)
+        table.insert(0, "Return", ret)
+        table = table.sort_values("Volatility").drop_duplicates(subset=["Return", "Volatility"])
+        # Keep only the upper (efficient) branch
+        return table[table["Return"] >= table["Return"].cummax() - 1e-12].reset_index(drop=True)
+
+    @staticmethod
+    def _frontier_closed_form(mu, cov, n_points):
+        """Unconstrained frontier: w(t) = inv(S)[(C - tB)1 + (tA - B)mu] / (AC - B^2) for all targets t"""
+        inv_one = np.linalg.solve(cov, np.ones(len(mu)))
+        inv_mu = np.linalg.solve(cov, mu)
+        a, b, c = inv_one.sum(), inv_mu.sum(), mu @ inv_mu
+        d = a * c - b * b
+        targets = np.linspace(b / a, max(mu.max(), b / a), n_points)[:, None]
+        return ((c - targets * b) * inv_one + (targets * a - b) * inv_mu) / d
+
+    @classmethod
+    def _frontier_batch(cls, mu, cov, lo, hi, n_points, iterations):
+        """Bounded frontier: accelerated projected gradient on max mu'w - (lam/2) w'Sw for a grid of lam,
+        all risk-aversion levels advancing together as one (points x assets) array."""
+        scale = max(np.abs(mu).mean(), 1e-12) / max(np.diag(cov).mean(), 1e-12)
+        lam = np.geomspace(scale * 1e-2, scale * 1e3, n_points)[:, None]
+        step = 1 / (lam * np.linalg.eigvalsh(cov)[-1])
+
+        w = cls._project(np.full((n_points, len(mu)), 1 / len(mu)), lo, hi)
+        y, t = w.copy(), 1.0
+        for _ in range(iterations):
+            w_next = cls._project(y + step * (mu - lam * (y @ cov)), lo, hi)
+            t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+            y = w_next + ((t - 1) / t_next) * (w_next - w)
+            if np.abs(w_next - w).max() < 1e-10:
+                w = w_next
+                break
+            w, t = w_next, t_next
+        return w
+
+    @staticmethod
+    def _project(v, lo, hi):
+        """Row-wise Euclidean projection onto {w : sum(w) = 1, lo <= w <= hi}"""
+        # sum(clip(v - tau, lo, hi)) is piecewise linear in tau with breakpoints v - lo and v - hi
+        breaks = np.sort(np.concatenate([v - lo, v - hi], axis=1), axis=1)
+        totals = np.clip(v[:, None, :] - breaks[:, :, None], lo, hi).sum(axis=2)  # decreasing in tau
+        j = np.clip((totals >= 1).sum(axis=1) - 1, 0, breaks.shape[1] - 2)
+        rows = np.arange(len(v))
+        t0, t1 = breaks[rows, j], breaks[rows, j + 1]
+        s0, s1 = totals[rows, j], totals[rows, j + 1]
+        tau = np.where(s0 == s1, t0, t0 + (s0 - 1) * (t1 - t0) / np.where(s0 == s1, 1, s0 - s1))
+        return np.clip(v - tau[:, None], lo, hi)
+
+    # ------------------------------------------
+    # Subset sweep
+    # ------------------------------------------
+    def sweep_subsets(self, max_size=10, min_size=2, top=20, long_only=True, universe=None, batch=20_000):
+        """Best max-Sharpe portfolios over every subset of `universe` with min_size..max_size stocks.
+
+        Each batch of same-size subsets is solved at once with stacked linear solves of the
+        tangency portfolio. With long_only=True a subset is kept only if its tangency portfolio
+        has no short positions, in which case it is also the exact long-only optimum.
+        """
+        universe = list(universe or self.assets)
+        idx_all = np.array([self.position[a] for a in universe])
+        excess_all = self.mu - self.risk_free
+        best = []  # min-heap of (sharpe, subset, weights)
+
+        for size in range(min_size, max_size + 1):
+            combos = itertools.combinations(range(len(universe)), size)
+            for _ in range(0, comb(len(universe), size), batch):
+                chunk = np.array(list(itertools.islice(combos, batch)))
+                if not len(chunk):
+                    break
+                idx = idx_all[chunk]
+                sub_cov = self.cov[idx[:, :, None], idx[:, None, :]]
+                excess = excess_all[idx]
+                raw = np.linalg.solve(sub_cov, excess[:, :, None])[:, :, 0]
+                total = raw.sum(axis=1)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    w = raw / total[:, None]
+                    sharpe = np.sqrt(np.einsum("bi,bi->b", excess, raw))
+                valid = total > 0  # otherwise the solution is the minimum-Sharpe portfolio
+                if long_only:
+                    valid &= (w >= -1e-12).all(axis=1)
+                sharpe = np.where(valid, sharpe, -np.inf)
+
+                k = min(top, len(sharpe))
+                for b in np.argpartition(-sharpe, k - 1)[:k]:
+                    if not np.isfinite(sharpe[b]):
+                        continue
+                    item = (float(sharpe[b]), tuple(chunk[b]), w[b])
+                    if len(best) < top:
+                        heapq.heappush(best, item)
+                    elif item[0] > best[0][0]:
+                        heapq.heapreplace(best, item)
+
+        rows = []
+        for sharpe, members, w in sorted(best, reverse=True):
+            names = [universe[i] for i in members]
+            weights = pd.Series(w, index=names)
+            ret, vol, _ = self.stats(weights)
+            rows.append({"Stocks": ", ".join(names), "Size": len(names), "Return": ret,
+                         "Volatility": vol, "Sharpe": sharpe,
+                         "Weights": ", ".join(f"{n} {x:.0%}" for n, x in weights.items())})
+        return pd.DataFrame(rows)
@@ -0,0 +1,84 @@
+import functools
+from collections import namedtuple
+
+import numpy as np
+
+Projection = namedtuple("Projection", ["months", "value", "invested", "real_value"])
+
+
+def _rates(annual_return, step_up, inflation):
+    """Convert percentage inputs to the monthly / yearly decimal rates used by the app"""
+    r = np.asarray(annual_return, dtype=float) / 100 / 12
+    s = np.asarray(step_up, dtype=float) / 100
+    i = np.asarray(inflation, dtype=float) / 100
+    return r, s, i
+
+
+def future_value(monthly, years, annual_return, step_up=0.0, lumpsum=0.0, inflation=0.0):
+    """Closed-form maturity value of a (step-up) SIP plus lumpsum. Every argument may be an array.
+
+    Contributions are made at the start of each month (annuity due), the SIP amount grows by
+    `step_up`% once a year, and `inflation`% > 0 returns the value in today's money. The horizon
+    is round(years * 12) months, as in project(), so fractional years are allowed.
+    """
+    r, s, i = _rates(annual_return, step_up, inflation)
+    monthly, years, lumpsum = (np.asarray(x, dtype=float) for x in (monthly, years, lumpsum))
+    n = np.rint(years * 12)
+    full_years, extra = n // 12, n % 12
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # m monthly contributions of 1, valued one month after the last (annuity due)
+        annuity = lambda m: np.where(r == 0, m, ((1 + r) ** m - 1) / r * (1 + r))
+        # Geometric series over yearly instalments P(1+s)^y, each compounding G^(Y-1-y)
+        g = (1 + r) ** 12
+        q = 1 + s
+        ratio = np.where(np.isclose(g, q), full_years * g ** (full_years - 1),
+                         (g ** full_years - q ** full_years) / (g - q))
+        # Completed years carry on compounding through the extra months, which are paid at the
+        # amount of year `full_years`
+        value = (monthly * annuity(12) * ratio * (1 + r) ** extra
+                 + monthly * q ** full_years * annuity(extra)
+                 + lumpsum * (1 + r) ** n)
+
+    return value / (1 + i) ** (n / 12)
+
+
+def project(monthly, years, annual_return, step_up=0.0, lumpsum=0.0, inflation=0.0):
+    """Month-by-month trajectories for many scenarios at once.
+
+    Arguments broadcast to S scenarios; the result holds (S, max_months) arrays, NaN-padded past
+    each scenario's own horizon. Built with cumulative products/sums instead of a per-month loop.
+    """
+    r, s, i = _rates(annual_return, step_up, inflation)
+    monthly, years, lumpsum, r, s, i = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (monthly, years, lumpsum, r, s, i))
+    )
+    n = np.rint(years * 12).astype(int)
+    months = np.arange(1, n.max() + 1)
+    col = lambda x: x[:, None]
+
+    # growth[m] = (1 + r)^m via a cumulative product of the monthly factor
+    growth = np.cumprod(np.broadcast_to(1 + col(r), (len(r), len(months))), axis=1)
+    # Instalment paid at the start of month m (step-up applied every 12 months)
+    contribution = col(monthly) * (1 + col(s)) ** ((months - 1) // 12)
+    invested = np.cumsum(contribution, axis=1) + col(lumpsum)
+
+    # value[m] = sum_k C_k (1+r)^(m-k+1) = growth[m] * sum_k C_k / growth[k-1]
+    prior_growth = np.concatenate([np.ones((len(r), 1)), growth[:, :-1]], axis=1)
+    value = growth * np.cumsum(contribution / prior_growth, axis=1) + col(lumpsum) * growth
+    real_value = value / (1 + col(i)) ** (months / 12)
+
+    beyond = months > col(n)
+    for arr in (value, invested, real_value):
+        arr[beyond] = np.nan
+    return Projection(months, value, invested, real_value)
+
+
+@functools.lru_cache(maxsize=256)
+def project_cached(monthly, years, annual_return, step_up=0.0, lumpsum=0.0, inflation=0.0):
+    """Memoized single-scenario projection (1-D read-only arrays), keyed on the parameter tuple"""
+    p = project(monthly, years, annual_return, step_up, lumpsum, inflation)
+    result = Projection(p.months, p.value[0], p.invested[0], p.real_value[0])
+    for arr in result:
+        arr.setflags(write=False)
+    return result
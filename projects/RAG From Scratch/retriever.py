@@ -0,0 +1,370 @@
+"""Persistent, incremental retrieval for the RAG pipeline in rag.ipynb.
+
+Documents are split with the notebook's splitter and every chunk is keyed on a hash of its text.
+update() embeds only chunks whose hash is new and adds them to the index; chunks that disappeared
+are tombstoned and skipped at search time until enough accumulate to compact the index. The
+embeddings, chunk list and FAISS index are saved under `directory`, so the next run loads them
+back instead of re-embedding the corpus.
+
+Index types (vectors are L2-normalized, so inner product = cosine similarity):
+
+    flat  exact search, fine up to ~100k chunks
+    ivf   IndexIVFFlat; recall/speed tuned with nprobe (lists scanned per query)
+    hnsw  IndexHNSWFlat; recall/speed tuned with ef_search (candidate list size)
+
+    python retriever.py --docs my_knowledge.txt --query "What is the WFH policy?"
+    python retriever.py --benchmark --chunks 200000 --index hnsw
+"""
+import hashlib
+import json
+import os
+import time
+
+import faiss
+import numpy as np
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "rag")
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+APPROX_MIN_CHUNKS = 2000  # below this an exact scan is as fast, and IVF has too little to train on
+COMPACT_RATIO = 0.25  # rebuild once this share of indexed rows are tombstones
+
+
+def chunk_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def make_splitter(chunk_size=150, chunk_overlap=20):
+    """Same splitter settings as the notebook"""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    return RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=len)
+
+
+class SentenceEmbedder:
+    """all-MiniLM-L6-v2, loaded on first use"""
+
+    def __init__(self, model_name="all-MiniLM-L6-v2", batch_size=256):
+        self.name = model_name
+        self.batch_size = batch_size
+        self._model = None
+
+    def __call__(self, texts):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.name)
+        return self._model.encode(list(texts), batch_size=self.batch_size, normalize_embeddings=True,
+                                  convert_to_numpy=True).astype("float32")
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words hashing embedder for offline runs and benchmarks (no model download)"""
+
+    def __init__(self, dim=384):
+        self.name = f"hashing-{dim}"
+        self.dim = dim
+        self._slots = {}
+
+    def _slot(self, word):
+        slot = self._slots.get(word)
+        if slot is None:
+            h = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "little")
+            slot = self._slots[word] = (h % self.dim, 1.0 if h >> 63 else -1.0)
+        return slot
+
+    def __call__(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype="float32")
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                col, sign = self._slot(word)
+                out[row, col] += sign
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms == 0, 1, norms)
+
+
+class Retriever:
+    """Chunk store + FAISS index persisted under `directory`"""
+
+    def __init__(self, directory=DEFAULT_DIR, embedder=None, index_type="hnsw", nlist=None, hnsw_m=32,
+                 ef_construction=80, nprobe=16, ef_search=64, chunk_size=150, chunk_overlap=20):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type {index_type!r}; choose from {INDEX_TYPES}")
+        self.directory = directory
+        self.embedder = embedder or SentenceEmbedder()
+        self.index_type = index_type
+        self.nlist = nlist
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.splitter = make_splitter(chunk_size, chunk_overlap)
+
+        # Row i of chunks <-> row i of embeddings <-> index id i; removed chunks stay as None
+        # (tombstones) until the next compaction
+        self.chunks = []
+        self.embeddings = np.zeros((0, 0), dtype="float32")
+        self.index = None
+        self.built_kind, self.built_size = None, 0  # what the index was built as, and from how many rows
+        self._dead_mask = None
+        self._load()
+
+    def dead_mask(self):
+        """Boolean array, True for tombstoned rows (cached until the next update)"""
+        if self._dead_mask is None:
+            self._dead_mask = np.array([c is None for c in self.chunks], dtype=bool)
+        return self._dead_mask
+
+    # ------------------------------------------
+    # Persistence
+    # ------------------------------------------
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        try:
+            with open(self._path("manifest.json"), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Embeddings from another model are not comparable; start over
+        if manifest.get("embedder") != self.embedder.name:
+            return
+        with open(self._path("chunks.json"), encoding="utf-8") as f:
+            self.chunks = json.load(f)
+        self.embeddings = np.load(self._path("embeddings.npy"))
+        if manifest.get("index_type") == self.index_type and os.path.exists(self._path("index.faiss")):
+            self.index = faiss.read_index(self._path("index.faiss"))
+            self.built_kind, self.built_size = manifest["built_kind"], manifest["built_size"]
+            self.set_search_params()
+        elif self.chunks:
+            self._rebuild()
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to temp names and swap in, so a crash mid-save never leaves a half-written store
+        tmp = {name: self._path(name + ".tmp") for name in ["chunks.json", "embeddings.npy", "index.faiss", "manifest.json"]}
+        with open(tmp["chunks.json"], "w", encoding="utf-8") as f:
+            json.dump(self.chunks, f)
+        with open(tmp["embeddings.npy"], "wb") as f:
+            np.save(f, self.embeddings)
+        if self.index is not None:
+            faiss.write_index(self.index, tmp["index.faiss"])
+        elif os.path.exists(self._path("index.faiss")):
+            os.remove(self._path("index.faiss"))
+        with open(tmp["manifest.json"], "w", encoding="utf-8") as f:
+            json.dump({"embedder": self.embedder.name, "index_type": self.index_type, "chunks": len(self.chunks),
+                       "built_kind": self.built_kind, "built_size": self.built_size, "saved": time.time()}, f)
+        for name, path in tmp.items():
+            if os.path.exists(path):
+                os.replace(path, self._path(name))
+
+    # ------------------------------------------
+    # Indexing
+    # ------------------------------------------
+    def _kind(self, n):
+        return "flat" if n < APPROX_MIN_CHUNKS else self.index_type
+
+    def _rebuild(self):
+        """Drop tombstones and build a fresh index from the stored vectors"""
+        alive = [i for i, c in enumerate(self.chunks) if c is not None]
+        self.chunks = [self.chunks[i] for i in alive]
+        self._dead_mask = None
+        self.embeddings = self.embeddings[alive] if alive else np.zeros((0, 0), dtype="float32")
+        n = len(alive)
+        if n == 0:
+            self.index, self.built_kind, self.built_size = None, None, 0
+            return
+        d = self.embeddings.shape[1]
+        kind = self._kind(n)
+        if kind == "ivf":
+            nlist = self.nlist or max(1, int(4 * np.sqrt(n)))
+            nlist = min(nlist, max(1, n // 39))  # FAISS wants ~39 training points per list
+            index = faiss.IndexIVFFlat(faiss.IndexFlatIP(d), d, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(self.embeddings)
+        elif kind == "hnsw":
+            index = faiss.IndexHNSWFlat(d, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = self.ef_construction
+        else:
+            index = faiss.IndexFlatIP(d)
+        index.add(self.embeddings)
+        self.index = index
+        self.built_kind, self.built_size = kind, n
+        self.set_search_params()
+
+    def set_search_params(self, nprobe=None, ef_search=None):
+        """Trade recall for speed: more lists (ivf) or a longer candidate list (hnsw) = higher recall"""
+        self.nprobe = nprobe or self.nprobe
+        self.ef_search = ef_search or self.ef_search
+        if isinstance(self.index, faiss.IndexIVF):
+            self.index.nprobe = min(self.nprobe, self.index.nlist)
+        elif isinstance(self.index, faiss.IndexHNSW):
+            self.index.hnsw.efSearch = self.ef_search
+
+    def update(self, documents):
+        """Sync the store with `documents` ({source: text}); returns counts of added/kept/removed chunks"""
+        wanted = {}
+        for source, text in documents.items():
+            for chunk in self.splitter.split_text(text):
+                wanted.setdefault((source, chunk_hash(chunk)), chunk)
+
+        live = {(c["source"], c["hash"]): i for i, c in enumerate(self.chunks) if c is not None}
+        removed = [i for key, i in live.items() if key not in wanted]
+        for i in removed:
+            self.chunks[i] = None
+        added = [(key, text) for key, text in wanted.items() if key not in live]
+
+        # A chunk moved to another document, or restored after removal, reuses its old vector
+        known = {c["hash"]: i for i, c in enumerate(self.chunks) if c is not None}
+        known.update({h: i for (_, h), i in live.items() if h not in known})
+        to_embed = list({h: text for (_, h), text in added if h not in known}.items())
+        start = time.perf_counter()
+        fresh = self.embedder([text for _, text in to_embed]) if to_embed else None
+        embed_seconds = time.perf_counter() - start
+        fresh_rows = {h: i for i, (h, _) in enumerate(to_embed)}
+
+        if added:
+            vectors = np.vstack([fresh[fresh_rows[h]] if h in fresh_rows else self.embeddings[known[h]]
+                                 for (_, h), _ in added]).astype("float32")
+            self.embeddings = vectors if not len(self.embeddings) else np.vstack([self.embeddings, vectors])
+            self.chunks += [{"hash": h, "source": source, "text": text} for (source, h), text in added]
+
+        # New vectors go straight into the existing index. It is rebuilt only when too many rows
+        # are tombstones, when it outgrew the flat fallback, or when IVF centroids were trained
+        # on under a quarter of the rows
+        self._dead_mask = None
+        dead = int(self.dead_mask().sum())
+        alive = len(self.chunks) - dead
+        if (self.index is None or dead > COMPACT_RATIO * len(self.chunks)
+                or self._kind(alive) != self.built_kind
+                or (self.built_kind == "ivf" and alive > 4 * self.built_size)):
+            self._rebuild()
+        elif added:
+            self.index.add(self.embeddings[self.index.ntotal:])
+        self.save()
+        return {"added": len(added), "embedded": len(to_embed), "kept": len(live) - len(removed),
+                "removed": len(removed), "embed_s": embed_seconds}
+
+    def update_files(self, paths):
+        documents = {}
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                documents[os.path.basename(path)] = f.read()
+        return self.update(documents)
+
+    # ------------------------------------------
+    # Search
+    # ------------------------------------------
+    def search_vectors(self, vectors, k=2):
+        """(scores, ids) arrays of shape (n_queries, k) over live chunks; missing hits have id -1"""
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        n = len(vectors)
+        scores, ids = np.full((n, k), -np.inf, dtype="float32"), np.full((n, k), -1, dtype="int64")
+        if self.index is None or self.index.ntotal == 0:
+            return scores, ids
+        dead = self.dead_mask()
+        # Over-fetch past tombstones; widen the search for any query that still comes up short
+        fetch = min(self.index.ntotal, k if not dead.any() else 2 * k)
+        pending = np.arange(n)
+        while len(pending):
+            s, i = self.index.search(vectors[pending], fetch)
+            keep = (i >= 0) & ~dead[np.maximum(i, 0)]
+            short = []
+            for row, q in enumerate(pending):
+                hits = np.flatnonzero(keep[row])[:k]
+                if len(hits) < k and fetch < self.index.ntotal:
+                    short.append(q)
+                    continue
+                scores[q, :len(hits)], ids[q, :len(hits)] = s[row, hits], i[row, hits]
+            pending = np.array(short, dtype="int64")
+            fetch = min(self.index.ntotal, fetch * 4)
+        return scores, ids
+
+    def search_batch(self, queries, k=2):
+        """Top-k chunks for many queries: one embedding call and one index search for the batch"""
+        scores, ids = self.search_vectors(self.embedder(list(queries)), k)
+        return [[{**self.chunks[i], "score": float(s)} for s, i in zip(row_s, row_i) if i >= 0]
+                for row_s, row_i in zip(scores, ids)]
+
+    def search(self, query, k=2):
+        return self.search_batch([query], k)[0]
+
+    def recall(self, queries, k=10):
+        """Share of the exact top-k (over live chunks) that the index also returns; ties count as hits"""
+        vectors = self.embedder(list(queries))
+        exact = self.embeddings[~self.dead_mask()] @ vectors.T
+        kth = -np.partition(-exact, k - 1, axis=0)[k - 1]
+        scores, ids = self.search_vectors(vectors, k)
+        return float(np.mean(((scores >= kth[:, None] - 1e-5) & (ids >= 0)).sum(axis=1) / k))
+
+
+# ==========================================
+# Benchmark on a synthetic corpus
+# ------------------------------------------
+def _synthetic_corpus(n_chunks, seed=0, words=20, vocab=30000):
+    rng = np.random.default_rng(seed)
+    # Zipf-distributed pseudo-words, so chunks share common words but rarely tie exactly
+    ranks = np.minimum(rng.zipf(1.2, (n_chunks, words)), vocab)
+    return [" ".join(f"w{r}" for r in row) for row in ranks]
+
+
+def benchmark(n_chunks=100000, index_type="hnsw", n_queries=1000, k=10, seed=0):
+    import tempfile
+
+    texts = _synthetic_corpus(n_chunks, seed)
+    docs = {f"doc{i}": t for i, t in enumerate(texts)}
+    embedder = HashingEmbedder()
+    with tempfile.TemporaryDirectory() as directory:
+        retriever = Retriever(directory, embedder=embedder, index_type=index_type, chunk_size=10 ** 6)
+        start = time.perf_counter()
+        retriever.update(docs)
+        print(f"Indexed {n_chunks:,} chunks ({index_type}) in {time.perf_counter() - start:.1f}s")
+
+        # Change 1% of the documents, then reload from disk and re-sync
+        changed = dict(docs)
+        for i, text in enumerate(_synthetic_corpus(n_chunks // 100, seed + 1)):
+            changed[f"doc{i * 100}"] = text
+        start = time.perf_counter()
+        retriever = Retriever(directory, embedder=embedder, index_type=index_type, chunk_size=10 ** 6)
+        stats = retriever.update(changed)
+        print(f"Reloaded and re-synced {stats['added']:,} changed chunks in {time.perf_counter() - start:.1f}s "
+              f"(embedded {stats['embedded']:,}, kept {stats['kept']:,})")
+
+        queries = _synthetic_corpus(n_queries, seed + 2)
+        vectors = embedder(queries)
+        knobs = {"ivf": [("nprobe", v) for v in (1, 4, 16, 64)],
+                 "hnsw": [("ef_search", v) for v in (16, 64, 256)]}.get(index_type, [(None, None)])
+        for name, value in knobs:
+            if name:
+                retriever.set_search_params(**{name: value})
+            start = time.perf_counter()
+            retriever.search_vectors(vectors, k)
+            batch_s = time.perf_counter() - start
+            start = time.perf_counter()
+            for v in vectors[:100]:
+                retriever.search_vectors(v[None], k)
+            single_ms = (time.perf_counter() - start) * 10
+            label = f"{name}={value}" if name else "exact"
+            print(f"  {label:<14} recall@{k} {retriever.recall(queries[:200], k):.3f}   "
+                  f"batch {n_queries / batch_s:,.0f} q/s   one-at-a-time {single_ms:.2f} ms/q")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build, query or benchmark the RAG retriever")
+    parser.add_argument("--docs", nargs="*", default=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "my_knowledge.txt")])
+    parser.add_argument("--query", action="append", default=[])
+    parser.add_argument("--index", choices=INDEX_TYPES, default="hnsw")
+    parser.add_argument("-k", type=int, default=2)
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--chunks", type=int, default=100000)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.chunks, args.index)
+    else:
+        retriever = Retriever(index_type=args.index)
+        print(retriever.update_files(args.docs))
+        for query, hits in zip(args.query, retriever.search_batch(args.query, args.k)):
+            print(f"\nQuery: {query}")
+            for hit in hits:
+                print(f"  [{hit['score']:.3f}] {hit['text']}")
@@ -2,12 +2,19 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import seaborn as sns
-import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.data import load_dataset
+from src.metrics import debug_panel, instrument_app, timed
+from src.startup import preload
+from price_model import load_model, predict_batch, FEATURES
+from spatial import ListingIndex, sample_for_map
 
 # Set page config
 st.set_page_config(page_title="Real Estate Analytics", layout="wide", page_icon="🏠")
+instrument_app("real_estate")
 
 st.title("🏠 Real Estate Price Analysis & Prediction")
 st.markdown("Explore factors affecting real estate prices and estimate property values.")
@@ -15,11 +22,20 @@ st.markdown("Explore factors affecting real estate prices and estimate property
 # File Path
 CSV_PATH = "Real_Estate.csv"
 
+@st.cache_resource
+def get_listing_index(csv_path, mtime, _df):
+    # Keyed on the file + mtime so the (unhashed) frame is indexed once per data version
+    return ListingIndex(_df)
+
+# Loaded once per server from models/ in a background thread while the charts render
+# (trained on first start if the artifact is missing)
+price_model = preload("real-estate-price-model", load_model)
+
 if not os.path.exists(CSV_PATH):
     st.error(f"Data file '{CSV_PATH}' not found.")
 else:
     # Load Data
-    df = pd.read_csv(CSV_PATH)
+    df = load_dataset("real_estate", CSV_PATH)
     
     # Sidebar - Stats
     st.sidebar.header("Dataset Overview")
@@ -53,9 +69,33 @@ else:
     with tab2:
         st.subheader("Geospatial Distribution")
         # Streamlit map needs 'lat' and 'lon' columns
-        map_df = df.rename(columns={'Latitude': 'lat', 'Longitude': 'lon'})
+        map_df = sample_for_map(df).rename(columns={'Latitude': 'lat', 'Longitude': 'lon'})
         st.map(map_df)
-        st.info("The map shows property locations in the dataset.")
+        st.info(f"The map shows {len(map_df):,} of {len(df):,} property locations in the dataset.")
+
+        st.subheader("Comparable Properties Nearby")
+        index = get_listing_index(CSV_PATH, os.path.getmtime(CSV_PATH), df)
+        q1, q2, q3 = st.columns(3)
+        q_lat = q1.number_input("Latitude", value=float(df['Latitude'].median()), format="%.5f", key="comp_lat")
+        q_lon = q1.number_input("Longitude", value=float(df['Longitude'].median()), format="%.5f", key="comp_lon")
+        search = q2.radio("Search", ["k nearest", "Within radius"])
+        k = q2.slider("Number of comparables", 1, 50, 10) if search == "k nearest" else None
+        radius = q2.slider("Radius (km)", 0.1, 5.0, 1.0) if search == "Within radius" else None
+        age_range = q3.slider("House Age range", 0.0, 45.0, (0.0, 45.0))
+        mrt_range = q3.slider("MRT Distance range (m)", 0.0, 7000.0, (0.0, 7000.0))
+
+        if search == "k nearest":
+            comps = index.nearest(q_lat, q_lon, k=k, age_range=age_range, mrt_range=mrt_range)
+        else:
+            comps = index.within(q_lat, q_lon, radius, age_range=age_range, mrt_range=mrt_range)
+
+        if comps.empty:
+            st.warning("No comparable properties match these filters.")
+        else:
+            st.metric("Median Price of Comparables", f"{comps['House price of unit area'].median():.2f}",
+                      help=f"{len(comps):,} properties")
+            st.map(sample_for_map(comps).rename(columns={'Latitude': 'lat', 'Longitude': 'lon'}))
+            st.dataframe(comps.head(200), use_container_width=True)
 
     with tab3:
         st.subheader("Estimate Property Value")
@@ -65,13 +105,30 @@ else:
         age = c1.slider("House Age (years)", 0, 45, 15)
         mrt_dist = c1.number_input("Distance to MRT (meters)", 0.0, 7000.0, 1000.0)
         stores = c2.slider("Nearby Convenience Stores", 0, 10, 5)
+        lat = c2.number_input("Latitude", value=float(df['Latitude'].median()), format="%.5f")
+        lon = c2.number_input("Longitude", value=float(df['Longitude'].median()), format="%.5f")
         
-        # Simple heuristic or linear regression weights (mocked from typical trends)
-        # Price tends to decrease with age and distance, increase with stores
-        base_price = 45.0
-        est_price = base_price - (age * 0.2) - (mrt_dist * 0.005) + (stores * 2.5)
-        est_price = max(est_price, 5.0) # Ensure price is positive
+        # Gradient boosting model trained on Real_Estate.csv (see price_model.py)
+        with st.spinner("Loading the price model..."):
+            model = price_model.result()
+        listing = pd.DataFrame([[age, mrt_dist, stores, lat, lon]], columns=FEATURES)
+        with timed("real_estate.predict"):
+            est_price = float(predict_batch(model, listing).iloc[0])
         
         st.divider()
         st.metric("Estimated Price per Unit Area", f"{est_price:.2f}")
-        st.caption("Note: This is a simulation based on general trends in your dataset.")
+        st.caption(f"Model trained on {model['trained_rows']} transactions (cross-validated MAE: {model['metrics']['cv_mae']:.2f}).")
+
+        st.subheader("Batch Prediction")
+        batch_file = st.file_uploader("Upload a CSV of properties", type=["csv"],
+                                      help=f"Needs the columns: {', '.join(FEATURES)}")
+        if batch_file is not None:
+            batch_df = pd.read_csv(batch_file)
+            try:
+                batch_df["Predicted price"] = predict_batch(model, batch_df)
+                st.dataframe(batch_df.head(100), use_container_width=True)
+                st.download_button("Download Predictions", batch_df.to_csv(index=False), "predictions.csv", "text/csv")
+            except ValueError as e:
+                st.error(str(e))
+
+debug_panel()
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class ListingIndex:
+    """Ball tree over listing coordinates (haversine distance) for comparables search.
+
+    k-nearest and radius queries are O(log n) instead of a scan over every listing; optional
+    house-age / MRT-distance ranges filter the spatial candidates afterwards.
+    """
+
+    def __init__(self, df, lat_col="Latitude", lon_col="Longitude", leaf_size=40):
+        self.df = df.reset_index(drop=True)
+        coords = np.radians(self.df[[lat_col, lon_col]].to_numpy(dtype=float))
+        self.tree = BallTree(coords, metric="haversine", leaf_size=leaf_size)
+        # Filter columns as plain arrays so masking the candidates stays vectorized
+        self.age = self.df["House age"].to_numpy(dtype=float)
+        self.mrt = self.df["Distance to the nearest MRT station"].to_numpy(dtype=float)
+
+    def __len__(self):
+        return len(self.df)
+
+    def _mask(self, idx, age_range, mrt_range):
+        keep = np.ones(len(idx), dtype=bool)
+        if age_range is not None:
+            keep &= (self.age[idx] >= age_range[0]) & (self.age[idx] <= age_range[1])
+        if mrt_range is not None:
+            keep &= (self.mrt[idx] >= mrt_range[0]) & (self.mrt[idx] <= mrt_range[1])
+        return keep
+
+    def _result(self, idx, dist):
+        out = self.df.iloc[idx].copy()
+        out.insert(0, "Distance (km)", dist * EARTH_RADIUS_KM)
+        return out
+
+    def nearest(self, lat, lon, k=10, age_range=None, mrt_range=None):
+        """The k closest listings that also satisfy the optional age / MRT ranges"""
+        point = np.radians([[lat, lon]])
+        k = min(k, len(self))
+        fetch = k
+        while True:
+            # Over-fetch when filtering; widen geometrically until enough candidates survive
+            fetch = min(fetch * (4 if age_range or mrt_range else 1), len(self))
+            dist, idx = self.tree.query(point, k=fetch)
+            dist, idx = dist[0], idx[0]
+            keep = self._mask(idx, age_range, mrt_range)
+            if keep.sum() >= k or fetch == len(self):
+                return self._result(idx[keep][:k], dist[keep][:k])
+
+    def within(self, lat, lon, radius_km, age_range=None, mrt_range=None):
+        """All listings within radius_km, nearest first"""
+        point = np.radians([[lat, lon]])
+        idx, dist = self.tree.query_radius(point, r=radius_km / EARTH_RADIUS_KM, return_distance=True, sort_results=True)
+        idx, dist = idx[0], dist[0]
+        keep = self._mask(idx, age_range, mrt_range)
+        return self._result(idx[keep], dist[keep])
+
+
+def sample_for_map(df, max_points=5_000, lat_col="Latitude", lon_col="Longitude", seed=0):
+    """Down-sample a large result for st.map while keeping its spatial coverage.
+
+    Points are bucketed into a grid and every occupied cell keeps at least one point before
+    the remaining budget is filled at random.
+    """
+    if len(df) <= max_points:
+        return df
+    cells = int(np.sqrt(max_points))
+    lat_bin = pd.cut(df[lat_col], cells, labels=False)
+    lon_bin = pd.cut(df[lon_col], cells, labels=False)
+    shuffled = df.sample(frac=1.0, random_state=seed)
+    cell = (lat_bin * cells + lon_bin).loc[shuffled.index]
+    first = ~cell.duplicated()
+    picked = shuffled[first]
+    rest = shuffled[~first].head(max(0, max_points - len(picked)))
+    return pd.concat([picked, rest]).head(max_points)
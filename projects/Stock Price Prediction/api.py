@@ -0,0 +1,248 @@
+"""Headless HTTP API for StockEngine analysis and decisions.
+
+Concurrent requests for the same (symbol, period) share one in-flight fetch + computation, and
+finished results are kept in a short-TTL cache. Fetching and indicator maths run on a worker
+pool, so the event loop only ever awaits.
+
+    uvicorn api:create_app --factory --port 8000
+    STOCK_API_OFFLINE=1 uvicorn api:create_app --factory --port 8000   # synthetic data
+    python api.py --offline --port 8000
+    curl "localhost:8000/analysis/RELIANCE?period=1y"
+    curl "localhost:8000/analysis?symbols=TCS,INFY,ITC"
+"""
+import asyncio
+import math
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from engine import StockEngine
+from fetchers import PERIOD_BARS, SyntheticFetcher
+from src.metrics import prometheus_text
+
+MIN_BARS = 51  # SMA 50 needs 50 bars, plus one for the day-on-day change
+PERIODS = tuple(period for period, bars in PERIOD_BARS.items() if bars >= MIN_BARS)
+
+
+class AnalysisError(Exception):
+    """No usable data for a symbol; `status` is the HTTP code to answer with"""
+
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def normalize_symbol(symbol):
+    """Upper-case and default to NSE, as the dashboard does"""
+    symbol = symbol.strip().upper()
+    if "." not in symbol and "^" not in symbol:
+        symbol += ".NS"
+    return symbol
+
+
+def _number(value):
+    value = float(value)
+    return None if math.isnan(value) else round(value, 4)
+
+
+def analyze(symbol, period="1y", fetcher=None):
+    """Fetch + indicators + decision for one symbol, as a JSON-ready dict (blocking)"""
+    data = StockEngine.fetch_data(symbol, period, fetcher=fetcher)
+    if data is None:
+        raise AnalysisError(404, f"no data for {symbol}")
+    if len(data) < MIN_BARS:
+        raise AnalysisError(422, f"only {len(data)} bars for {symbol} over {period}; need {MIN_BARS}")
+
+    data = StockEngine.calculate_indicators(data.copy())
+    decision, confidence, reasons = StockEngine.get_decision(data)
+    latest, prev = data.iloc[-1], data.iloc[-2]
+    return {
+        "symbol": symbol,
+        "period": period,
+        "as_of": str(data.index[-1]),
+        "bars": len(data),
+        "price": _number(latest["Close"]),
+        "change_pct": _number((latest["Close"] / prev["Close"] - 1) * 100),
+        "sma_20": _number(latest["SMA_20"]),
+        "sma_50": _number(latest["SMA_50"]),
+        "rsi": _number(latest["RSI"]),
+        "volatility": _number(latest["Volatility"]),
+        "decision": decision,
+        "confidence": int(confidence),
+        "reasons": reasons,
+    }
+
+
+class AnalysisService:
+    """Coalesces concurrent requests per (symbol, period) and caches results for `ttl` seconds"""
+
+    def __init__(self, fetcher=None, ttl=30.0, max_entries=1024, workers=8, coalesce=True):
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.coalesce = coalesce
+        # Threads, not processes: the work is mostly waiting on the data source, and pandas
+        # releases the GIL for most of the rolling-window maths
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis")
+        self._cache = OrderedDict()  # (symbol, period) -> (expires, result)
+        self._inflight = {}  # (symbol, period) -> asyncio.Future
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "computed": 0, "errors": 0}
+
+    def _cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, result = entry
+        if time.monotonic() > expires:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def _store(self, key, result):
+        if self.ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.ttl, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def get(self, symbol, period="1y"):
+        """Analysis for (symbol, period): from the cache, an in-flight computation, or a new one"""
+        key = (symbol, period)
+        self.stats["requests"] += 1
+        result = self._cached(key)
+        if result is not None:
+            self.stats["cache_hits"] += 1
+            return result
+
+        future = self._inflight.get(key) if self.coalesce else None
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, analyze, symbol, period, self.fetcher)
+            self.stats["computed"] += 1
+            if self.coalesce:
+                self._inflight[key] = future
+            future.add_done_callback(lambda f: self._finish(key, f))
+        # shield: one caller disconnecting must not cancel the work other callers are waiting on
+        try:
+            return await asyncio.shield(future)
+        except AnalysisError:
+            self.stats["errors"] += 1
+            raise
+
+    def _finish(self, key, future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled() and future.exception() is None:
+            self._store(key, future.result())
+
+    def clear(self):
+        self._cache.clear()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_app(fetcher=None, ttl=30.0, workers=8, coalesce=True):
+    """FastAPI app over one AnalysisService (default fetcher: the on-disk OHLCV cache over yfinance,
+    or synthetic data when STOCK_API_OFFLINE is set, e.g. under uvicorn)"""
+    if fetcher is None and os.environ.get("STOCK_API_OFFLINE"):
+        fetcher = SyntheticFetcher()
+    if fetcher is None:
+        from cache import OHLCVCache
+        fetcher = OHLCVCache()
+    service = AnalysisService(fetcher, ttl=ttl, workers=workers, coalesce=coalesce)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        service.close()
+
+    app = FastAPI(title="StockPulse API", description="StockEngine indicators and BUY/SELL/HOLD decisions",
+                  lifespan=lifespan)
+    app.state.service = service
+
+    def check_period(period):
+        if period not in PERIODS:
+            raise HTTPException(422, f"period must be one of {', '.join(PERIODS)}")
+
+    async def one(symbol, period):
+        try:
+            return await service.get(normalize_symbol(symbol), period)
+        except AnalysisError as e:
+            raise HTTPException(e.status, e.detail)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        # Fetch/indicator latency histograms from the engine, in Prometheus text format
+        return prometheus_text(app="stock-api")
+
+    @app.get("/stats")
+    async def stats():
+        return {**service.stats, "cached": len(service._cache), "inflight": len(service._inflight)}
+
+    @app.get("/analysis/{symbol}")
+    async def analysis(symbol: str, period: str = "1y"):
+        check_period(period)
+        return await one(symbol, period)
+
+    @app.get("/decision/{symbol}")
+    async def decision(symbol: str, period: str = "1y"):
+        check_period(period)
+        result = await one(symbol, period)
+        return {k: result[k] for k in ("symbol", "period", "as_of", "decision", "confidence", "reasons")}
+
+    @app.get("/analysis")
+    async def analysis_many(symbols: str = Query(..., description="Comma-separated symbols"), period: str = "1y"):
+        check_period(period)
+        names = list(dict.fromkeys(normalize_symbol(s) for s in symbols.split(",") if s.strip()))
+        if not names:
+            raise HTTPException(422, "no symbols given")
+        outcomes = await asyncio.gather(*(service.get(s, period) for s in names), return_exceptions=True)
+        results, errors = {}, {}
+        for symbol, outcome in zip(names, outcomes):
+            if isinstance(outcome, AnalysisError):
+                errors[symbol] = outcome.detail
+            elif isinstance(outcome, Exception):
+                raise outcome
+            else:
+                results[symbol] = outcome
+        return {"period": period, "results": results, "errors": errors}
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the StockPulse API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--ttl", type=float, default=30.0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--no-coalesce", action="store_true", help="compute every request separately")
+    parser.add_argument("--offline", action="store_true", help="use the synthetic fetcher instead of yfinance")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated fetch latency for --offline (s)")
+    args = parser.parse_args()
+
+    fetcher = SyntheticFetcher(latency=args.latency) if args.offline else None
+    # Keep-alive longer than uvicorn's 5 s default so busy clients are not cut off between requests
+    uvicorn.run(create_app(fetcher, ttl=args.ttl, workers=args.workers, coalesce=not args.no_coalesce),
+                host=args.host, port=args.port, log_level="warning", timeout_keep_alive=30)
@@ -0,0 +1,202 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from engine import StockEngine
+from screener import StockScreener
+
+DEFAULT_PARAMS = {
+    "sma_fast": 20, "sma_slow": 50, "rsi_window": 14,
+    "rsi_low": 30, "rsi_high": 70, "volume_mult": 1.5,
+    "buy_at": 60, "sell_at": 20,
+}
+
+
+class Backtester:
+    """Replays the get_decision rules on every bar of many symbols at once (no per-row loop).
+
+    Long-only: enter on BUY, exit on SELL, hold through HOLD. Signals act on the next bar's
+    return so there is no look-ahead.
+    """
+
+    def __init__(self, frames, cost_bps=10.0):
+        self.close = StockScreener.to_wide(frames, "Close")
+        self.volume = StockScreener.to_wide(frames, "Volume")
+        self.cost = cost_bps / 10_000
+        self.throughput = None  # bars per second of the last run / sweep
+        self._indicators = {}
+
+    @property
+    def bars(self):
+        return int(self.close.notna().sum().sum())
+
+    # ------------------------------------------
+    # Signals
+    # ------------------------------------------
+    def _indicator_frames(self, p):
+        # Indicator windows are shared by many grid points; compute each combination once
+        key = (p["sma_fast"], p["sma_slow"], p["rsi_window"])
+        if key not in self._indicators:
+            self._indicators[key] = StockEngine.indicator_frames(self.close, *key)
+        return self._indicators[key]
+
+    def scores(self, params=None):
+        """Decision score for every (bar, symbol); NaN until the slow SMA has warmed up"""
+        p = {**DEFAULT_PARAMS, **(params or {})}
+        ind = self._indicator_frames(p)
+        sma_fast, sma_slow = ind[f"SMA_{p['sma_fast']}"], ind[f"SMA_{p['sma_slow']}"]
+        # get_decision compares against df['Volume'].tail(20), which includes the current bar
+        volume_avg = self._own_bars(self.volume, lambda v: v.rolling(window=20, min_periods=1).mean())
+        score = StockEngine.score_arrays(
+            self.close, sma_fast, sma_slow, ind["RSI"], self.volume, volume_avg,
+            rsi_low=p["rsi_low"], rsi_high=p["rsi_high"], volume_mult=p["volume_mult"],
+        ).astype(float)
+        score[sma_slow.isna().to_numpy()] = np.nan
+        return pd.DataFrame(score, index=self.close.index, columns=self.close.columns)
+
+    @staticmethod
+    def _own_bars(wide, func):
+        """func applied to each symbol over its own bars only (skipping dates it did not trade), realigned"""
+        if not wide.isna().any().any():
+            return func(wide)
+        return pd.concat({symbol: func(wide[symbol].dropna()) for symbol in wide}, axis=1).reindex(
+            index=wide.index, columns=wide.columns)
+
+    def positions(self, params=None):
+        """1 while long, 0 while flat, carried forward between BUY and SELL bars"""
+        p = {**DEFAULT_PARAMS, **(params or {})}
+        score = self.scores(p)
+        signal = score.where(score >= p["buy_at"], np.nan)
+        signal = signal.where(signal.isna(), 1.0).mask(score <= p["sell_at"], 0.0)
+        return signal.ffill().fillna(0.0)
+
+    # ------------------------------------------
+    # Simulation
+    # ------------------------------------------
+    def run(self, params=None):
+        """Per-symbol P&L, drawdown and hit-rate table for one parameter set"""
+        start = time.perf_counter()
+        position = self.positions(params)
+        returns = self._own_bars(self.close, lambda c: c.pct_change()).fillna(0.0)
+        held = position.shift(1).fillna(0.0)
+        trades = position.diff().abs().fillna(position)
+        strat = held * returns - trades.shift(1).fillna(0.0) * self.cost
+
+        equity = (1 + strat).cumprod()
+        drawdown = equity / equity.cummax() - 1
+        buy_hold = self.close.ffill().iloc[-1] / self.close.bfill().iloc[0] - 1
+        sharpe = strat.mean() / strat.std().replace(0, np.nan) * np.sqrt(252)
+
+        table = pd.DataFrame({
+            "Total Return %": (equity.iloc[-1] - 1) * 100,
+            "Buy & Hold %": buy_hold * 100,
+            "Max Drawdown %": drawdown.min() * 100,
+            "Sharpe": sharpe,
+            "Trades": (position.diff() > 0).sum() + (position.iloc[0] > 0),
+            "Hit Rate %": self._hit_rate(held, strat) * 100,
+            "Exposure %": held.mean() * 100,
+        })
+        table.index.name = "Symbol"
+        self.throughput = self.bars / (time.perf_counter() - start)
+        return table
+
+    @staticmethod
+    def _hit_rate(held, strat):
+        """Share of closed-or-open trades that made money, per symbol"""
+        entries = (held.diff().fillna(held) > 0).cumsum()
+        trade_id = entries.where(held > 0)
+        long = pd.DataFrame({
+            "trade": trade_id.stack(),
+            "ret": np.log1p(strat.where(held > 0)).stack(),
+        })
+        if long.empty:
+            return pd.Series(np.nan, index=held.columns)
+        symbol = long.index.get_level_values(-1)
+        per_trade = long.groupby([symbol, long["trade"]])["ret"].sum()
+        return (per_trade > 0).groupby(level=0).mean().reindex(held.columns)
+
+    # ------------------------------------------
+    # Parameter sweeps
+    # ------------------------------------------
+    def sweep(self, grid, processes=None):
+        """Evaluate every combination in `grid` ({param: [values]}), in parallel across processes"""
+        keys = list(grid)
+        combos = [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+        start = time.perf_counter()
+
+        if processes == 1 or len(combos) == 1:
+            rows = [self._summary(c, self.run(c)) for c in combos]
+        else:
+            processes = processes or os.cpu_count()
+            chunksize = max(1, len(combos) // (processes * 4))
+            with ProcessPoolExecutor(processes, initializer=_init_worker,
+                                     initargs=(self.close, self.volume, self.cost)) as pool:
+                rows = list(pool.map(_run_combo, combos, chunksize=chunksize))
+
+        elapsed = time.perf_counter() - start
+        self.throughput = self.bars * len(combos) / elapsed
+        result = pd.DataFrame(rows)
+        return result.sort_values("Sharpe", ascending=False, ignore_index=True)
+
+    @staticmethod
+    def _summary(params, table):
+        return {
+            **params,
+            "Sharpe": table["Sharpe"].mean(),
+            "Total Return %": table["Total Return %"].mean(),
+            "Max Drawdown %": table["Max Drawdown %"].min(),
+            "Hit Rate %": table["Hit Rate %"].mean(),
+            "Trades": int(table["Trades"].sum()),
+        }
+
+    @classmethod
+    def _from_wide(cls, close, volume, cost):
+        bt = cls.__new__(cls)
+        bt.close, bt.volume, bt.cost = close, volume, cost
+        bt.throughput, bt._indicators = None, {}
+        return bt
+
+
+# Worker-side state: the price frames are shipped once per process, not once per combination
+_WORKER = {}
+
+
+def _init_worker(close, volume, cost):
+    _WORKER["bt"] = Backtester._from_wide(close, volume, cost)
+
+
+def _run_combo(params):
+    bt = _WORKER["bt"]
+    return Backtester._summary(params, bt.run(params))
+
+
+if __name__ == "__main__":
+    import argparse
+    from fetchers import SyntheticFetcher
+    from screener import NIFTY_50
+
+    parser = argparse.ArgumentParser(description="Backtest the StockPulse decision rules")
+    parser.add_argument("symbols", nargs="*", default=NIFTY_50)
+    parser.add_argument("--period", default="5y")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--offline", action="store_true", help="use the synthetic fetcher instead of yfinance")
+    args = parser.parse_args()
+
+    frames = StockScreener(fetcher=SyntheticFetcher() if args.offline else None).fetch_all(args.symbols, args.period)
+    bt = Backtester(frames)
+
+    table = bt.run()
+    print(table.to_string(float_format="{:,.2f}".format))
+    print(f"\nSingle run: {bt.bars:,} bars at {bt.throughput:,.0f} bars/sec")
+
+    grid = {
+        "sma_fast": [10, 20, 30], "sma_slow": [50, 100],
+        "rsi_low": [25, 30, 35], "rsi_high": [65, 70, 75], "volume_mult": [1.5, 2.0],
+    }
+    sweep = bt.sweep(grid, processes=args.processes)
+    print(sweep.head(10).to_string(float_format="{:,.2f}".format))
+    print(f"\nSweep: {len(sweep)} combinations at {bt.throughput:,.0f} bars/sec")
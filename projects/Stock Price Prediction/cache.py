@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from fetchers import yfinance_fetcher
+
+# Calendar length of each yfinance period, used to slice shorter periods out of longer cached ones
+PERIOD_OFFSETS = {
+    "5d": pd.DateOffset(days=5), "1mo": pd.DateOffset(months=1), "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6), "1y": pd.DateOffset(years=1), "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5), "10y": pd.DateOffset(years=10),
+}
+# Smallest period that covers a refresh gap of up to N days
+DELTA_PERIODS = [(4, "5d"), (28, "1mo"), (88, "3mo"), (180, "6mo"), (360, "1y"), (725, "2y"), (1820, "5y")]
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ohlcv")
+
+
+class OHLCVCache:
+    """Parquet-backed OHLCV cache with TTL, delta refresh and LRU eviction.
+
+    Instances are fetchers themselves (cache(symbol, period) -> DataFrame), so they can be
+    passed anywhere a yfinance-style fetcher is accepted.
+
+    Several processes (e.g. the Streamlit app and the API) may share one directory: each symbol
+    has its own parquet and JSON metadata file, both replaced atomically and re-read on every
+    call, so no process overwrites another's bookkeeping for other symbols.
+    """
+
+    def __init__(self, directory=DEFAULT_DIR, fetcher=None, ttl=15 * 60, max_symbols=200):
+        self.directory = directory
+        self.fetcher = fetcher or yfinance_fetcher
+        self.ttl = ttl
+        self.max_symbols = max_symbols
+        self._lock = threading.Lock()
+        self._symbol_locks = {}
+        os.makedirs(directory, exist_ok=True)
+
+    # ------------------------------------------
+    # Public API
+    # ------------------------------------------
+    def __call__(self, symbol, period="1y"):
+        return self.get(symbol, period)
+
+    def get(self, symbol, period="1y"):
+        """Return `period` of history for `symbol`, touching the network only when needed"""
+        with self._symbol_lock(symbol):
+            entry = self._read_meta(symbol)
+            df = self._read(symbol, entry) if entry else None
+
+            refreshed = False
+            if df is None or not self._covers(entry["period"], period):
+                df = self._full_fetch(symbol, period)
+                if df is None:
+                    return None
+                covered, refreshed = period, True
+            else:
+                covered = entry["period"]
+                if time.time() - entry["fetched"] > self.ttl:
+                    df, refreshed = self._delta_refresh(symbol, df, covered)
+
+            self._touch(symbol, entry, covered, refreshed, len(df))
+            return self.slice(df, period)
+
+    def invalidate(self, symbol=None):
+        """Drop one symbol (or everything) from the cache"""
+        with self._lock:
+            for s in [symbol] if symbol else [meta["symbol"] for meta in self._all_meta()]:
+                self._remove_files(s)
+
+    @staticmethod
+    def slice(df, period):
+        """Serve a shorter period as a trailing slice of a longer cached frame"""
+        offset = PERIOD_OFFSETS.get(period)
+        if offset is None or df.empty:
+            return df
+        return df[df.index > df.index[-1] - offset]
+
+    # ------------------------------------------
+    # Network
+    # ------------------------------------------
+    def _full_fetch(self, symbol, period):
+        df = self.fetcher(symbol, period)
+        if df is None or df.empty:
+            return None
+        df = df.sort_index()
+        self._write(symbol, df)
+        return df
+
+    def _delta_refresh(self, symbol, cached, covered):
+        """Append only bars at or after the last cached timestamp (the last bar may still be live)"""
+        last = cached.index[-1]
+        now = pd.Timestamp.now(tz=last.tz)
+        gap_days = (now - last).days
+        period = next((p for days, p in DELTA_PERIODS if gap_days <= days), None)
+        if period is None:
+            # Too stale to patch; a full refetch is as cheap as a long delta
+            df = self._full_fetch(symbol, covered)
+            return (cached, False) if df is None else (df, True)
+
+        try:
+            fresh = self.fetcher(symbol, period)
+        except Exception:
+            fresh = None
+        if fresh is None or fresh.empty:
+            # Serve stale data instead of failing the page; retry on the next call
+            return cached, False
+
+        fresh = fresh[fresh.index >= last]
+        df = pd.concat([cached, fresh])
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        self._write(symbol, df)
+        return df, True
+
+    # ------------------------------------------
+    # Storage
+    # ------------------------------------------
+    def _path(self, symbol, ext="parquet"):
+        safe = "".join(c if c.isalnum() or c in "-_." else f"%{ord(c):02X}" for c in symbol)
+        return os.path.join(self.directory, f"{safe}.{ext}")
+
+    def _read(self, symbol, entry):
+        try:
+            df = pd.read_parquet(self._path(symbol))
+        except (OSError, ValueError):
+            return None
+        # Another process may have replaced the data between our metadata and data reads;
+        # a frame that does not match its metadata is treated as a miss
+        return df if len(df) == entry.get("rows") else None
+
+    @staticmethod
+    def _replace(path, write):
+        # Write-then-rename so concurrent readers (in any process) never see a half-written file
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write(tmp)
+        os.replace(tmp, path)
+
+    def _write(self, symbol, df):
+        self._replace(self._path(symbol), df.to_parquet)
+
+    def _read_meta(self, symbol):
+        try:
+            with open(self._path(symbol, "json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, symbol, entry):
+        def write(tmp):
+            with open(tmp, "w") as f:
+                json.dump(entry, f)
+        self._replace(self._path(symbol, "json"), write)
+
+    def _all_meta(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        entries.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return [entry for entry in entries if isinstance(entry, dict) and "symbol" in entry]
+
+    def _remove_files(self, symbol):
+        # Metadata first, so a concurrent reader never finds metadata without its data
+        for ext in ("json", "parquet"):
+            try:
+                os.remove(self._path(symbol, ext))
+            except FileNotFoundError:
+                pass
+
+    def _touch(self, symbol, entry, period, refreshed, rows):
+        now = time.time()
+        fetched = now if refreshed or entry is None else entry["fetched"]
+        self._write_meta(symbol, {"symbol": symbol, "period": period, "fetched": fetched,
+                                  "used": now, "rows": rows})
+        if entry is None:
+            self._evict()
+
+    def _evict(self):
+        """Least-recently-used eviction once the cache holds more than max_symbols"""
+        with self._lock:
+            entries = self._all_meta()
+            excess = len(entries) - self.max_symbols
+            if excess <= 0:
+                return
+            for meta in sorted(entries, key=lambda m: m.get("used", 0.0))[:excess]:
+                self._remove_files(meta["symbol"])
+
+    def _symbol_lock(self, symbol):
+        with self._lock:
+            return self._symbol_locks.setdefault(symbol, threading.Lock())
+
+    @staticmethod
+    def _covers(cached_period, period):
+        cached = PERIOD_OFFSETS.get(cached_period)
+        wanted = PERIOD_OFFSETS.get(period)
+        if cached is None or wanted is None:
+            return cached_period == period
+        ref = pd.Timestamp("2000-01-01")
+        return ref + cached >= ref + wanted
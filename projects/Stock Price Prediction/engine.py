@@ -0,0 +1,139 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from fetchers import yfinance_fetcher
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.metrics import timed
+
+
+class StockEngine:
+    @staticmethod
+    @timed("stock.fetch_data")
+    def fetch_data(symbol, period="1y", fetcher=None):
+        """Fetch stock data from Yahoo Finance (or any fetcher(symbol, period) callable)"""
+        try:
+            df = (fetcher or yfinance_fetcher)(symbol, period)
+            if df is None or df.empty:
+                return None
+            return df
+        except Exception:
+            return None
+
+    @staticmethod
+    def indicator_frames(close, sma_fast=20, sma_slow=50, rsi_window=14):
+        """SMA/RSI/Volatility for a Close Series, or for a wide frame with one column per symbol"""
+        if isinstance(close, pd.DataFrame) and close.isna().any().any():
+            return StockEngine._wide_indicator_frames(close, sma_fast, sma_slow, rsi_window)
+        sma_f = close.rolling(window=sma_fast).mean()
+        sma_s = close.rolling(window=sma_slow).mean()
+
+        # RSI Calculation
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=rsi_window).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_window).mean()
+        rs = gain / loss
+        rsi = 100 - (100 / (1 + rs))
+
+        # Volatility
+        volatility = close.pct_change().rolling(window=21).std() * np.sqrt(252)
+        return {f"SMA_{sma_fast}": sma_f, f"SMA_{sma_slow}": sma_s, "RSI": rsi, "Volatility": volatility}
+
+    @staticmethod
+    def _wide_indicator_frames(close, sma_fast, sma_slow, rsi_window):
+        """Indicators per symbol, each over its own bars, realigned to the wide (date x symbol) index.
+
+        A date on which only other symbols traded is a NaN row for this one; left in place it would
+        count as a zero move in the RSI and blank the volatility window. Symbols without gaps are
+        still computed together in one vectorized pass.
+        """
+        windows = (sma_fast, sma_slow, rsi_window)
+        complete = close.notna().all()
+        parts = [StockEngine.indicator_frames(close.loc[:, complete], *windows)]
+        for symbol in close.columns[~complete]:
+            series = close[symbol].dropna()
+            parts.append({name: values.to_frame(symbol)
+                          for name, values in StockEngine.indicator_frames(series, *windows).items()})
+        return {name: pd.concat([part[name] for part in parts], axis=1).reindex(index=close.index, columns=close.columns)
+                for name in parts[0]}
+
+    @staticmethod
+    @timed("stock.calculate_indicators")
+    def calculate_indicators(df):
+        """Add technical indicators for analysis"""
+        for name, values in StockEngine.indicator_frames(df['Close']).items():
+            df[name] = values
+        return df
+
+    @staticmethod
+    def score_arrays(close, sma_20, sma_50, rsi, volume, volume_avg, rsi_low=30, rsi_high=70, volume_mult=1.5):
+        """Element-wise version of the get_decision scoring rules (works on arrays, Series or frames)"""
+        close, sma_20, sma_50, rsi, volume, volume_avg = (
+            np.asarray(x, dtype=float) for x in (close, sma_20, sma_50, rsi, volume, volume_avg)
+        )
+        score = np.where(close > sma_20, 20, 0)
+        score = score + np.where(sma_20 > sma_50, 20, 0)
+        score = score + np.where(rsi < rsi_low, 30, np.where(rsi > rsi_high, -20, 10))
+        score = score + np.where(volume > volume_avg * volume_mult, 20, 0)
+        return score
+
+    @staticmethod
+    def classify(score, buy_at=60, sell_at=20):
+        """Map scores to (decision, confidence) arrays using the get_decision thresholds"""
+        score = np.asarray(score)
+        decision = np.where(score >= buy_at, "BUY", np.where(score <= sell_at, "SELL", "HOLD"))
+        confidence = np.where(
+            score >= buy_at, np.minimum(score, 95),
+            np.where(score <= sell_at, np.minimum(np.abs(score) + 40, 95), 50 + score // 2),
+        )
+        return decision, confidence
+
+    @staticmethod
+    def get_decision(df):
+        """Intelligent decision engine based on indicators"""
+        latest = df.iloc[-1]
+        prev = df.iloc[-2]
+        
+        score = 0
+        reasons = []
+        
+        # Trend Analysis
+        if latest['Close'] > latest['SMA_20']:
+            score += 20
+            reasons.append("Price is above 20-Day SMA (Short-term Bullish)")
+        
+        if latest['SMA_20'] > latest['SMA_50']:
+            score += 20
+            reasons.append("Golden Cross formation (20 SMA > 50 SMA)")
+        
+        # momentum (RSI)
+        if latest['RSI'] < 30:
+            score += 30
+            reasons.append("Oversold condition (RSI < 30) - Potential Reversal")
+        elif latest['RSI'] > 70:
+            score -= 20
+            reasons.append("Overbought condition (RSI > 70) - Risk of Pullback")
+        else:
+            score += 10
+            reasons.append(f"Neutral Momentum (RSI: {latest['RSI']:.1f})")
+            
+        # Volume Analysis
+        if latest['Volume'] > df['Volume'].tail(20).mean() * 1.5:
+            score += 20
+            reasons.append("High Volume breakout detected")
+
+        # Final Decision
+        if score >= 60:
+            decision = "BUY"
+            confidence = min(score, 95)
+        elif score <= 20:
+            decision = "SELL"
+            confidence = min(abs(score) + 40, 95)
+        else:
+            decision = "HOLD"
+            confidence = 50 + (score // 2)
+            
+        return decision, confidence, reasons
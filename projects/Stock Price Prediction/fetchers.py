@@ -0,0 +1,50 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Approximate number of trading sessions per yfinance period string
+PERIOD_BARS = {"1mo": 21, "3mo": 63, "6mo": 126, "1y": 252, "2y": 504, "5y": 1260, "10y": 2520}
+
+
+def yfinance_fetcher(symbol, period="1y"):
+    """Default fetcher: full OHLCV history from Yahoo Finance"""
+    import yfinance as yf
+    return yf.Ticker(symbol).history(period=period)
+
+
+class CsvFetcher:
+    """Offline stand-in for yfinance that reads <directory>/<SYMBOL>.csv files"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def __call__(self, symbol, period="1y"):
+        path = os.path.join(self.directory, f"{symbol}.csv")
+        if not os.path.exists(path):
+            return None
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+        return df.tail(PERIOD_BARS.get(period, len(df)))
+
+
+class SyntheticFetcher:
+    """Deterministic random-walk OHLCV generator (no network), optionally with simulated latency"""
+
+    def __init__(self, seed=42, latency=0.0, end=None):
+        self.seed = seed
+        self.latency = latency
+        self.end = pd.Timestamp(end) if end is not None else pd.Timestamp.today().normalize()
+
+    def __call__(self, symbol, period="1y"):
+        if self.latency:
+            time.sleep(self.latency)
+        n = PERIOD_BARS.get(period, 252)
+        # Seed per symbol so every call for the same symbol returns the same history
+        rng = np.random.default_rng([self.seed, sum(map(ord, symbol))])
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.015, n)))
+        open_ = close * (1 + rng.normal(0, 0.004, n))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, n)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, n)))
+        volume = rng.lognormal(13, 0.4, n).round()
+        index = pd.bdate_range(end=self.end, periods=n, name="Date")
+        return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
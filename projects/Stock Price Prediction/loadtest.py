@@ -0,0 +1,120 @@
+"""Load test for api.py against the synthetic (offline) data source.
+
+Each configuration starts its own server process, then `concurrency` clients send `requests`
+requests between them. Symbols are drawn with a Zipf skew, so a few popular ones get most of the
+traffic, as they would on a real dashboard. Reports p50/p99 latency, requests/sec and how the
+server answered (computed, coalesced onto an in-flight request, or served from the cache).
+
+    python loadtest.py --requests 2000 --concurrency 64 --latency 0.05
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from screener import NIFTY_50
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+CONFIGS = {
+    "naive": ["--no-coalesce", "--ttl", "0"],
+    "coalesce": ["--ttl", "0"],
+    "coalesce+ttl": ["--ttl", "30"],
+}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(flags, latency, workers):
+    """api.py --offline in a subprocess; returns (process, base URL) once /health answers"""
+    port = _free_port()
+    proc = subprocess.Popen([sys.executable, "api.py", "--offline", "--port", str(port), "--latency", str(latency),
+                             "--workers", str(workers)] + flags, cwd=HERE)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health").status_code == 200:
+                return proc, url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("api.py did not start")
+
+
+def request_paths(n, period, seed=0, skew=1.2):
+    rng = np.random.default_rng(seed)
+    ranks = np.minimum(rng.zipf(skew, n), len(NIFTY_50)) - 1
+    return [f"/analysis/{NIFTY_50[r]}?period={period}" for r in ranks]
+
+
+async def _drive(url, paths, concurrency):
+    latencies, failures = [], 0
+    queue = iter(paths)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal failures
+            for path in queue:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                except httpx.TransportError:
+                    failures += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                failures += response.status_code != 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        stats = (await client.get("/stats")).json()
+    return latencies, failures, elapsed, stats
+
+
+def run(config, n_requests=2000, concurrency=64, latency=0.05, period="1y", workers=8):
+    proc, url = start_server(CONFIGS[config], latency, workers)
+    try:
+        latencies, failures, elapsed, stats = asyncio.run(_drive(url, request_paths(n_requests, period), concurrency))
+    finally:
+        proc.terminate()
+        proc.wait()
+    ms = np.array(latencies) * 1000
+    return {
+        "config": config,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "req_s": len(ms) / elapsed,
+        "failures": failures,
+        **{k: stats[k] for k in ("computed", "coalesced", "cache_hits")},
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test the StockPulse API on synthetic data")
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated data-source latency (s)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--period", default="1y")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients, {args.latency * 1000:.0f} ms fetch latency")
+    print(f"{'config':<13} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>8} {'computed':>9} {'coalesced':>10} {'cached':>7} {'failed':>7}")
+    for config in args.configs:
+        r = run(config, args.requests, args.concurrency, args.latency, args.period, args.workers)
+        print(f"{r['config']:<13} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['req_s']:>8.1f} "
+              f"{r['computed']:>9} {r['coalesced']:>10} {r['cache_hits']:>7} {r['failures']:>7}")
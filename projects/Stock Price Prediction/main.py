@@ -1,11 +1,21 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import datetime
+import os
+import sys
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from cache import OHLCVCache
+from engine import StockEngine
+from screener import StockScreener, NIFTY_50
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.metrics import debug_panel, instrument_app, timed
+
+instrument_app("stock")
+
 # ==========================================
 # 1. PAGE CONFIGURATION & STYLING
 # ==========================================
@@ -37,90 +47,42 @@ st.markdown("""
 # ==========================================
 # 2. CORE LOGIC (ENGINE)
 # ==========================================
-class StockEngine:
-    @staticmethod
-    def fetch_data(symbol, period="1y"):
-        """Fetch stock data from Yahoo Finance"""
-        try:
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=period)
-            if df.empty:
-                return None
-            return df
-        except Exception:
-            return None
-
-    @staticmethod
-    def calculate_indicators(df):
-        """Add technical indicators for analysis"""
-        # Close Price (Latest)
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50).mean()
-        
-        # RSI Calculation
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        # Volatility
-        df['Volatility'] = df['Close'].pct_change().rolling(window=21).std() * np.sqrt(252)
-        return df
-
-    @staticmethod
-    def get_decision(df):
-        """Intelligent decision engine based on indicators"""
-        latest = df.iloc[-1]
-        prev = df.iloc[-2]
-        
-        score = 0
-        reasons = []
-        
-        # Trend Analysis
-        if latest['Close'] > latest['SMA_20']:
-            score += 20
-            reasons.append("Price is above 20-Day SMA (Short-term Bullish)")
-        
-        if latest['SMA_20'] > latest['SMA_50']:
-            score += 20
-            reasons.append("Golden Cross formation (20 SMA > 50 SMA)")
-        
-        # momentum (RSI)
-        if latest['RSI'] < 30:
-            score += 30
-            reasons.append("Oversold condition (RSI < 30) - Potential Reversal")
-        elif latest['RSI'] > 70:
-            score -= 20
-            reasons.append("Overbought condition (RSI > 70) - Risk of Pullback")
-        else:
-            score += 10
-            reasons.append(f"Neutral Momentum (RSI: {latest['RSI']:.1f})")
-            
-        # Volume Analysis
-        if latest['Volume'] > df['Volume'].tail(20).mean() * 1.5:
-            score += 20
-            reasons.append("High Volume breakout detected")
-
-        # Final Decision
-        if score >= 60:
-            decision = "BUY"
-            confidence = min(score, 95)
-        elif score <= 20:
-            decision = "SELL"
-            confidence = min(abs(score) + 40, 95)
-        else:
-            decision = "HOLD"
-            confidence = 50 + (score // 2)
-            
-        return decision, confidence, reasons
+# StockEngine lives in engine.py so the screener and other tools can reuse it headless
+
+@st.cache_resource
+def get_price_cache():
+    """One on-disk OHLCV cache shared by every session and rerun"""
+    return OHLCVCache()
 
 # ==========================================
 # 3. USER INTERFACE (UI)
 # ==========================================
+def screener_view(period):
+    """Rank the whole Nifty 50 universe in one batched pass"""
+    st.subheader("Nifty 50 Screener")
+    symbols = st.multiselect("Universe", NIFTY_50, default=NIFTY_50)
+    workers = st.slider("Parallel Fetches", 1, 32, 8)
+
+    if st.button("Run Screener") and symbols:
+        with st.spinner(f"Scanning {len(symbols)} symbols..."):
+            screener = StockScreener(fetcher=get_price_cache(), max_workers=workers)
+            table = screener.scan(symbols, period)
+
+        c1, c2, c3 = st.columns(3)
+        c1.metric("BUY", int((table['Decision'] == "BUY").sum()))
+        c2.metric("HOLD", int((table['Decision'] == "HOLD").sum()))
+        c3.metric("SELL", int((table['Decision'] == "SELL").sum()))
+        st.dataframe(table.style.format(precision=2), use_container_width=True)
+
+        if screener.errors:
+            with st.expander(f"Skipped {len(screener.errors)} symbols"):
+                for failed, error in screener.errors.items():
+                    st.write(f"- {failed}: {error}")
+
 def main():
     # Sidebar Setup
     st.sidebar.markdown("# 🔧 Controls")
+    mode = st.sidebar.radio("Mode", ["Single Stock", "Nifty 50 Screener"])
     symbol = st.sidebar.text_input("Enter NSE Stock Symbol", value="RELIANCE").upper()
     if not symbol.endswith(".NS") and "^" not in symbol:
         symbol += ".NS"
@@ -132,10 +94,12 @@ def main():
     st.divider()
 
     # App Logic
-    if symbol:
+    if mode == "Nifty 50 Screener":
+        screener_view(period)
+    elif symbol:
         with st.spinner(f"Analyzing {symbol}..."):
             engine = StockEngine()
-            data = engine.fetch_data(symbol, period)
+            data = engine.fetch_data(symbol, period, fetcher=get_price_cache())
             
             if data is not None and len(data) > 50:
                 data = engine.calculate_indicators(data)
@@ -171,25 +135,26 @@ def main():
                 st.markdown("---")
                 st.subheader("Technical Chart")
                 
-                fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
-                                   vertical_spacing=0.1, subplot_titles=('Price & Moving Averages', 'RSI Momentum'),
-                                   row_width=[0.3, 0.7])
+                with timed("stock.chart"):
+                    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
+                                       vertical_spacing=0.1, subplot_titles=('Price & Moving Averages', 'RSI Momentum'),
+                                       row_width=[0.3, 0.7])
 
-                # Candlestick
-                fig.add_trace(go.Candlestick(x=data.index, open=data['Open'], high=data['High'],
-                                            low=data['Low'], close=data['Close'], name="Price"), row=1, col=1)
-                
-                # SMAs
-                fig.add_trace(go.Scatter(x=data.index, y=data['SMA_20'], line=dict(color='orange', width=1), name="SMA 20"), row=1, col=1)
-                fig.add_trace(go.Scatter(x=data.index, y=data['SMA_50'], line=dict(color='cyan', width=1), name="SMA 50"), row=1, col=1)
-                
-                # RSI
-                fig.add_trace(go.Scatter(x=data.index, y=data['RSI'], line=dict(color='magenta', width=1), name="RSI"), row=2, col=1)
-                fig.add_trace(go.Scatter(x=data.index, y=[70]*len(data), line=dict(color='red', width=1, dash='dash'), name="Overbought"), row=2, col=1)
-                fig.add_trace(go.Scatter(x=data.index, y=[30]*len(data), line=dict(color='green', width=1, dash='dash'), name="Oversold"), row=2, col=1)
+                    # Candlestick
+                    fig.add_trace(go.Candlestick(x=data.index, open=data['Open'], high=data['High'],
+                                                low=data['Low'], close=data['Close'], name="Price"), row=1, col=1)
+                    
+                    # SMAs
+                    fig.add_trace(go.Scatter(x=data.index, y=data['SMA_20'], line=dict(color='orange', width=1), name="SMA 20"), row=1, col=1)
+                    fig.add_trace(go.Scatter(x=data.index, y=data['SMA_50'], line=dict(color='cyan', width=1), name="SMA 50"), row=1, col=1)
+                    
+                    # RSI
+                    fig.add_trace(go.Scatter(x=data.index, y=data['RSI'], line=dict(color='magenta', width=1), name="RSI"), row=2, col=1)
+                    fig.add_trace(go.Scatter(x=data.index, y=[70]*len(data), line=dict(color='red', width=1, dash='dash'), name="Overbought"), row=2, col=1)
+                    fig.add_trace(go.Scatter(x=data.index, y=[30]*len(data), line=dict(color='green', width=1, dash='dash'), name="Oversold"), row=2, col=1)
 
-                fig.update_layout(height=600, template="plotly_dark", showlegend=False, 
-                                  xaxis_rangeslider_visible=False)
+                    fig.update_layout(height=600, template="plotly_dark", showlegend=False, 
+                                      xaxis_rangeslider_visible=False)
                 st.plotly_chart(fig, use_container_width=True)
 
                 # Data Table
@@ -198,6 +163,8 @@ def main():
             else:
                 st.error("Data fetch failed. Please check the symbol (e.g., RELIANCE, TCS, INFY).")
 
+    debug_panel()
+
     # Footer
     st.sidebar.divider()
     st.sidebar.info("Developed for Portfolio Showcase. \n\nDisclaimer: Not Financial Advice.")
@@ -0,0 +1,167 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+
+from engine import StockEngine
+from fetchers import yfinance_fetcher
+
+NIFTY_50 = [
+    "ADANIENT.NS", "ADANIPORTS.NS", "APOLLOHOSP.NS", "ASIANPAINT.NS", "AXISBANK.NS",
+    "BAJAJ-AUTO.NS", "BAJFINANCE.NS", "BAJAJFINSV.NS", "BEL.NS", "BHARTIARTL.NS",
+    "BPCL.NS", "BRITANNIA.NS", "CIPLA.NS", "COALINDIA.NS", "DRREDDY.NS",
+    "EICHERMOT.NS", "GRASIM.NS", "HCLTECH.NS", "HDFCBANK.NS", "HDFCLIFE.NS",
+    "HEROMOTOCO.NS", "HINDALCO.NS", "HINDUNILVR.NS", "ICICIBANK.NS", "INDUSINDBK.NS",
+    "INFY.NS", "ITC.NS", "JSWSTEEL.NS", "KOTAKBANK.NS", "LT.NS",
+    "M&M.NS", "MARUTI.NS", "NESTLEIND.NS", "NTPC.NS", "ONGC.NS",
+    "POWERGRID.NS", "RELIANCE.NS", "SBILIFE.NS", "SBIN.NS", "SHRIRAMFIN.NS",
+    "SUNPHARMA.NS", "TATACONSUM.NS", "TATAMOTORS.NS", "TATASTEEL.NS", "TCS.NS",
+    "TECHM.NS", "TITAN.NS", "TRENT.NS", "ULTRACEMCO.NS", "WIPRO.NS",
+]
+
+
+class StockScreener:
+    """Scores many symbols at once: concurrent fetch, one vectorized indicator pass, ranked table"""
+
+    def __init__(self, fetcher=None, max_workers=8, retries=2, timeout=15.0, backoff=0.5, min_bars=51):
+        self.fetcher = fetcher or yfinance_fetcher
+        self.max_workers = max_workers
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.min_bars = min_bars
+        self.errors = {}
+
+    # ------------------------------------------
+    # Fetching
+    # ------------------------------------------
+    def _attempt(self, started, key, symbol, period, attempt):
+        """One fetch attempt; the per-symbol timeout clock starts only once a worker picks it up"""
+        if attempt > 1:
+            time.sleep(self.backoff * 2 ** (attempt - 2))
+        started[key] = time.monotonic()
+        return self.fetcher(symbol, period)
+
+    def fetch_all(self, symbols, period="1y"):
+        """Fetch every symbol on a bounded thread pool with retries; returns {symbol: DataFrame}"""
+        results, attempts, started, pending = {}, {}, {}, {}
+        self.errors = {}
+
+        # No context manager: exiting one would block on abandoned (timed-out) workers
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        def submit(symbol):
+            attempts[symbol] = attempts.get(symbol, 0) + 1
+            key = (symbol, attempts[symbol])
+            future = pool.submit(self._attempt, started, key, symbol, period, attempts[symbol])
+            pending[future] = key
+
+        try:
+            for symbol in dict.fromkeys(symbols):
+                submit(symbol)
+
+            while pending:
+                done, _ = wait(pending, timeout=min(self.timeout, 0.25), return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future, key in list(pending.items()):
+                    symbol = key[0]
+                    if future in done:
+                        del pending[future]
+                        try:
+                            df = future.result()
+                            if df is not None and not df.empty:
+                                results[symbol] = df
+                                continue
+                            self.errors[symbol] = "empty response"
+                        except Exception as e:
+                            self.errors[symbol] = f"{type(e).__name__}: {e}"
+                    elif key in started and now - started[key] > self.timeout:
+                        # The worker thread cannot be killed; abandon its result and move on
+                        del pending[future]
+                        self.errors[symbol] = f"timed out after {self.timeout:g}s"
+                    else:
+                        continue
+                    if attempts[symbol] <= self.retries:
+                        submit(symbol)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        for symbol in results:
+            self.errors.pop(symbol, None)
+        return results
+
+    # ------------------------------------------
+    # Scoring
+    # ------------------------------------------
+    @staticmethod
+    def to_wide(frames, column):
+        """Align one OHLCV column of every symbol into a single (date x symbol) frame"""
+        wide = pd.concat({symbol: df[column] for symbol, df in frames.items()}, axis=1)
+        if isinstance(wide.index, pd.DatetimeIndex) and wide.index.tz is not None:
+            wide.index = wide.index.tz_localize(None)
+        return wide.sort_index()
+
+    def score(self, frames):
+        """Vectorized indicators + decisions for every symbol; returns the ranked table"""
+        frames = {s: df for s, df in frames.items() if len(df) >= self.min_bars}
+        for symbol in frames.keys() & self.errors.keys():
+            self.errors.pop(symbol)
+        if not frames:
+            return pd.DataFrame(columns=["Price", "Change %", "RSI", "Volatility %", "Score", "Decision", "Confidence"])
+
+        close = self.to_wide(frames, "Close")
+        volume = self.to_wide(frames, "Volume")
+        ind = StockEngine.indicator_frames(close)
+
+        # Last available bar per symbol (symbols may stop trading before the others)
+        last = {name: frame.ffill().iloc[-1] for name, frame in ind.items()}
+        latest_close = close.ffill().iloc[-1]
+        prev_close = close.apply(lambda c: c.dropna().iloc[-2])
+        latest_volume = volume.ffill().iloc[-1]
+        volume_avg = volume.apply(lambda c: c.dropna().tail(20).mean())
+
+        score = StockEngine.score_arrays(
+            latest_close, last["SMA_20"], last["SMA_50"], last["RSI"], latest_volume, volume_avg
+        )
+        decision, confidence = StockEngine.classify(score)
+
+        table = pd.DataFrame({
+            "Price": latest_close,
+            "Change %": (latest_close / prev_close - 1) * 100,
+            "RSI": last["RSI"],
+            "Volatility %": last["Volatility"] * 100,
+            "Score": score,
+            "Decision": decision,
+            "Confidence": confidence,
+        }, index=close.columns)
+        table.index.name = "Symbol"
+        return table.sort_values(["Score", "Confidence"], ascending=False)
+
+    def scan(self, symbols, period="1y"):
+        """Fetch + score a list of symbols; failures are listed in self.errors"""
+        frames = self.fetch_all(symbols, period)
+        for symbol, df in frames.items():
+            if len(df) < self.min_bars:
+                self.errors[symbol] = f"only {len(df)} bars"
+        return self.score(frames)
+
+
+if __name__ == "__main__":
+    import argparse
+    from fetchers import SyntheticFetcher
+
+    parser = argparse.ArgumentParser(description="Rank symbols by the StockPulse decision score")
+    parser.add_argument("symbols", nargs="*", default=NIFTY_50)
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--offline", action="store_true", help="use the synthetic fetcher instead of yfinance")
+    args = parser.parse_args()
+
+    screener = StockScreener(fetcher=SyntheticFetcher() if args.offline else None, max_workers=args.workers)
+    start = time.perf_counter()
+    table = screener.scan(args.symbols, args.period)
+    print(table.to_string(float_format="{:,.2f}".format))
+    print(f"\n{len(table)} symbols scored in {time.perf_counter() - start:.2f}s")
+    for symbol, error in screener.errors.items():
+        print(f"  skipped {symbol}: {error}")
@@ -0,0 +1,148 @@
+import math
+from collections import deque
+
+import pandas as pd
+
+from engine import StockEngine
+
+
+class RollingWindow:
+    """Fixed-size window with running sum / sum of squares (O(1) push and replace)"""
+
+    RESUM_EVERY = 1000  # periodically rebuild the sums from the buffer to cancel float drift
+
+    def __init__(self, size):
+        self.size = size
+        self.buf = deque(maxlen=size)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nans = 0
+        self._ops = 0
+
+    def _add(self, x, sign):
+        if math.isnan(x):
+            self.nans += sign
+        else:
+            self.total += sign * x
+            self.total_sq += sign * x * x
+
+    def push(self, x):
+        if len(self.buf) == self.size:
+            self._add(self.buf[0], -1)
+        self.buf.append(x)
+        self._add(x, 1)
+        self._tick()
+
+    def replace_last(self, x):
+        self._add(self.buf[-1], -1)
+        self.buf[-1] = x
+        self._add(x, 1)
+        self._tick()
+
+    def _tick(self):
+        self._ops += 1
+        if self._ops >= self.RESUM_EVERY:
+            valid = [v for v in self.buf if not math.isnan(v)]
+            self.total = math.fsum(valid)
+            self.total_sq = math.fsum(v * v for v in valid)
+            self.nans = len(self.buf) - len(valid)
+            self._ops = 0
+
+    @property
+    def ready(self):
+        # pandas rolling() needs a full window with no NaNs
+        return len(self.buf) == self.size and self.nans == 0
+
+    def mean(self):
+        return self.total / self.size if self.ready else math.nan
+
+    def std(self):
+        """Sample standard deviation (ddof=1), like pandas rolling().std()"""
+        if not self.ready:
+            return math.nan
+        var = (self.total_sq - self.total * self.total / self.size) / (self.size - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class StreamingIndicators:
+    """Incremental SMA_20 / SMA_50 / RSI / Volatility that match StockEngine.calculate_indicators.
+
+    Each new bar costs O(1); `update(..., new_bar=False)` revises the still-forming last bar
+    (live ticks) without touching the rest of the history.
+    """
+
+    def __init__(self, history=20):
+        self.sma_20 = RollingWindow(20)
+        self.sma_50 = RollingWindow(50)
+        self.gain = RollingWindow(14)
+        self.loss = RollingWindow(14)
+        self.returns = RollingWindow(21)
+        self.volume = RollingWindow(20)
+        self.rows = deque(maxlen=max(history, 2))
+        self.prev_close = None
+        self.close = None
+
+    @classmethod
+    def from_frame(cls, df):
+        """Warm up from an OHLCV history (one pass), then keep streaming from its last bar"""
+        stream = cls()
+        for close, volume in zip(df['Close'].to_numpy(float), df['Volume'].to_numpy(float)):
+            stream.update(close, volume)
+        if len(stream.rows) and len(df):
+            # Keep the original timestamps on the rows used by get_decision
+            for row, ts in zip(stream.rows, df.index[-len(stream.rows):]):
+                row['Date'] = ts
+        return stream
+
+    def update(self, close, volume=0.0, new_bar=True, timestamp=None):
+        """Append a bar (or revise the last one) and return the latest indicator values"""
+        if not new_bar and self.close is None:
+            new_bar = True
+        if new_bar:
+            self.prev_close = self.close
+        self.close = float(close)
+
+        # Same edge cases as the pandas version: the first diff is NaN and counts as 0 in RSI,
+        # the first pct_change is NaN and keeps Volatility undefined for one extra window
+        if self.prev_close is None:
+            delta, ret = math.nan, math.nan
+        else:
+            delta = self.close - self.prev_close
+            ret = self.close / self.prev_close - 1 if self.prev_close else math.nan
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        windows = ((self.sma_20, self.close), (self.sma_50, self.close), (self.gain, gain),
+                   (self.loss, loss), (self.returns, ret), (self.volume, float(volume)))
+        for window, value in windows:
+            window.push(value) if new_bar else window.replace_last(value)
+
+        row = {'Date': timestamp, 'Close': self.close, 'Volume': float(volume), **self.values()}
+        if new_bar:
+            self.rows.append(row)
+        else:
+            self.rows[-1] = row
+        return self.values()
+
+    def values(self):
+        return {
+            'SMA_20': self.sma_20.mean(),
+            'SMA_50': self.sma_50.mean(),
+            'RSI': self._rsi(),
+            'Volatility': self.returns.std() * math.sqrt(252),
+        }
+
+    def _rsi(self):
+        gain, loss = self.gain.mean(), self.loss.mean()
+        if math.isnan(gain) or math.isnan(loss):
+            return math.nan
+        if loss == 0:
+            return 100.0 if gain > 0 else math.nan
+        return 100 - (100 / (1 + gain / loss))
+
+    def frame(self):
+        """The last few bars as a DataFrame, enough for StockEngine.get_decision"""
+        return pd.DataFrame(list(self.rows)).set_index('Date')
+
+    def decision(self):
+        return StockEngine.get_decision(self.frame())
@@ -0,0 +1,173 @@
+"""Text-to-speech for the voice assistant: pluggable engines, a phrase cache and sentence streaming.
+
+Responses are split into sentences and each sentence is synthesized (or served from the cache) on
+its own, so the first one can start playing while the rest are still being rendered. Audio only
+ever lives in memory as bytes; nothing is written to temp files.
+
+    python tts.py "Hello there. How are you today?" --backend tone
+"""
+import hashlib
+import io
+import math
+import re
+import struct
+import threading
+import wave
+from collections import OrderedDict
+
+
+# ==========================================
+# Engines
+# ------------------------------------------
+class GTTSBackend:
+    """Google Translate TTS (needs network), MP3 output"""
+
+    name = "gtts"
+    mime = "audio/mp3"
+
+    def synthesize(self, text, lang="en"):
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class ToneBackend:
+    """Offline stand-in: a short WAV beep per word, deterministic for a given text"""
+
+    name = "tone"
+    mime = "audio/wav"
+
+    def __init__(self, rate=8000, word_seconds=0.12):
+        self.rate = rate
+        self.word_seconds = word_seconds
+
+    def synthesize(self, text, lang="en"):
+        frames = bytearray()
+        for word in text.split():
+            pitch = 300 + int(hashlib.md5(word.encode()).hexdigest()[:4], 16) % 500
+            n = int(self.rate * self.word_seconds)
+            frames += b"".join(struct.pack("<h", int(8000 * math.sin(2 * math.pi * pitch * i / self.rate)))
+                               for i in range(n))
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.rate)
+            w.writeframes(bytes(frames))
+        return buffer.getvalue()
+
+
+TTS_BACKENDS = {"gtts": GTTSBackend, "tone": ToneBackend}
+
+
+# ==========================================
+# Phrase cache
+# ------------------------------------------
+class AudioCache:
+    """In-memory LRU of synthesized audio, keyed on a hash of (engine, lang, text), bounded in bytes"""
+
+    def __init__(self, max_bytes=64 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(engine, lang, text):
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{engine}\0{lang}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            audio = self._items.get(key)
+            if audio is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return audio
+
+    def put(self, key, audio):
+        if len(audio) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.size -= len(self._items.pop(key))
+            self._items[key] = audio
+            self.size += len(audio)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __len__(self):
+        return len(self._items)
+
+
+# ==========================================
+# Speaker
+# ------------------------------------------
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text, min_chars=20):
+    """Sentences of `text`; fragments shorter than min_chars are joined to the next one"""
+    sentences, pending = [], ""
+    for part in _SENTENCE_END.split(text.strip()):
+        pending = f"{pending} {part}".strip() if pending else part.strip()
+        if len(pending) >= min_chars:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        if sentences and len(pending) < min_chars:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+
+class Speaker:
+    """Sentence-by-sentence synthesis through a shared phrase cache"""
+
+    def __init__(self, backend=None, cache=None, lang="en"):
+        self.backend = backend or GTTSBackend()
+        self.cache = cache if cache is not None else AudioCache()
+        self.lang = lang
+
+    def synthesize(self, text, lang=None):
+        """Audio bytes for one phrase, from the cache when it has been spoken before"""
+        lang = lang or self.lang
+        key = AudioCache.key(self.backend.name, lang, text)
+        audio = self.cache.get(key)
+        if audio is None:
+            audio = self.backend.synthesize(text, lang)
+            self.cache.put(key, audio)
+        return audio
+
+    def stream(self, text, lang=None):
+        """Yield (sentence, audio bytes) in order, each as soon as it is ready"""
+        for sentence in split_sentences(text):
+            yield sentence, self.synthesize(sentence, lang)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Synthesize text sentence by sentence")
+    parser.add_argument("text")
+    parser.add_argument("--backend", choices=sorted(TTS_BACKENDS), default="tone")
+    parser.add_argument("--lang", default="en")
+    args = parser.parse_args()
+
+    speaker = Speaker(TTS_BACKENDS[args.backend](), lang=args.lang)
+    for attempt in ("cold", "cached"):
+        start = time.perf_counter()
+        for i, (sentence, audio) in enumerate(speaker.stream(args.text)):
+            if i == 0:
+                first = time.perf_counter() - start
+            print(f"  {len(audio):>8,} bytes  {sentence}")
+        print(f"{attempt}: first audio after {first * 1000:.1f} ms, all after {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"cache: {len(speaker.cache)} phrases, {speaker.cache.size:,} bytes, {speaker.cache.hits} hits")
@@ -1,10 +1,15 @@
 import streamlit as st
 import speech_recognition as sr
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-import torch
-from gtts import gTTS
 import os
-import tempfile
+import sys
+
+from tts import TTS_BACKENDS, Speaker
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.metrics import debug_panel, instrument_app, timed, timed_stream
+from src.startup import preload, preload_status
+
+instrument_app("voice")
 
 # Set page config
 st.set_page_config(page_title="Voice AI Assistant", page_icon="🎙️")
@@ -12,27 +17,39 @@ st.set_page_config(page_title="Voice AI Assistant", page_icon="🎙️")
 st.title("🎙️ Voice AI Assistant")
 st.markdown("Interact with a lightweight AI using your voice or text.")
 
-# Load Model
-@st.cache_resource
+# Load Model (shared flan-t5 backend; FLAN_T5_MODE=eager|int8|onnx)
 def load_brain():
-    model_name = "google/flan-t5-small"
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
-    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-    return tokenizer, model
+    # Imported here so torch and transformers load in the background, not before the first paint
+    from src.inference import GenerationService, get_backend
+
+    # One micro-batching queue shared by every session, so concurrent users share generate calls
+    return GenerationService(get_backend())
+
+brain = preload("flan-t5-service", load_brain)
 
-tokenizer, model = load_brain()
+with st.sidebar.expander("Model stats"):
+    if brain.done() and brain.exception() is None:
+        st.json(brain.result().backend.report())
+    else:
+        st.json(preload_status())
 
 def think(user_input):
+    """Yield the response a few tokens at a time as it is generated"""
     prompt = f"Answer clearly and concisely:\n{user_input}"
-    inputs = tokenizer(prompt, return_tensors="pt")
-    outputs = model.generate(**inputs, max_new_tokens=100, do_sample=False)
-    return tokenizer.decode(outputs[0], skip_special_tokens=True)
+    return timed_stream("voice.think", brain.result().stream_sync(prompt, max_new_tokens=100))
 
+# Text-to-speech with an in-memory phrase cache (VOICE_TTS_BACKEND=gtts|tone)
+@st.cache_resource
+def get_speaker():
+    return Speaker(TTS_BACKENDS[os.environ.get("VOICE_TTS_BACKEND", "gtts")]())
+
+speaker = get_speaker()
+
+@timed("voice.speak")
 def speak(text):
-    tts = gTTS(text=text, lang="en")
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as fp:
-        tts.save(fp.name)
-        return fp.name
+    """Audio bytes for each sentence of text, in order, as soon as each is ready"""
+    for _, audio in speaker.stream(text):
+        yield audio
 
 # Mode Selection
 mode = st.radio("Choose Input Method:", ["Text", "Voice"])
@@ -53,12 +70,12 @@ else:
                 st.error("Could not understand audio or microphone error.")
 
 if user_text:
+    st.subheader("AI Response:")
     with st.spinner("AI is thinking..."):
-        response = think(user_text)
-        st.subheader("AI Response:")
-        st.write(response)
-        
-        audio_path = speak(response)
-        st.audio(audio_path)
-        # Clean up temp file
-        # os.remove(audio_path) # Streamlit might need it to serve
+        pieces = think(user_text)  # waits here only if the model is still loading
+    response = st.write_stream(pieces)
+
+    for audio in speak(response):
+        st.audio(audio, format=speaker.backend.mime)
+
+debug_panel()
@@ -0,0 +1,124 @@
+"""Time every Walmart business query against synthetic data scaled far beyond the 1,000-row sample.
+
+    python benchmark.py --rows 10000000 --backend duckdb
+    python benchmark.py --rows 2000000 --backend sqlite --indexes
+    python benchmark.py --rows 10000000 --rollups
+
+Slow queries in the report are the candidates for indexes or materialized rollups.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from rollups import REPORTS, SalesRollups
+from walmart_db import CSV_PATH, QUERIES, WalmartDB
+
+# Columns used in GROUP BY / WHERE clauses of the business queries
+INDEX_COLUMNS = ["branch", "city", "customer_type", "gender", "product_line", "payment",
+                 "month_name", "day_name", "time_of_day"]
+
+
+def synthetic_sales(n_rows, seed=0, sample=None):
+    """n_rows of invoices shaped like the sample CSV (same categories, price/quantity/rating ranges)"""
+    sample = pd.read_csv(CSV_PATH) if sample is None else sample
+    rng = np.random.default_rng(seed)
+    branches = sample[["Branch", "City"]].drop_duplicates().to_numpy()
+    branch = branches[rng.integers(0, len(branches), n_rows)]
+
+    def pick(col):
+        values = sample[col].unique()
+        return pd.Categorical.from_codes(rng.integers(0, len(values), n_rows), values)
+
+    unit_price = rng.uniform(10, 100, n_rows).round(2)
+    quantity = rng.integers(1, 11, n_rows)
+    cogs = (unit_price * quantity).round(2)
+    vat = cogs * 0.05
+    minutes = rng.integers(10 * 60, 21 * 60, n_rows)
+    # Unique across chunks as long as each chunk's seed is its row offset
+    invoice = pd.Series(np.arange(n_rows) + seed).astype(str).str.zfill(9)
+    clock = pd.Series(minutes // 60 * 100 + minutes % 60).astype(str).str.zfill(4)
+
+    return pd.DataFrame({
+        "Invoice ID": invoice.str[:3] + "-" + invoice.str[3:5] + "-" + invoice.str[5:],
+        "Branch": branch[:, 0],
+        "City": branch[:, 1],
+        "Customer type": pick("Customer type"),
+        "Gender": pick("Gender"),
+        "Product line": pick("Product line"),
+        "Unit price": unit_price,
+        "Quantity": quantity,
+        "Tax 5%": vat,
+        "Total": cogs + vat,
+        "Date": (pd.Timestamp("2019-01-01") + pd.to_timedelta(rng.integers(0, 90, n_rows), unit="D")).strftime("%Y-%m-%d"),
+        "Time": clock.str[:2] + ":" + clock.str[2:] + ":00",
+        "Payment": pick("Payment"),
+        "cogs": cogs,
+        "gross margin percentage": 4.761904762,
+        "gross income": vat,
+        "Rating": rng.uniform(4, 10, n_rows).round(1),
+    })
+
+
+def run_benchmark(n_rows, backend="duckdb", repeats=3, chunk_rows=1_000_000, indexes=False, seed=0,
+                  rollups=False):
+    """Load n_rows of synthetic sales, then time each query (best of `repeats`)
+
+    With rollups=True the rows are appended batch by batch into SalesRollups and the
+    reports are answered from the rollup tables instead of scanning `sales`.
+    """
+    db = WalmartDB(backend)
+    store = SalesRollups(db, keep_raw=False) if rollups else None
+    sample = pd.read_csv(CSV_PATH)
+
+    load_seconds = 0.0
+    for offset in range(0, n_rows, chunk_rows):
+        chunk = synthetic_sales(min(chunk_rows, n_rows - offset), seed=seed + offset, sample=sample)
+        start = time.perf_counter()  # time the database load only, not the data generation
+        if store:
+            store.append(chunk)
+        else:
+            db.load_frame(chunk, finalize=False)
+        load_seconds += time.perf_counter() - start
+    if not store:
+        start = time.perf_counter()
+        db._finalize()
+        load_seconds += time.perf_counter() - start
+
+    if indexes and not store:
+        for col in INDEX_COLUMNS:
+            db.con.execute(f"CREATE INDEX IF NOT EXISTS idx_sales_{col} ON sales ({col})")
+
+    rows = []
+    run = store.report if store else db.query
+    for name in (REPORTS if store else QUERIES):
+        timings = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            run(name)
+            timings.append(time.perf_counter() - t0)
+        best = min(timings)
+        rows.append({"Query": name, "Best (s)": best, "Rows/sec": int(n_rows / best)})
+    db.close()
+
+    report = pd.DataFrame(rows).set_index("Query").sort_values("Best (s)", ascending=False)
+    return report, load_seconds
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the Walmart queries on synthetic data")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--backend", choices=["duckdb", "sqlite"], default="duckdb")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--indexes", action="store_true", help="index the GROUP BY / WHERE columns first")
+    parser.add_argument("--rollups", action="store_true", help="append into SalesRollups and query those")
+    args = parser.parse_args()
+
+    report, load_seconds = run_benchmark(args.rows, args.backend, args.repeats, indexes=args.indexes,
+                                         rollups=args.rollups)
+    print(f"Loaded {args.rows:,} rows into {args.backend} in {load_seconds:.1f}s "
+          f"({args.rows / load_seconds:,.0f} rows/sec)\n")
+    print(report.to_string(float_format="{:,.4f}".format))
+    print(f"\nTotal query time: {report['Best (s)'].sum():.2f}s")
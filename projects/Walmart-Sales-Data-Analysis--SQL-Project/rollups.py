@@ -0,0 +1,156 @@
+"""Incrementally maintained rollups of the Walmart sales metrics.
+
+New invoices are appended in batches: each batch is deduplicated against every invoice_id
+already seen (so re-sending a batch is a no-op), then folded into one aggregate row per group
+with an upsert. Wrapping a WalmartDB that already holds sales (e.g. after load_csv) first
+rebuilds the seen invoices and the rollups from those rows. Report queries read only those
+aggregate rows, never the raw sales, so their cost depends on the number of groups rather
+than the number of invoices.
+
+product_category (question 9) is not maintained: it compares each invoice with the average
+over the whole table, which moves with every batch and cannot be updated incrementally.
+"""
+import pandas as pd
+
+from walmart_db import WalmartDB
+
+# Rollup name -> grouping columns (up to two)
+GROUPINGS = {
+    "all": (),
+    "month": ("month_name",),
+    "product_line": ("product_line",),
+    "city": ("city",),
+    "branch": ("branch",),
+    "payment": ("payment",),
+    "customer_type": ("customer_type",),
+    "gender": ("gender",),
+    "time_of_day": ("time_of_day",),
+    "day_name": ("day_name",),
+    "branch_city": ("branch", "city"),
+    "gender_product_line": ("gender", "product_line"),
+    "branch_gender": ("branch", "gender"),
+    "branch_time_of_day": ("branch", "time_of_day"),
+    "branch_day_name": ("branch", "day_name"),
+    "day_name_time_of_day": ("day_name", "time_of_day"),
+}
+MEASURES = {"n": "COUNT(*)", "total": "SUM(total)", "cogs": "SUM(cogs)", "vat": "SUM(vat)",
+            "quantity": "SUM(quantity)", "rating": "SUM(rating)"}
+
+
+def _from(grouping):
+    return f"FROM rollups WHERE grouping = '{grouping}'"
+
+
+# Same names and result columns as walmart_db.QUERIES, answered from the rollups
+REPORTS = {
+    "distinct_cities": f"SELECT k1 AS city {_from('city')}",
+    "branch_city": f"SELECT k1 AS branch, k2 AS city {_from('branch_city')}",
+    "distinct_product_lines": f"SELECT COUNT(*) AS product_lines {_from('product_line')}",
+    "common_payment_method": f"SELECT k1 AS payment, n AS common_payment_method {_from('payment')} ORDER BY n DESC LIMIT 1",
+    "most_selling_product_line": f"SELECT k1 AS product_line, n AS most_selling_product {_from('product_line')} ORDER BY n DESC LIMIT 1",
+    "revenue_by_month": f"SELECT k1 AS month_name, total AS total_revenue {_from('month')} ORDER BY total DESC",
+    "cogs_by_month": f"SELECT k1 AS month_name, cogs AS total_cogs {_from('month')} ORDER BY cogs DESC",
+    "top_revenue_product_line": f"SELECT k1 AS product_line, total AS total_revenue {_from('product_line')} ORDER BY total DESC LIMIT 1",
+    "top_revenue_city": f"SELECT k1 AS city, total AS total_revenue {_from('city')} ORDER BY total DESC LIMIT 1",
+    "top_vat_product_line": f"SELECT k1 AS product_line, vat AS VAT {_from('product_line')} ORDER BY vat DESC LIMIT 1",
+    "branch_above_avg_quantity": f"""SELECT k1 AS branch, quantity {_from('branch')}
+        AND quantity > quantity * 1.0 / n ORDER BY quantity DESC LIMIT 1""",
+    "product_line_by_gender": f"SELECT k1 AS gender, k2 AS product_line, n AS total_count {_from('gender_product_line')} ORDER BY n DESC",
+    "avg_rating_by_product_line": f"SELECT k1 AS product_line, ROUND(rating / n, 2) AS average_rating {_from('product_line')} ORDER BY average_rating DESC",
+    "weekday_sales_by_time_of_day": f"""SELECT k1 AS day_name, k2 AS time_of_day, n AS total_sales {_from('day_name_time_of_day')}
+        AND k1 NOT IN ('Saturday', 'Sunday')""",
+    "top_revenue_customer_type": f"SELECT k1 AS customer_type, total AS total_sales {_from('customer_type')} ORDER BY total DESC LIMIT 1",
+    "top_vat_city": f"SELECT k1 AS city, vat AS total_VAT {_from('city')} ORDER BY vat DESC LIMIT 1",
+    "top_vat_customer_type": f"SELECT k1 AS customer_type, vat AS total_VAT {_from('customer_type')} ORDER BY vat DESC LIMIT 1",
+    "distinct_customer_types": f"SELECT COUNT(*) AS customer_types {_from('customer_type')}",
+    "distinct_payment_methods": f"SELECT COUNT(*) AS payment_methods {_from('payment')}",
+    "common_customer_type": f"SELECT k1 AS customer_type, n AS common_customer {_from('customer_type')} ORDER BY n DESC LIMIT 1",
+    "top_buying_customer_type": f"SELECT k1 AS customer_type, n AS most_buyer {_from('customer_type')} ORDER BY n DESC LIMIT 1",
+    "common_gender": f"SELECT k1 AS gender, n AS all_genders {_from('gender')} ORDER BY n DESC LIMIT 1",
+    "gender_by_branch": f"SELECT k1 AS branch, k2 AS gender, n AS gender_distribution {_from('branch_gender')} ORDER BY k1, k2",
+    "best_rated_time_of_day": f"SELECT k1 AS time_of_day, rating / n AS average_rating {_from('time_of_day')} ORDER BY average_rating DESC LIMIT 1",
+    "rating_by_branch_time_of_day": f"SELECT k1 AS branch, k2 AS time_of_day, rating / n AS average_rating {_from('branch_time_of_day')} ORDER BY average_rating DESC",
+    "best_rated_day": f"SELECT k1 AS day_name, rating / n AS average_rating {_from('day_name')} ORDER BY average_rating DESC LIMIT 1",
+    "rating_by_branch_day": f"SELECT k1 AS branch, k2 AS day_name, rating / n AS average_rating {_from('branch_day_name')} ORDER BY average_rating DESC",
+    "avg_rating_by_branch": f"SELECT k1 AS branch, rating / n AS avg_rating {_from('branch')} ORDER BY avg_rating DESC",
+}
+
+
+class SalesRollups:
+    """Rollup tables kept next to (not instead of) the raw `sales` table of a WalmartDB"""
+
+    def __init__(self, db=None, keep_raw=True):
+        self.db = db or WalmartDB()
+        self.keep_raw = keep_raw
+        self.con = self.db.con
+        self.con.execute("CREATE TABLE IF NOT EXISTS seen_invoices (invoice_id VARCHAR(30) PRIMARY KEY)")
+        self.con.execute("""CREATE TABLE IF NOT EXISTS rollups (
+            grouping VARCHAR(30) NOT NULL, k1 VARCHAR(100) NOT NULL, k2 VARCHAR(100) NOT NULL,
+            n BIGINT, total DOUBLE, cogs DOUBLE, vat DOUBLE, quantity BIGINT, rating DOUBLE,
+            PRIMARY KEY (grouping, k1, k2))""")
+        empty = self.con.execute("SELECT COUNT(*) FROM seen_invoices").fetchone()[0] == 0
+        if self.db._loaded and empty:
+            self._rebuild()
+
+    def _rebuild(self):
+        """Seed the invoice ids and rollups from the db's existing sales (first row per invoice)"""
+        self.con.execute("""CREATE TEMP TABLE fresh AS SELECT * FROM (
+    SELECT *, ROW_NUMBER() OVER (PARTITION BY invoice_id ORDER BY rowid) AS batch_rank FROM sales) AS s
+WHERE batch_rank = 1""")
+        self._fold()
+        self.con.execute("DROP TABLE fresh")
+        if self.db.backend == "sqlite":
+            self.con.commit()
+
+    def _fold(self):
+        self.con.execute("INSERT INTO seen_invoices SELECT invoice_id FROM fresh")
+        for grouping, keys in GROUPINGS.items():
+            self._upsert(grouping, keys)
+
+    def append(self, df):
+        """Fold a batch of invoices (CSV headers) into the rollups; returns how many were new"""
+        db = self.db
+        # The batch position orders repeats inside the batch, so the first one reliably wins
+        db._stage(df.assign(batch_pos=range(len(df))))
+
+        # Drop invoices already seen, and repeats inside the batch itself
+        self.con.execute("DROP TABLE IF EXISTS fresh")
+        self.con.execute(f"""CREATE TEMP TABLE fresh AS SELECT
+    {db._select_list()}
+FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY "Invoice ID" ORDER BY batch_pos) AS batch_rank FROM incoming) AS batch
+WHERE batch_rank = 1 AND "Invoice ID" NOT IN (SELECT invoice_id FROM seen_invoices)""")
+        db._unstage()
+
+        new = self.con.execute("SELECT COUNT(*) FROM fresh").fetchone()[0]
+        if new:
+            self._fold()
+            if self.keep_raw:
+                columns = ", ".join(db._column_names())
+                if db._loaded:
+                    self.con.execute(f"INSERT INTO sales ({columns}) SELECT {columns} FROM fresh")
+                else:
+                    self.con.execute(f"CREATE TABLE sales AS SELECT {columns}, "
+                                     "CAST(NULL AS VARCHAR(20)) AS product_category FROM fresh")
+                db._loaded = True
+        self.con.execute("DROP TABLE fresh")
+        if db.backend == "sqlite":
+            self.con.commit()
+        return new
+
+    def _upsert(self, grouping, keys):
+        k1 = f"CAST({keys[0]} AS VARCHAR)" if keys else "''"
+        k2 = f"CAST({keys[1]} AS VARCHAR)" if len(keys) > 1 else "''"
+        group_by = f"GROUP BY {', '.join(keys)}" if keys else ""
+        measures = ", ".join(MEASURES.values())
+        updates = ", ".join(f"{m} = {m} + excluded.{m}" for m in MEASURES)
+        # "WHERE true" disambiguates INSERT ... SELECT ... ON CONFLICT for SQLite's parser
+        self.con.execute(f"""INSERT INTO rollups (grouping, k1, k2, {', '.join(MEASURES)})
+            SELECT '{grouping}', {k1}, {k2}, {measures} FROM fresh WHERE true {group_by}
+            ON CONFLICT (grouping, k1, k2) DO UPDATE SET {updates}""")
+
+    def report(self, name):
+        """One of the business questions, answered from the rollups"""
+        return self.db.query_sql(REPORTS[name])
+
+    def run_all(self):
+        return {name: self.report(name) for name in REPORTS}
@@ -0,0 +1,237 @@
+"""Embedded (DuckDB or SQLite) port of `Walmart SQL Queries.sql`.
+
+The CSV is bulk-loaded in one columnar statement (DuckDB's read_csv, or a single executemany
+inside one transaction in SQLite), the feature-engineering columns are derived in the same pass,
+and every business question from the SQL file is available by name as a pandas DataFrame.
+"""
+import os
+import sqlite3
+
+import pandas as pd
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Walmart Sales Data.csv.csv")
+
+# CSV header -> column name used by the SQL file
+COLUMNS = {
+    "Invoice ID": "invoice_id",
+    "Branch": "branch",
+    "City": "city",
+    "Customer type": "customer_type",
+    "Gender": "gender",
+    "Product line": "product_line",
+    "Unit price": "unit_price",
+    "Quantity": "quantity",
+    "Tax 5%": "vat",
+    "Total": "total",
+    "Date": "date",
+    "Time": "time",
+    "Payment": "payment",
+    "cogs": "cogs",
+    "gross margin percentage": "gross_margin_pct",
+    "gross income": "gross_income",
+    "Rating": "rating",
+}
+
+# Feature Engineering (same rules as the MySQL UPDATE statements)
+TIME_OF_DAY = """CASE
+        WHEN "Time" BETWEEN '00:00:00' AND '12:00:00' THEN 'Morning'
+        WHEN "Time" BETWEEN '12:01:00' AND '16:00:00' THEN 'Afternoon'
+        ELSE 'Evening'
+    END"""
+DAY_NAME = {
+    "duckdb": 'dayname(CAST("Date" AS DATE))',
+    "sqlite": """CASE CAST(strftime('%w', "Date") AS INTEGER)
+        WHEN 0 THEN 'Sunday' WHEN 1 THEN 'Monday' WHEN 2 THEN 'Tuesday' WHEN 3 THEN 'Wednesday'
+        WHEN 4 THEN 'Thursday' WHEN 5 THEN 'Friday' ELSE 'Saturday' END""",
+}
+MONTH_NAME = {
+    "duckdb": 'monthname(CAST("Date" AS DATE))',
+    "sqlite": """CASE CAST(strftime('%m', "Date") AS INTEGER)
+        WHEN 1 THEN 'January' WHEN 2 THEN 'February' WHEN 3 THEN 'March' WHEN 4 THEN 'April'
+        WHEN 5 THEN 'May' WHEN 6 THEN 'June' WHEN 7 THEN 'July' WHEN 8 THEN 'August'
+        WHEN 9 THEN 'September' WHEN 10 THEN 'October' WHEN 11 THEN 'November' ELSE 'December' END""",
+}
+
+QUERIES = {
+    # Generic Questions
+    "distinct_cities": "SELECT DISTINCT city FROM sales",
+    "branch_city": "SELECT DISTINCT branch, city FROM sales",
+    # Product Analysis
+    "distinct_product_lines": "SELECT COUNT(DISTINCT product_line) AS product_lines FROM sales",
+    "common_payment_method": """SELECT payment, COUNT(payment) AS common_payment_method
+        FROM sales GROUP BY payment ORDER BY common_payment_method DESC LIMIT 1""",
+    "most_selling_product_line": """SELECT product_line, COUNT(product_line) AS most_selling_product
+        FROM sales GROUP BY product_line ORDER BY most_selling_product DESC LIMIT 1""",
+    "revenue_by_month": """SELECT month_name, SUM(total) AS total_revenue
+        FROM sales GROUP BY month_name ORDER BY total_revenue DESC""",
+    "cogs_by_month": """SELECT month_name, SUM(cogs) AS total_cogs
+        FROM sales GROUP BY month_name ORDER BY total_cogs DESC""",
+    "top_revenue_product_line": """SELECT product_line, SUM(total) AS total_revenue
+        FROM sales GROUP BY product_line ORDER BY total_revenue DESC LIMIT 1""",
+    "top_revenue_city": """SELECT city, SUM(total) AS total_revenue
+        FROM sales GROUP BY city ORDER BY total_revenue DESC LIMIT 1""",
+    "top_vat_product_line": """SELECT product_line, SUM(vat) AS VAT
+        FROM sales GROUP BY product_line ORDER BY VAT DESC LIMIT 1""",
+    "product_category": """SELECT product_line, product_category, COUNT(*) AS sales
+        FROM sales GROUP BY product_line, product_category ORDER BY product_line, product_category""",
+    "branch_above_avg_quantity": """SELECT branch, SUM(quantity) AS quantity
+        FROM sales GROUP BY branch HAVING SUM(quantity) > AVG(quantity) ORDER BY quantity DESC LIMIT 1""",
+    "product_line_by_gender": """SELECT gender, product_line, COUNT(gender) AS total_count
+        FROM sales GROUP BY gender, product_line ORDER BY total_count DESC""",
+    "avg_rating_by_product_line": """SELECT product_line, ROUND(AVG(rating), 2) AS average_rating
+        FROM sales GROUP BY product_line ORDER BY average_rating DESC""",
+    # Sales Analysis
+    "weekday_sales_by_time_of_day": """SELECT day_name, time_of_day, COUNT(*) AS total_sales
+        FROM sales WHERE day_name NOT IN ('Saturday', 'Sunday') GROUP BY day_name, time_of_day""",
+    "top_revenue_customer_type": """SELECT customer_type, SUM(total) AS total_sales
+        FROM sales GROUP BY customer_type ORDER BY total_sales DESC LIMIT 1""",
+    "top_vat_city": """SELECT city, SUM(vat) AS total_VAT
+        FROM sales GROUP BY city ORDER BY total_VAT DESC LIMIT 1""",
+    "top_vat_customer_type": """SELECT customer_type, SUM(vat) AS total_VAT
+        FROM sales GROUP BY customer_type ORDER BY total_VAT DESC LIMIT 1""",
+    # Customer Analysis
+    "distinct_customer_types": "SELECT COUNT(DISTINCT customer_type) AS customer_types FROM sales",
+    "distinct_payment_methods": "SELECT COUNT(DISTINCT payment) AS payment_methods FROM sales",
+    "common_customer_type": """SELECT customer_type, COUNT(customer_type) AS common_customer
+        FROM sales GROUP BY customer_type ORDER BY common_customer DESC LIMIT 1""",
+    "top_buying_customer_type": """SELECT customer_type, COUNT(*) AS most_buyer
+        FROM sales GROUP BY customer_type ORDER BY most_buyer DESC LIMIT 1""",
+    "common_gender": """SELECT gender, COUNT(*) AS all_genders
+        FROM sales GROUP BY gender ORDER BY all_genders DESC LIMIT 1""",
+    "gender_by_branch": """SELECT branch, gender, COUNT(gender) AS gender_distribution
+        FROM sales GROUP BY branch, gender ORDER BY branch, gender""",
+    "best_rated_time_of_day": """SELECT time_of_day, AVG(rating) AS average_rating
+        FROM sales GROUP BY time_of_day ORDER BY average_rating DESC LIMIT 1""",
+    "rating_by_branch_time_of_day": """SELECT branch, time_of_day, AVG(rating) AS average_rating
+        FROM sales GROUP BY branch, time_of_day ORDER BY average_rating DESC""",
+    "best_rated_day": """SELECT day_name, AVG(rating) AS average_rating
+        FROM sales GROUP BY day_name ORDER BY average_rating DESC LIMIT 1""",
+    "rating_by_branch_day": """SELECT branch, day_name, AVG(rating) AS average_rating
+        FROM sales GROUP BY day_name, branch ORDER BY average_rating DESC""",
+    "avg_rating_by_branch": """SELECT branch, AVG(rating) AS avg_rating
+        FROM sales GROUP BY branch ORDER BY avg_rating DESC""",
+}
+
+
+class WalmartDB:
+    """The `sales` table in an embedded database, loaded in bulk and queried by name"""
+
+    def __init__(self, backend="duckdb", database=":memory:"):
+        if backend not in DAY_NAME:
+            raise ValueError(f"unknown backend '{backend}' (use 'duckdb' or 'sqlite')")
+        self.backend = backend
+        if backend == "duckdb":
+            import duckdb
+            self.con = duckdb.connect(database)
+        else:
+            self.con = sqlite3.connect(database)
+            # Bulk loads: WAL with NORMAL sync fsyncs at checkpoints rather than every commit,
+            # and staging tables stay in memory
+            self.con.execute("PRAGMA journal_mode = WAL")
+            self.con.execute("PRAGMA synchronous = NORMAL")
+            self.con.execute("PRAGMA temp_store = MEMORY")
+        self._loaded = False
+
+    @staticmethod
+    def _column_names():
+        """Columns produced by _select_list, in order (sales may also hold product_category)"""
+        return list(COLUMNS.values()) + ["time_of_day", "day_name", "month_name"]
+
+    def _select_list(self):
+        cols = [f'"{src}" AS {dst}' for src, dst in COLUMNS.items()]
+        if self.backend == "duckdb":
+            cols[list(COLUMNS).index("Date")] = 'CAST("Date" AS DATE) AS date'
+            cols[list(COLUMNS).index("Time")] = 'CAST("Time" AS TIME) AS time'
+        cols += [f"{TIME_OF_DAY} AS time_of_day",
+                 f"{DAY_NAME[self.backend]} AS day_name",
+                 f"{MONTH_NAME[self.backend]} AS month_name"]
+        return ",\n    ".join(cols)
+
+    def _stage(self, df):
+        """Expose a DataFrame with the CSV's headers as the relation `incoming`"""
+        if self.backend == "duckdb":
+            self.con.register("incoming", df)  # zero-copy scan of the frame
+            return
+        # Untyped columns keep each value as bound; one executemany fills the table in C
+        columns = ", ".join(f'"{c}"' for c in df.columns)
+        self.con.execute("DROP TABLE IF EXISTS temp.incoming")
+        self.con.execute(f"CREATE TEMP TABLE incoming ({columns})")
+        placeholders = ", ".join("?" * len(df.columns))
+        self.con.executemany(f"INSERT INTO incoming VALUES ({placeholders})",
+                             df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+
+    def _unstage(self):
+        if self.backend == "duckdb":
+            self.con.unregister("incoming")
+        else:
+            self.con.execute("DROP TABLE temp.incoming")
+
+    def _append(self, source):
+        """Insert-select from a staged relation, deriving the engineered columns in the same pass"""
+        # Name the columns on insert: once finalized, sales also has product_category
+        verb = (f"INSERT INTO sales ({', '.join(self._column_names())}) SELECT" if self._loaded
+                else "CREATE TABLE sales AS SELECT")
+        self.con.execute(f"{verb}\n    {self._select_list()}\nFROM {source}")
+        self._loaded = True
+
+    def load_csv(self, path=CSV_PATH):
+        """Bulk-load the Walmart CSV (columnar read_csv in DuckDB, one executemany in SQLite)"""
+        if self.backend == "duckdb":
+            escaped = path.replace("'", "''")
+            self._append(f"read_csv('{escaped}', header = true)")
+        else:
+            self.load_frame(pd.read_csv(path))
+            return self
+        self._finalize()
+        return self
+
+    def load_frame(self, df, finalize=True):
+        """Bulk-append a DataFrame with the CSV's column headers (e.g. synthetic benchmark data)"""
+        # Staging and the insert-select share one transaction (sqlite3 opens it at the first INSERT)
+        self._stage(df)
+        self._append("incoming")
+        self._unstage()
+        if self.backend == "sqlite":
+            self.con.commit()
+        if finalize:
+            self._finalize()
+        return self
+
+    def _finalize(self):
+        """Question 9's product_category column, which needs the average over the whole table"""
+        columns = self.query_sql("SELECT * FROM sales LIMIT 0").columns
+        if "product_category" not in columns:
+            self.con.execute("ALTER TABLE sales ADD COLUMN product_category VARCHAR(20)")
+        self.con.execute("""UPDATE sales SET product_category =
+            CASE WHEN total >= (SELECT AVG(total) FROM sales) THEN 'Good' ELSE 'Bad' END""")
+        if self.backend == "sqlite":
+            self.con.commit()
+
+    def query_sql(self, sql):
+        if self.backend == "duckdb":
+            return self.con.execute(sql).df()
+        return pd.read_sql_query(sql, self.con)
+
+    def query(self, name):
+        """Run one of the named business questions"""
+        return self.query_sql(QUERIES[name])
+
+    def run_all(self):
+        return {name: self.query(name) for name in QUERIES}
+
+    def close(self):
+        self.con.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the Walmart sales analysis on an embedded database")
+    parser.add_argument("--backend", choices=sorted(DAY_NAME), default="duckdb")
+    parser.add_argument("--csv", default=CSV_PATH)
+    args = parser.parse_args()
+
+    db = WalmartDB(args.backend).load_csv(args.csv)
+    for name, result in db.run_all().items():
+        print(f"\n-- {name}")
+        print(result.to_string(index=False))
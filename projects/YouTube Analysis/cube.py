@@ -0,0 +1,141 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+METRICS = ["view_count", "like_count", "comment_count"]
+
+
+class ChannelIndex:
+    """Case-insensitive substring search over channel titles.
+
+    Works on the distinct titles (not the rows), narrows candidates with a trigram inverted
+    index, and reuses the previous result when the query only grows by a keystroke.
+    """
+
+    def __init__(self, titles):
+        self.titles = [str(t) for t in titles]
+        self.lower = [t.lower() for t in self.titles]
+        postings = defaultdict(list)
+        for i, title in enumerate(self.lower):
+            for gram in {title[j:j + 3] for j in range(len(title) - 2)}:
+                postings[gram].append(i)
+        self.postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._last = ("", np.arange(len(self.titles)))
+
+    def search(self, query):
+        """Ids of channels whose title contains `query` (ignoring case)"""
+        query = query.lower()
+        if not query:
+            return np.arange(len(self.titles))
+
+        last_query, last_ids = self._last
+        if last_query and last_query in query:
+            candidates = last_ids  # typing more characters can only shrink the result
+        elif len(query) >= 3:
+            grams = {query[j:j + 3] for j in range(len(query) - 2)}
+            lists = sorted((self.postings.get(g, np.empty(0, dtype=np.int32)) for g in grams), key=len)
+            candidates = lists[0]
+            for ids in lists[1:]:
+                candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        else:
+            candidates = np.arange(len(self.titles))
+
+        ids = np.array([i for i in candidates if query in self.lower[i]], dtype=np.int64)
+        self._last = (query, ids)
+        return ids
+
+
+class TrendingCube:
+    """Per-channel and per-category rollups of the trending data, built once at load time.
+
+    Every dashboard number for a channel filter (counts, totals, means, histograms, correlation,
+    top channels) is answered by combining the rollup rows of the matching channels, so a
+    keystroke costs O(matching channels) rather than a rescan of every video.
+    """
+
+    def __init__(self, df, bins=30):
+        self.df = df
+        channel = df["channel_title"].astype("category")
+        self.channels = channel.cat.categories
+        codes = channel.cat.codes.to_numpy()
+        n_channels = len(self.channels)
+        counts = df[METRICS].to_numpy(dtype=np.int64)
+        values = counts.astype(float)
+
+        self.count = np.bincount(codes, minlength=n_channels)
+        # Exact integer totals for the headline metrics: summed in int64, since bincount's float64
+        # weights lose units above 2**53
+        self.totals = np.zeros((n_channels, len(METRICS)), dtype=np.int64)
+        np.add.at(self.totals, codes, counts)
+        # Mergeable moments: per-channel means and co-moment matrices (Chan et al. parallel update)
+        self.means = self.totals / np.maximum(self.count, 1)[:, None]
+        centered = values - self.means[codes]
+        self.comoments = np.zeros((n_channels, len(METRICS), len(METRICS)))
+        np.add.at(self.comoments, codes, centered[:, :, None] * centered[:, None, :])
+
+        # Fixed global bin edges, so histograms of any channel subset are just summed counts
+        self.edges = {}
+        self.histograms = {}
+        for j, m in enumerate(METRICS):
+            edges = np.histogram_bin_edges(values[:, j], bins=bins)
+            bin_idx = np.clip(np.searchsorted(edges, values[:, j], side="right") - 1, 0, bins - 1)
+            hist = np.zeros((n_channels, bins), dtype=np.int64)
+            np.add.at(hist, (codes, bin_idx), 1)
+            self.edges[m], self.histograms[m] = edges, hist
+
+        # Row positions grouped by channel (ascending within each channel) for the data table
+        self.order = np.argsort(codes, kind="stable")
+        self.starts = np.concatenate([[0], np.cumsum(self.count)])
+
+        if "category_id" in df:
+            self.category_views = df.groupby("category_id", observed=True)[METRICS].sum()
+
+        self.index = ChannelIndex(self.channels)
+
+    def select(self, query=""):
+        """Channel ids matching a search (all channels when the query is empty)"""
+        return self.index.search(query.strip())
+
+    def summary(self, ids):
+        n = int(self.count[ids].sum())
+        totals = self.totals[ids].sum(axis=0)
+        return {
+            "videos": n,
+            **{f"total_{m}": int(t) for m, t in zip(METRICS, totals)},
+            **{f"avg_{m}": (t / n if n else float("nan")) for m, t in zip(METRICS, totals)},
+        }
+
+    def histogram(self, metric, ids):
+        return self.histograms[metric][ids].sum(axis=0), self.edges[metric]
+
+    def correlation(self, ids):
+        """Pearson correlation of the metrics over the selected channels, merged from rollups"""
+        counts = self.count[ids]
+        n = counts.sum()
+        if n < 2:
+            return pd.DataFrame(np.nan, index=METRICS, columns=METRICS)
+        mean = (self.means[ids] * counts[:, None]).sum(axis=0) / n
+        shift = self.means[ids] - mean
+        cov = self.comoments[ids].sum(axis=0) + np.einsum("c,ci,cj->ij", counts, shift, shift)
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        return pd.DataFrame(corr, index=METRICS, columns=METRICS)
+
+    def top_channels(self, ids, n=10, metric="view_count"):
+        col = METRICS.index(metric)
+        totals = pd.Series(self.totals[ids, col], index=self.channels[ids], name=metric)
+        return totals.nlargest(n)
+
+    def rows(self, ids, n=50):
+        """The first n videos (in file order) belonging to the selected channels"""
+        if len(ids) == len(self.channels):
+            return self.df.head(n)
+        # Each channel's own first n rows are enough; gather them without a Python loop
+        take = np.minimum(self.count[ids], n)
+        offsets = np.arange(take.sum()) - np.repeat(np.cumsum(take) - take, take)
+        positions = self.order[np.repeat(self.starts[ids], take) + offsets]
+        if len(positions) > n:
+            positions = np.partition(positions, n - 1)[:n]
+        return self.df.iloc[np.sort(positions)]
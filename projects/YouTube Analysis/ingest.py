@@ -0,0 +1,268 @@
+import heapq
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+
+METRICS = ["view_count", "like_count", "comment_count"]
+USECOLS = ["video_id", "channel_title"] + METRICS
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class RunningMoments:
+    """Mergeable count / sum / mean / (co)variance of several columns (Welford, Chan et al.)"""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = 0
+        self.sums = np.zeros(k, dtype=np.int64)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros((k, k))  # co-moment matrix: sum of (x - mean)(y - mean)
+
+    def update(self, values):
+        """Fold in a whole chunk (rows x columns) at once"""
+        values = np.asarray(values)
+        if not len(values):
+            return
+        other = RunningMoments(self.columns)
+        other.n = len(values)
+        other.sums = values.sum(axis=0, dtype=np.int64) if values.dtype.kind in "iu" else values.sum(axis=0)
+        other.mean = values.mean(axis=0, dtype=float)
+        centered = values - other.mean
+        other.m2 = centered.T @ centered
+        self.merge(other)
+
+    def merge(self, other):
+        n = self.n + other.n
+        if n == 0:
+            return self
+        delta = other.mean - self.mean
+        self.m2 = self.m2 + other.m2 + np.outer(delta, delta) * self.n * other.n / n
+        self.mean = self.mean + delta * other.n / n
+        self.sums = self.sums + other.sums
+        self.n = n
+        return self
+
+    def variance(self):
+        return np.diag(self.m2) / (self.n - 1) if self.n > 1 else np.full(len(self.columns), np.nan)
+
+    def correlation(self):
+        std = np.sqrt(np.diag(self.m2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = self.m2 / np.outer(std, std)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class SpaceSaving:
+    """Weighted heavy-hitters sketch: approximate top-k keys by total weight in O(capacity) memory.
+
+    Any key whose true total exceeds (total weight / capacity) is guaranteed to be tracked;
+    reported totals overestimate by at most the recorded error.
+    """
+
+    def __init__(self, capacity=1_000):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        # Min-heap with one (count, tiebreak, key) entry per tracked key. Increments do not touch
+        # it; an entry whose count is out of date is re-pushed when it reaches the top, so finding
+        # the smallest key costs O(log capacity) amortized rather than a scan of every key
+        self._heap = []
+        self._tiebreak = itertools.count()
+
+    def _push(self, key):
+        heapq.heappush(self._heap, (self.counts[key], next(self._tiebreak), key))
+
+    def _pop_min(self):
+        while True:
+            count, _, key = heapq.heappop(self._heap)
+            if self.counts[key] == count:
+                return key
+            self._push(key)  # counts only grow, so the stale entry was too low
+
+    def update(self, weights):
+        """Add a {key: weight} mapping (e.g. one chunk's per-channel totals)"""
+        for key, weight in sorted(weights.items(), key=lambda kv: -kv[1]):
+            if key in self.counts:
+                self.counts[key] += weight
+            elif len(self.counts) < self.capacity:
+                self.counts[key] = weight
+                self.errors[key] = 0
+                self._push(key)
+            else:
+                victim = self._pop_min()
+                floor = self.counts.pop(victim)
+                self.errors.pop(victim)
+                self.counts[key] = floor + weight
+                self.errors[key] = floor
+                self._push(key)
+
+    def _floor(self):
+        """Most an untracked key can have had: the smallest count once the sketch is full, else 0"""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def merge(self, other):
+        """Combine with a sketch of other data; merged counts keep the overestimate-by-error bound"""
+        floors = self._floor(), other._floor()
+        counts, errors = {}, {}
+        for key in self.counts.keys() | other.counts.keys():
+            # A key one side does not track may still have had up to that side's floor there
+            counts[key] = self.counts.get(key, floors[0]) + other.counts.get(key, floors[1])
+            errors[key] = self.errors.get(key, floors[0]) + other.errors.get(key, floors[1])
+        keep = heapq.nlargest(self.capacity, counts, key=counts.get)
+        self.counts = {key: counts[key] for key in keep}
+        self.errors = {key: errors[key] for key in keep}
+        self._heap = [(count, next(self._tiebreak), key) for key, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        return self
+
+    def top(self, n=10):
+        items = sorted(self.counts.items(), key=lambda kv: -kv[1])[:n]
+        return pd.Series(dict(items), name="view_count", dtype="int64")
+
+
+class SeenIds:
+    """Bloom filter over 64-bit id hashes: fixed memory, no false negatives.
+
+    Sized for `expected` ids at a `false_positive` rate (the chance that an id never added is
+    reported as seen); memory is -expected * ln(false_positive) / ln(2)^2 bits, e.g. 24 MB for
+    10M ids at 1e-4. Past `expected` ids the rate climbs: about 1e-2 at twice the size.
+    """
+
+    def __init__(self, expected=10_000_000, false_positive=1e-4):
+        self.expected = expected
+        self.false_positive = false_positive
+        self.bits = max(64, int(math.ceil(-expected * math.log(false_positive) / math.log(2) ** 2)))
+        self.hashes = max(1, round(self.bits / expected * math.log(2)))
+        self.array = np.zeros((self.bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes):
+        # Double hashing: the i-th probe is h1 + i * h2 (mod bits), h1 / h2 the two 32-bit halves
+        h1, h2 = hashes & 0xFFFFFFFF, (hashes >> np.uint64(32)) | np.uint64(1)
+        probes = np.arange(self.hashes, dtype=np.uint64)
+        return (h1[:, None] + probes * h2[:, None]) % np.uint64(self.bits)
+
+    def contains(self, hashes):
+        """Boolean mask: which hashes (uint64 array) may have been added"""
+        positions = self._positions(hashes)
+        hit = self.array[positions >> np.uint64(3)] & (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8))
+        return hit.all(axis=1)
+
+    def add(self, hashes):
+        positions = np.sort(self._positions(hashes).ravel())
+        if not len(positions):
+            return
+        # OR together the bits bound for the same byte first (much faster than np.bitwise_or.at)
+        index = positions >> np.uint64(3)
+        bits = np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)
+        starts = np.flatnonzero(np.r_[True, index[1:] != index[:-1]])
+        self.array[index[starts]] |= np.bitwise_or.reduceat(bits, starts)
+
+    def estimated_count(self):
+        """Number of distinct ids added, estimated from the share of bits set"""
+        set_bits = int(_POPCOUNT[self.array].sum(dtype=np.int64))
+        if set_bits >= self.bits:
+            return math.inf
+        return -self.bits / self.hashes * math.log1p(-set_bits / self.bits)
+
+    def copy(self):
+        twin = SeenIds.__new__(SeenIds)
+        twin.__dict__.update(self.__dict__, array=self.array.copy())
+        return twin
+
+    def merge(self, other):
+        if (self.bits, self.hashes) != (other.bits, other.hashes):
+            raise ValueError("can only merge filters built with the same expected size and rate")
+        self.array |= other.array
+        return self
+
+
+class TrendingStats:
+    """Out-of-core dashboard metrics for one or more trending extracts.
+
+    Repeated video ids are dropped exactly within a chunk and through a fixed-size Bloom filter
+    across chunks, so memory does not grow with the extract; a new id is wrongly dropped as a
+    repeat with probability `false_positive` while fewer than `expected_ids` have been read.
+    """
+
+    def __init__(self, capacity=1_000, expected_ids=10_000_000, false_positive=1e-4):
+        self.moments = RunningMoments(METRICS)
+        self.channels = SpaceSaving(capacity)
+        self.seen = SeenIds(expected_ids, false_positive)
+        self.rows_read = 0
+
+    def _dedup(self, chunk):
+        hashes = pd.util.hash_pandas_object(chunk["video_id"], index=False).to_numpy()
+        fresh = ~pd.Series(hashes).duplicated().to_numpy()
+        fresh[fresh] = ~self.seen.contains(hashes[fresh])
+        self.seen.add(hashes[fresh])
+        return chunk[fresh]
+
+    def update(self, chunk):
+        self.rows_read += len(chunk)
+        chunk = self._dedup(chunk)
+        values = chunk[METRICS].fillna(0).to_numpy(dtype=np.int64)
+        self.moments.update(values)
+        per_channel = chunk.groupby("channel_title", sort=False)["view_count"].sum()
+        self.channels.update(per_channel.astype("int64").to_dict())
+
+    def merge(self, other):
+        """Combine stats computed independently (e.g. one worker per extract)"""
+        counted = self.moments.n + other.moments.n
+        union = self.seen.copy().merge(other.seen)
+        # The filters cannot list their ids, so shared ones are detected from the size of the union
+        if counted - union.estimated_count() > max(0.5, 1e-3 * counted):
+            raise ValueError("extracts share video ids; ingest them through one TrendingStats to deduplicate")
+        self.moments.merge(other.moments)
+        self.channels.merge(other.channels)
+        self.seen = union
+        self.rows_read += other.rows_read
+        return self
+
+    def summary(self):
+        n = self.moments.n
+        return {
+            "videos": n,
+            **{f"total_{m}": int(t) for m, t in zip(METRICS, self.moments.sums)},
+            **{f"avg_{m}": (t / n if n else float("nan")) for m, t in zip(METRICS, self.moments.sums)},
+            **{f"std_{m}": float(np.sqrt(v)) for m, v in zip(METRICS, self.moments.variance())},
+        }
+
+    def correlation(self):
+        return self.moments.correlation()
+
+    def top_channels(self, n=10):
+        return self.channels.top(n)
+
+
+def ingest(paths, chunksize=100_000, capacity=1_000, expected_ids=10_000_000):
+    """Stream CSV extracts chunk by chunk, reading only the columns the metrics need.
+
+    Duplicate video_ids (within or across files) are counted once, keeping the first
+    occurrence, so pass the newest extract first to keep the latest counts.
+    """
+    stats = TrendingStats(capacity, expected_ids)
+    for path in [paths] if isinstance(paths, str) else paths:
+        reader = pd.read_csv(path, usecols=USECOLS, chunksize=chunksize,
+                             dtype={"video_id": "string", "channel_title": "string"})
+        for chunk in reader:
+            stats.update(chunk)
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Streaming metrics for trending_videos extracts")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    stats = ingest(args.paths, args.chunksize)
+    print(f"Read {stats.rows_read:,} rows, {stats.moments.n:,} unique videos")
+    for key, value in stats.summary().items():
+        print(f"  {key:>20}: {value:,.2f}")
+    print(stats.correlation().round(3).to_string())
+    print(stats.top_channels().to_string())
@@ -1,67 +1,115 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
 import os
+import sys
+import glob
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.data import load_dataset
+from src.metrics import debug_panel, instrument_app, timed
+from src.startup import lazy_import
+from cube import TrendingCube, METRICS
+from ingest import ingest
+
+# Only the correlation and distribution views need these, so they load on first use
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 # Set page config
 st.set_page_config(page_title="YouTube Trending Analysis", layout="wide")
+instrument_app("youtube")
 
 st.title("📊 YouTube Trending Video Analysis")
 
 # File Path
 CSV_PATH = "trending_videos.csv"
+# Bigger files (or several daily extracts) are streamed in chunks instead of loaded into memory
+LARGE_FILE_BYTES = 512 * 1024 ** 2
+EXTRACTS = sorted(glob.glob("trending_videos*.csv"), key=os.path.getmtime, reverse=True)  # newest first
+
+@st.cache_data(show_spinner="Streaming extracts...")
+def stream_metrics(paths, mtimes):
+    stats = ingest(list(paths))
+    return stats.summary(), stats.correlation(), stats.top_channels(10)
+
+@st.cache_resource
+def get_cube(csv_path, mtime, _df):
+    # Rollups are built once per data version and shared by every session
+    return TrendingCube(_df)
+
+def plot_histogram(ax, counts, edges, color):
+    """Bars from pre-binned counts plus a smoothed density line (in place of a per-row KDE)"""
+    ax.stairs(counts, edges, fill=True, alpha=0.4, color=color)
+    kernel = np.exp(-0.5 * np.linspace(-2, 2, 5) ** 2)
+    smooth = np.convolve(counts, kernel / kernel.sum(), mode="same")
+    ax.plot((edges[:-1] + edges[1:]) / 2, smooth, color=color)
 
 if not os.path.exists(CSV_PATH):
     st.error(f"Data file '{CSV_PATH}' not found. Please run the data collection script first.")
+elif len(EXTRACTS) > 1 or os.path.getsize(CSV_PATH) > LARGE_FILE_BYTES:
+    # Out-of-core mode: one chunked pass over every extract, duplicates counted once
+    stats, corr, top_channels = stream_metrics(tuple(EXTRACTS), tuple(os.path.getmtime(p) for p in EXTRACTS))
+    st.caption(f"Streaming mode: {len(EXTRACTS)} extract(s), {stats['videos']:,} unique videos. Search, data table and distributions need a single in-memory extract.")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Videos", stats['videos'])
+    col2.metric("Total Views", f"{stats['total_view_count']:,.0f}")
+    col3.metric("Total Likes", f"{stats['total_like_count']:,.0f}")
+    col4.metric("Avg Views", f"{stats['avg_view_count']:,.0f}")
+
+    st.subheader("Correlation Heatmap")
+    fig_corr, ax_corr = plt.subplots()
+    sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax_corr)
+    st.pyplot(fig_corr)
+
+    st.subheader("Top Channels by View Count (approximate)")
+    st.bar_chart(top_channels)
 else:
     # Load Data
-    df = pd.read_csv(CSV_PATH)
-    
-    # Preprocessing
-    df['description'].fillna('No description', inplace=True)
-    df['published_at'] = pd.to_datetime(df['published_at'])
+    # Typed + cached: only the columns the dashboard uses (no description/tags), dates parsed,
+    # channels and categories as categoricals, counts downcast to the smallest integer type
+    df = load_dataset("youtube", CSV_PATH)
     
     # Sidebar Filters
     st.sidebar.header("Filters")
     channel_search = st.sidebar.text_input("Search Channel")
-    if channel_search:
-        df = df[df['channel_title'].str.contains(channel_search, case=False)]
+    cube = get_cube(CSV_PATH, os.path.getmtime(CSV_PATH), df)
+    channels = cube.select(channel_search)
+    stats = cube.summary(channels)
 
     # Metrics
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Videos", len(df))
-    col2.metric("Total Views", f"{df['view_count'].sum():,.0f}")
-    col3.metric("Total Likes", f"{df['like_count'].sum():,.0f}")
-    col4.metric("Avg Views", f"{df['view_count'].mean():,.0f}")
+    col1.metric("Total Videos", stats['videos'])
+    col2.metric("Total Views", f"{stats['total_view_count']:,.0f}")
+    col3.metric("Total Likes", f"{stats['total_like_count']:,.0f}")
+    col4.metric("Avg Views", f"{stats['avg_view_count']:,.0f}")
 
     # Data Display
     st.subheader("Trending Videos Data")
-    st.dataframe(df[['title', 'channel_title', 'view_count', 'like_count', 'comment_count', 'published_at']].head(50), use_container_width=True)
+    st.dataframe(cube.rows(channels)[['title', 'channel_title', 'view_count', 'like_count', 'comment_count', 'published_at']], use_container_width=True)
 
     # Visualizations
     st.subheader("Engagement Distributions")
-    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
-    
-    sns.histplot(df['view_count'], bins=30, kde=True, ax=axes[0], color='blue')
-    axes[0].set_title('View Count Distribution')
-    
-    sns.histplot(df['like_count'], bins=30, kde=True, ax=axes[1], color='green')
-    axes[1].set_title('Like Count Distribution')
-    
-    sns.histplot(df['comment_count'], bins=30, kde=True, ax=axes[2], color='red')
-    axes[2].set_title('Comment Count Distribution')
+    with timed("youtube.histograms"):
+        fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+        
+        for ax, metric, color in zip(axes, METRICS, ['blue', 'green', 'red']):
+            plot_histogram(ax, *cube.histogram(metric, channels), color)
+            ax.set_title(f"{metric.replace('_', ' ').title()} Distribution")
     
     st.pyplot(fig)
 
     # Correlation
     st.subheader("Correlation Heatmap")
-    corr = df[['view_count', 'like_count', 'comment_count']].corr()
+    corr = cube.correlation(channels)
     fig_corr, ax_corr = plt.subplots()
     sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax_corr)
     st.pyplot(fig_corr)
 
     # Top Channels
     st.subheader("Top Channels by View Count")
-    top_channels = df.groupby('channel_title')['view_count'].sum().sort_values(ascending=False).head(10)
+    top_channels = cube.top_channels(channels, n=10)
     st.bar_chart(top_channels)
+
+debug_panel()
@@ -0,0 +1,3 @@
+from src.data.loaders import SCHEMAS, load_dataset, clear_cache
+
+__all__ = ["SCHEMAS", "load_dataset", "clear_cache"]
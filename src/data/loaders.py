@@ -0,0 +1,164 @@
+"""Typed, cached CSV loading shared by the Streamlit dashboards.
+
+Each dataset has an explicit schema (dtypes, categories, dates, fills). The first load parses
+the CSV once and writes a Feather (Arrow IPC) copy next to it under .cache/; later loads
+memory-map that file instead of re-parsing. Parsed frames are also kept in memory and are
+invalidated whenever the CSV's modification time changes.
+
+Frames returned by load_dataset are shared between callers: treat them as read-only and
+copy before mutating.
+"""
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from src.metrics import timed
+
+PROJECTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "projects")
+
+SCHEMAS = {
+    "nifty50": {
+        "path": os.path.join(PROJECTS_DIR, "Mutual Fund", "nifty50_closing_prices.csv"),
+        "dates": ["Date"],
+        "default_dtype": "float64",  # prices feed returns/covariance maths; keep full precision
+        "ffill": True,
+    },
+    "real_estate": {
+        "path": os.path.join(PROJECTS_DIR, "Real Estate", "Real_Estate.csv"),
+        "dates": ["Transaction date"],
+        "dtypes": {
+            "House age": "float32",
+            "Distance to the nearest MRT station": "float32",
+            "Number of convenience stores": "int8",
+            "Latitude": "float64",
+            "Longitude": "float64",
+            "House price of unit area": "float32",
+        },
+    },
+    "youtube": {
+        "path": os.path.join(PROJECTS_DIR, "YouTube Analysis", "trending_videos.csv"),
+        # The dashboard never shows description/tags, which are most of the file's bytes
+        "columns": ["video_id", "title", "published_at", "channel_id", "channel_title", "category_id",
+                    "view_count", "like_count", "comment_count"],
+        "dates": ["published_at"],
+        "dtypes": {
+            "video_id": "string",
+            "title": "string",
+            "channel_id": "category",
+            "channel_title": "category",
+            "category_id": "category",
+            "view_count": "int64",
+            "like_count": "int64",
+            "comment_count": "int64",
+        },
+        "downcast": ["view_count", "like_count", "comment_count"],
+    },
+    "walmart": {
+        "path": os.path.join(PROJECTS_DIR, "Walmart-Sales-Data-Analysis--SQL-Project", "Walmart Sales Data.csv.csv"),
+        "dates": ["Date"],
+        "dtypes": {
+            "Invoice ID": "string",
+            "Branch": "category",
+            "City": "category",
+            "Customer type": "category",
+            "Gender": "category",
+            "Product line": "category",
+            "Unit price": "float32",
+            "Quantity": "int16",
+            "Tax 5%": "float32",
+            "Total": "float64",
+            "Time": "string",
+            "Payment": "category",
+            "cogs": "float64",
+            "gross margin percentage": "float32",
+            "gross income": "float32",
+            "Rating": "float32",
+        },
+    },
+}
+
+_memory = {}
+_lock = threading.Lock()
+
+
+def _parse_csv(path, schema):
+    dtypes = dict(schema.get("dtypes", {}))
+    # Categories are assigned after the fill step so fill values need not be declared categories
+    read_dtypes = {col: ("object" if dt in ("category", "bool") else dt) for col, dt in dtypes.items()}
+    if "default_dtype" in schema:
+        header = pd.read_csv(path, nrows=0).columns
+        for col in header:
+            if col not in schema.get("dates", []):
+                read_dtypes.setdefault(col, schema["default_dtype"])
+
+    df = pd.read_csv(path, dtype=read_dtypes, usecols=schema.get("columns"))
+    for col in schema.get("dates", []):
+        if col in df:
+            df[col] = pd.to_datetime(df[col])
+    if schema.get("fill"):
+        df = df.fillna({col: value for col, value in schema["fill"].items() if col in df})
+    if schema.get("ffill"):
+        df = df.ffill()
+    for col, dt in dtypes.items():
+        if col in df and dt in ("category", "bool"):
+            df[col] = df[col].astype(dt)
+    for col in schema.get("downcast", []):
+        if col in df:
+            df[col] = pd.to_numeric(df[col], downcast="unsigned" if (df[col] >= 0).all() else "integer")
+    return df
+
+
+def _columnar_path(path, name, schema):
+    # The schema fingerprint is part of the name so schema edits never serve a stale copy
+    digest = hashlib.md5(repr(sorted(schema.items())).encode()).hexdigest()[:8]
+    return os.path.join(os.path.dirname(os.path.abspath(path)), ".cache", f"{name}-{digest}.feather")
+
+
+def _load_columnar(path, name, schema, mtime):
+    """Read the Feather copy if it is at least as new as the CSV, else (re)build it"""
+    cache_path = _columnar_path(path, name, schema)
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return _parse_csv(path, schema)
+
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= mtime:
+        try:
+            return feather.read_table(cache_path, memory_map=True).to_pandas()
+        except Exception:
+            pass  # corrupt or from an incompatible pyarrow: rebuild below
+
+    df = _parse_csv(path, schema)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        feather.write_feather(df.reset_index(drop=True), tmp)
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass  # read-only checkout: still serve the parsed frame
+    return df
+
+
+@timed("data.load_dataset")
+def load_dataset(name, path=None):
+    """Load a dataset by schema name; `path` overrides the schema's default CSV location"""
+    schema = SCHEMAS[name]
+    path = path or schema["path"]
+    mtime = os.path.getmtime(path)
+    key = (name, os.path.abspath(path))
+
+    with _lock:
+        cached = _memory.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        df = _load_columnar(path, name, schema, mtime)
+        _memory[key] = (mtime, df)
+        return df
+
+
+def clear_cache():
+    """Forget every in-memory frame (the Feather copies on disk are kept)"""
+    with _lock:
+        _memory.clear()
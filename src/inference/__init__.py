@@ -0,0 +1,4 @@
+from src.inference.seq2seq import MODEL_NAME, MODES, Seq2SeqBackend, get_backend, peak_rss_mb
+from src.inference.service import GenerationService
+
+__all__ = ["MODEL_NAME", "MODES", "GenerationService", "Seq2SeqBackend", "get_backend", "peak_rss_mb"]
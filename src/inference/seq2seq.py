@@ -0,0 +1,187 @@
+"""One flan-t5 inference backend shared by the resume screener and the voice assistant.
+
+Three execution modes trade load time, memory and latency on CPU:
+
+    eager  plain fp32 PyTorch (what the apps used before)
+    int8   PyTorch with the Linear layers dynamically quantized to int8
+    onnx   ONNX Runtime via optimum, exported once to models/onnx/ and decoding with the
+           KV cache (decoder_with_past), so each new token only runs the last position
+
+get_backend() keeps one instance per (model, mode) per process. The mode defaults to the
+FLAN_T5_MODE environment variable, so a deployment can switch without code changes.
+
+    python -m src.inference.seq2seq --modes eager int8 onnx
+"""
+import os
+import sys
+import threading
+import time
+
+import torch
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+from src.metrics import peak_rss_mb, timed
+
+MODEL_NAME = "google/flan-t5-small"
+MODES = ("eager", "int8", "onnx")
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+ONNX_DIR = os.path.join(ROOT, "models", "onnx")
+
+
+class Seq2SeqBackend:
+    """Tokenizer + model in one execution mode, with timing counters"""
+
+    def __init__(self, model_name=MODEL_NAME, mode="eager", onnx_dir=ONNX_DIR):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}; choose from {MODES}")
+        self.model_name = model_name
+        self.mode = mode
+        self.name = f"{model_name}:{mode}"  # outputs can differ between modes, so cache keys use this
+        self._lock = threading.Lock()
+        self.calls = self.tokens = 0
+        self.generate_seconds = 0.0
+        self.warmup_seconds = None
+
+        start = time.perf_counter()
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        if mode == "onnx":
+            self.model = self._load_onnx(os.path.join(onnx_dir, model_name.replace("/", "--")))
+        else:
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name, low_cpu_mem_usage=True)
+            model.to("cpu")
+            model.eval()
+            if mode == "int8":
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            self.model = model
+        self.load_seconds = time.perf_counter() - start
+
+    def _load_onnx(self, directory):
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as exc:
+            raise ImportError("The onnx mode needs `pip install optimum[onnxruntime]`") from exc
+        if os.path.isdir(directory):
+            return ORTModelForSeq2SeqLM.from_pretrained(directory, use_cache=True)
+        model = ORTModelForSeq2SeqLM.from_pretrained(self.model_name, export=True, use_cache=True)
+        model.save_pretrained(directory)
+        self.tokenizer.save_pretrained(directory)
+        return model
+
+    @timed("inference.generate")
+    def generate(self, prompts, max_new_tokens=120, batch_size=8, max_length=1024):
+        """Greedy generation for one prompt (returns str) or many (returns a list, input order)"""
+        single = isinstance(prompts, str)
+        prompts = [prompts] if single else list(prompts)
+        # Batch prompts of similar length together so little of each batch is padding
+        order = sorted(range(len(prompts)), key=lambda i: len(prompts[i]))
+        outputs = [None] * len(prompts)
+        pad = self.tokenizer.pad_token_id
+
+        start = time.perf_counter()
+        tokens = 0
+        with torch.inference_mode():
+            for first in range(0, len(order), batch_size):
+                idx = order[first:first + batch_size]
+                inputs = self.tokenizer([prompts[i] for i in idx], return_tensors="pt", padding=True,
+                                        truncation=True, max_length=max_length)
+                generated = self.model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False)
+                tokens += int((generated[:, 1:] != pad).sum())  # skip the decoder start token
+                for i, text in zip(idx, self.tokenizer.batch_decode(generated, skip_special_tokens=True)):
+                    outputs[i] = text
+        self._record(tokens, time.perf_counter() - start)
+        return outputs[0] if single else outputs
+
+    def _record(self, tokens, seconds):
+        with self._lock:
+            self.calls += 1
+            self.tokens += tokens
+            self.generate_seconds += seconds
+
+    def warmup(self, prompt="Answer clearly and concisely:\nWhat is machine learning?", max_new_tokens=16):
+        """Run one short generation so the first real request does not pay for lazy initialisation"""
+        start = time.perf_counter()
+        with torch.inference_mode():
+            inputs = self.tokenizer(prompt, return_tensors="pt")
+            self.model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False)
+        self.warmup_seconds = time.perf_counter() - start
+        return self
+
+    def report(self):
+        return {
+            "mode": self.mode,
+            "load_s": self.load_seconds,
+            "warmup_s": self.warmup_seconds,
+            "calls": self.calls,
+            "tokens": self.tokens,
+            "ms_per_token": 1000 * self.generate_seconds / self.tokens if self.tokens else None,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(model_name=MODEL_NAME, mode=None, warmup=True):
+    """Process-wide backend for (model_name, mode), loaded on first use"""
+    mode = mode or os.environ.get("FLAN_T5_MODE", "eager")
+    with _backends_lock:
+        key = (model_name, mode)
+        if key not in _backends:
+            backend = Seq2SeqBackend(model_name, mode)
+            _backends[key] = backend.warmup() if warmup else backend
+        return _backends[key]
+
+
+# ==========================================
+# Benchmark: one fresh process per mode
+# ------------------------------------------
+BENCH_PROMPTS = [
+    "Answer clearly and concisely:\nWhat is the capital of France?",
+    "Answer clearly and concisely:\nExplain gradient descent in one sentence.",
+    "Summarize: The quarterly report shows revenue up 12% with costs flat, driven by cloud sales.",
+    "Translate English to German: The weather is nice today.",
+]
+
+
+def _bench_one(model_name, mode, n_prompts, max_new_tokens):
+    backend = Seq2SeqBackend(model_name, mode).warmup()
+    prompts = [BENCH_PROMPTS[i % len(BENCH_PROMPTS)] for i in range(n_prompts)]
+    for prompt in prompts:  # one at a time, as the apps call it
+        backend.generate(prompt, max_new_tokens=max_new_tokens)
+    return backend.report()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import subprocess
+
+    parser = argparse.ArgumentParser(description="Compare flan-t5 execution modes on this machine")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--prompts", type=int, default=16)
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_bench_one(args.model, args.child, args.prompts, args.max_new_tokens)))
+        sys.exit(0)
+
+    # Peak RSS is per process, so each mode runs in its own interpreter
+    rows = []
+    for mode in args.modes:
+        out = subprocess.run([sys.executable, "-m", "src.inference.seq2seq", "--child", mode, "--model", args.model,
+                              "--prompts", str(args.prompts), "--max-new-tokens", str(args.max_new_tokens)],
+                             capture_output=True, text=True, cwd=ROOT)
+        if out.returncode:
+            print(f"{mode}: failed\n{out.stderr.strip().splitlines()[-1] if out.stderr else ''}")
+            continue
+        rows.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{'mode':<6} {'load s':>7} {'warmup s':>9} {'ms/token':>9} {'peak RSS MB':>12}")
+    for r in rows:
+        ms, rss = r["ms_per_token"], r["peak_rss_mb"]
+        print(f"{r['mode']:<6} {r['load_s']:>7.2f} {r['warmup_s']:>9.2f} "
+              f"{'n/a' if ms is None else f'{ms:.1f}':>9} {'n/a' if rss is None else f'{rss:.0f}':>12}")
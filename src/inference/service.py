@@ -0,0 +1,273 @@
+"""Streaming, micro-batched generation on top of a Seq2SeqBackend.
+
+Requests from any thread or event loop go into one asyncio queue owned by the service. A batcher
+waits up to `max_wait` seconds for company, then runs a single padded `generate` call for up to
+`max_batch` prompts on a worker thread. A batch-aware streamer decodes each row as tokens arrive
+and hands the new text to that request's caller, so every prompt in the batch streams on its own
+and finishes as soon as its row emits EOS.
+
+    service = GenerationService(get_backend())
+    for piece in service.stream_sync("Answer clearly and concisely:\\nWhat is RAG?"):
+        print(piece, end="")
+
+    python -m src.inference.service --concurrency 1 4 8 --requests 32
+"""
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+from transformers.generation.streamers import BaseStreamer
+
+from src.metrics import timed
+
+_DONE = object()
+
+
+class _Request:
+    __slots__ = ("prompt", "max_new_tokens", "push", "submitted")
+
+    def __init__(self, prompt, max_new_tokens, push):
+        self.prompt = prompt
+        self.max_new_tokens = max_new_tokens
+        self.push = push  # called from the generation thread with str pieces, _DONE or an exception
+        self.submitted = time.perf_counter()
+
+
+class _BatchStreamer(BaseStreamer):
+    """Receives one new token per row per decoding step and forwards each row's new text"""
+
+    def __init__(self, tokenizer, requests):
+        self.tokenizer = tokenizer
+        self.requests = requests
+        self.ids = [[] for _ in requests]
+        self.text = [""] * len(requests)
+        self.done = [False] * len(requests)
+        self.started = False
+        self.tokens = 0
+
+    def put(self, value):
+        # The first call carries the decoder start tokens, not generated ones
+        if not self.started:
+            self.started = True
+            return
+        for row, token in enumerate(value.reshape(len(self.requests), -1)[:, -1].tolist()):
+            if self.done[row]:
+                continue
+            request = self.requests[row]
+            if token == self.tokenizer.eos_token_id:
+                self._finish(row)
+                continue
+            self.ids[row].append(token)
+            self.tokens += 1
+            text = self.tokenizer.decode(self.ids[row], skip_special_tokens=True)
+            if text.startswith(self.text[row]) and len(text) > len(self.text[row]):
+                request.push(text[len(self.text[row]):])
+                self.text[row] = text
+            if len(self.ids[row]) >= request.max_new_tokens:
+                self._finish(row)
+
+    def _finish(self, row):
+        self.done[row] = True
+        self.requests[row].push(_DONE)
+
+    def end(self):
+        for row, finished in enumerate(self.done):
+            if not finished:
+                self._finish(row)
+
+
+class GenerationService:
+    """One micro-batching generation queue per backend, usable from async and threaded code"""
+
+    def __init__(self, backend, max_batch=8, max_wait=0.01):
+        self.backend = backend
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = self.batched_requests = 0
+
+        # The service's own event loop runs in a daemon thread, so Streamlit sessions (threads)
+        # and asyncio servers can share one queue
+        self._loop = asyncio.new_event_loop()
+        self._queue = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="generation-service", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        # One generate at a time: torch already spreads a single call over every core
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="generate")
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._batcher())
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _batcher(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._loop.run_in_executor(self._executor, self._generate, batch)
+
+    @timed("inference.batch")
+    def _generate(self, batch):
+        tokenizer = self.backend.tokenizer
+        streamer = _BatchStreamer(tokenizer, batch)
+        start = time.perf_counter()
+        try:
+            inputs = tokenizer([r.prompt for r in batch], return_tensors="pt", padding=True,
+                               truncation=True, max_length=1024)
+            with torch.inference_mode():
+                self.backend.model.generate(**inputs, max_new_tokens=max(r.max_new_tokens for r in batch),
+                                            do_sample=False, streamer=streamer)
+        except Exception as exc:
+            for row, request in enumerate(batch):
+                if not streamer.done[row]:
+                    streamer.done[row] = True
+                    request.push(exc)
+            return
+        finally:
+            self.backend._record(streamer.tokens, time.perf_counter() - start)
+            self.batches += 1
+            self.batched_requests += len(batch)
+        streamer.end()
+
+    def _submit(self, request):
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, request)
+
+    # ------------------------------------------
+    # Async API (any event loop)
+    # ------------------------------------------
+    async def stream(self, prompt, max_new_tokens=100):
+        """Async generator of text pieces as they are generated"""
+        loop = asyncio.get_running_loop()
+        pieces = asyncio.Queue()
+        self._submit(_Request(prompt, max_new_tokens, lambda item: loop.call_soon_threadsafe(pieces.put_nowait, item)))
+        while True:
+            item = await pieces.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    async def generate(self, prompt, max_new_tokens=100):
+        return "".join([piece async for piece in self.stream(prompt, max_new_tokens)])
+
+    # ------------------------------------------
+    # Blocking API (threads, Streamlit)
+    # ------------------------------------------
+    def stream_sync(self, prompt, max_new_tokens=100):
+        """Generator of text pieces; works with st.write_stream"""
+        pieces = queue.Queue()
+        self._submit(_Request(prompt, max_new_tokens, pieces.put))
+        while True:
+            item = pieces.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def generate_sync(self, prompt, max_new_tokens=100):
+        return "".join(self.stream_sync(prompt, max_new_tokens))
+
+    def close(self):
+        async def shutdown():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ==========================================
+# Load test: one-by-one generate vs the service
+# ------------------------------------------
+LOAD_PROMPTS = [
+    "Answer clearly and concisely:\nWhat is machine learning?",
+    "Answer clearly and concisely:\nWhy is the sky blue?",
+    "Answer clearly and concisely:\nHow does a vaccine work?",
+    "Answer clearly and concisely:\nWhat is the capital of Japan?",
+    "Answer clearly and concisely:\nExplain inflation to a child.",
+]
+
+
+def load_test(backend, concurrency, n_requests, max_new_tokens=100):
+    """Time-to-first-token and aggregate tokens/sec for `concurrency` simultaneous users"""
+    import numpy as np
+
+    prompts = [LOAD_PROMPTS[i % len(LOAD_PROMPTS)] for i in range(n_requests)]
+    results = {}
+
+    # Before: every user calls generate on the shared model and sees nothing until it returns
+    ttft, tokens = [], []
+    start = time.perf_counter()
+
+    def one_by_one(prompt):
+        t0 = time.perf_counter()
+        text = backend.generate(prompt, max_new_tokens=max_new_tokens)
+        ttft.append(time.perf_counter() - t0)
+        tokens.append(len(backend.tokenizer(text).input_ids))
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one_by_one, prompts))
+    results["generate"] = (ttft, sum(tokens) / (time.perf_counter() - start))
+
+    # After: streamed through the micro-batching service
+    service = GenerationService(backend, max_batch=max(1, concurrency))
+    ttft, tokens = [], []
+    start = time.perf_counter()
+
+    def streamed(prompt):
+        t0 = time.perf_counter()
+        first, text = None, ""
+        for piece in service.stream_sync(prompt, max_new_tokens):
+            if first is None:
+                first = time.perf_counter() - t0
+            text += piece
+        ttft.append(first if first is not None else time.perf_counter() - t0)
+        tokens.append(len(backend.tokenizer(text).input_ids))
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(streamed, prompts))
+    results["service"] = (ttft, sum(tokens) / (time.perf_counter() - start))
+    service.close()
+
+    for name, (ttft, tok_s) in results.items():
+        print(f"  {name:<9} concurrency {concurrency:>2}: TTFT p50 {np.percentile(ttft, 50) * 1000:7.0f} ms  "
+              f"p95 {np.percentile(ttft, 95) * 1000:7.0f} ms  {tok_s:7.1f} tokens/s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.inference.seq2seq import MODES, get_backend
+
+    parser = argparse.ArgumentParser(description="Load-test streamed, micro-batched generation")
+    parser.add_argument("--mode", choices=MODES, default=None)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--max-new-tokens", type=int, default=100)
+    args = parser.parse_args()
+
+    backend = get_backend(mode=args.mode)
+    for concurrency in args.concurrency:
+        load_test(backend, concurrency, args.requests, args.max_new_tokens)
@@ -0,0 +1,10 @@
+from src.metrics.app import debug_panel, instrument_app
+from src.metrics.export import JsonLogger, prometheus_text, serve_prometheus, write_json
+from src.metrics.profiling import disable_profiling, enable_profiling
+from src.metrics.registry import REGISTRY, Histogram, peak_rss_bytes, peak_rss_mb, timed, timed_stream
+
+__all__ = [
+    "REGISTRY", "Histogram", "JsonLogger", "debug_panel", "disable_profiling", "enable_profiling",
+    "instrument_app", "peak_rss_bytes", "peak_rss_mb", "prometheus_text", "serve_prometheus",
+    "timed", "timed_stream", "write_json",
+]
@@ -0,0 +1,71 @@
+"""Hooking the metrics into a Streamlit app: environment-driven setup and a debug panel.
+
+instrument_app() is safe to call on every rerun; it acts once per process and is configured from
+the environment, so production can switch exporters on without code changes:
+
+    METRICS_PROFILE=cprofile|sample   attach a profiler to every span
+    METRICS_PORT=9100                 serve Prometheus text at http://127.0.0.1:9100/metrics
+    METRICS_JSON=1 (or a path)        append a JSON snapshot every METRICS_JSON_INTERVAL s (60)
+    METRICS_PANEL=1                   show the debug panel (also ?debug=1 in the page URL)
+"""
+import atexit
+import os
+import threading
+
+from src.metrics.export import DEFAULT_JSON_PATH, JsonLogger, prometheus_text, serve_prometheus
+from src.metrics.profiling import enable_profiling
+from src.metrics.registry import REGISTRY
+
+_app_name = None
+_lock = threading.Lock()
+
+
+def instrument_app(name):
+    """Start the exporters/profiler chosen by the METRICS_* environment variables (once per process)"""
+    global _app_name
+    with _lock:
+        if _app_name is not None:
+            return
+        _app_name = name
+        if os.environ.get("METRICS_PROFILE"):
+            enable_profiling(os.environ["METRICS_PROFILE"])
+        if os.environ.get("METRICS_PORT"):
+            serve_prometheus(int(os.environ["METRICS_PORT"]), app=name)
+        if os.environ.get("METRICS_JSON"):
+            path = os.environ["METRICS_JSON"]
+            logger = JsonLogger(DEFAULT_JSON_PATH if path == "1" else path,
+                                float(os.environ.get("METRICS_JSON_INTERVAL", 60)), app=name)
+            atexit.register(logger.close)
+
+
+def _ms(value):
+    return None if value is None else round(value * 1000, 1)
+
+
+def debug_panel(force=False):
+    """Sidebar expander with per-span latency, memory and profiler output (when enabled)"""
+    import streamlit as st
+
+    if not (force or os.environ.get("METRICS_PANEL") == "1" or st.query_params.get("debug") == "1"):
+        return
+    snapshot = REGISTRY.snapshot()
+    with st.sidebar.expander("Performance", expanded=False):
+        peak = snapshot["peak_rss_bytes"]
+        st.caption(f"Peak RSS: {peak / 1024 ** 2:,.0f} MB" if peak else "Peak RSS: n/a")
+        rows = [{"span": name, "calls": s["count"], "mean ms": _ms(s["mean_s"]), "p50 ms": _ms(s["p50_s"]),
+                 "p95 ms": _ms(s["p95_s"]), "p99 ms": _ms(s["p99_s"]), "max ms": _ms(s["max_s"]),
+                 "RSS growth MB": round(s["rss_growth_bytes"] / 1024 ** 2, 1), "errors": s["errors"]}
+                for name, s in snapshot["spans"].items()]
+        if rows:
+            st.dataframe(rows, hide_index=True)
+        else:
+            st.write("No spans recorded yet.")
+
+        profiler = REGISTRY.profiler
+        if profiler is not None and snapshot["spans"]:
+            span = st.selectbox("Profile for span", list(snapshot["spans"]))
+            st.code(profiler.report(span) or "No samples for this span yet.")
+
+        st.download_button("Prometheus metrics", prometheus_text(app=_app_name), file_name="metrics.prom")
+        if st.button("Reset metrics"):
+            REGISTRY.reset()
@@ -0,0 +1,112 @@
+"""Getting metrics out of the process: Prometheus text, a JSON-lines log and a /metrics endpoint.
+
+Streamlit does not let a page add HTTP routes, so serve_prometheus() runs a tiny stdlib server on
+its own port for a Prometheus scraper. write_json() appends one snapshot per line, so a log can be
+diffed across releases to spot regressions.
+"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.metrics.registry import REGISTRY, peak_rss_bytes
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+DEFAULT_JSON_PATH = os.path.join(ROOT, ".cache", "metrics", "metrics.jsonl")
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(registry=REGISTRY, app=None):
+    """All spans in the Prometheus text exposition format (version 0.0.4)"""
+    extra = f',app="{_label(app)}"' if app else ""
+    lines = [
+        "# HELP app_span_seconds Wall time of instrumented spans.",
+        "# TYPE app_span_seconds histogram",
+    ]
+    with registry._lock:
+        histograms = sorted(registry.histograms.items())
+        rss_growth = dict(registry.rss_growth)
+        errors = dict(registry.errors)
+        for name, hist in histograms:
+            labels = f'span="{_label(name)}"{extra}'
+            cumulative = 0
+            for bound, count in zip(hist.buckets + ("+Inf",), hist.counts):
+                cumulative += count
+                lines.append(f'app_span_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"app_span_seconds_sum{{{labels}}} {hist.sum}")
+            lines.append(f"app_span_seconds_count{{{labels}}} {hist.count}")
+
+    lines += ["# HELP app_span_errors_total Spans that ended with an exception.",
+              "# TYPE app_span_errors_total counter"]
+    lines += [f'app_span_errors_total{{span="{_label(name)}"{extra}}} {errors.get(name, 0)}' for name, _ in histograms]
+    lines += ["# HELP app_span_peak_rss_growth_bytes_total How far spans pushed the process peak RSS.",
+              "# TYPE app_span_peak_rss_growth_bytes_total counter"]
+    lines += [f'app_span_peak_rss_growth_bytes_total{{span="{_label(name)}"{extra}}} {rss_growth.get(name, 0)}'
+              for name, _ in histograms]
+
+    peak = peak_rss_bytes()
+    if peak is not None:
+        labels = f'{{app="{_label(app)}"}}' if app else ""
+        lines += ["# HELP process_peak_rss_bytes Peak resident set size of the process.",
+                  "# TYPE process_peak_rss_bytes gauge",
+                  f"process_peak_rss_bytes{labels} {peak}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_json(path=DEFAULT_JSON_PATH, registry=REGISTRY, app=None):
+    """Append one snapshot as a JSON line"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    snapshot = registry.snapshot()
+    if app:
+        snapshot["app"] = app
+    with open(path, "a") as f:
+        f.write(json.dumps(snapshot) + "\n")
+    return snapshot
+
+
+class JsonLogger:
+    """Background thread that calls write_json every `interval` seconds"""
+
+    def __init__(self, path=DEFAULT_JSON_PATH, interval=60.0, registry=REGISTRY, app=None):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self.app = app
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-json", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            write_json(self.path, self.registry, self.app)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        write_json(self.path, self.registry, self.app)
+
+
+def serve_prometheus(port, host="127.0.0.1", registry=REGISTRY, app=None):
+    """Serve GET /metrics from a daemon thread; returns the server (call .shutdown() to stop)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text(registry, app).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
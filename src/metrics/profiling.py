@@ -0,0 +1,151 @@
+"""Optional profilers that attach to `timed` spans.
+
+    cprofile  deterministic: each outermost span on a thread runs under cProfile, and the stats
+              are merged per span name (precise call counts, but slows the profiled code down)
+    sample    statistical: a background thread looks at the stack of every thread that is inside
+              a span every `interval` seconds and counts the stacks it sees (low overhead, safe
+              to leave on under real load)
+
+Turn one on with enable_profiling("sample") or the METRICS_PROFILE environment variable.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+
+from src.metrics.registry import REGISTRY
+
+
+class CProfiler:
+    """Merges one cProfile run per outermost span into pstats per span name"""
+
+    def __init__(self):
+        self.stats = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self, name):
+        # cProfile cannot nest on a thread, so only the outermost span is profiled
+        if getattr(self._local, "busy", False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # another profiler already owns this thread
+            return None
+        self._local.busy = True
+        return profile
+
+    def stop(self, name, profile):
+        profile.disable()
+        self._local.busy = False
+        with self._lock:
+            if name in self.stats:
+                self.stats[name].add(profile)
+            else:
+                self.stats[name] = pstats.Stats(profile)
+
+    def report(self, name, top=15, sort="cumulative"):
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                return ""
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats(sort).print_stats(top)
+        return out.getvalue()
+
+    def dump(self, directory):
+        """One .prof file per span (open with snakeviz or `python -m pstats`)"""
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            for name, stats in self.stats.items():
+                stats.dump_stats(os.path.join(directory, f"{name}.prof"))
+
+
+class StackSampler:
+    """Samples the stacks of threads inside spans; counts them in collapsed (flame graph) form"""
+
+    def __init__(self, registry=REGISTRY, interval=0.005, max_depth=64):
+        self.registry = registry
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = Counter()  # "span;module:function;..." root first -> count
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+        self._thread.start()
+
+    def start(self, name):
+        return None  # nothing to do per span; the sampler thread finds open spans in registry.active
+
+    def stop(self, name, state):
+        pass
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            active = dict(self.registry.active)
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for ident, spans in active.items():
+                frame = frames.get(ident)
+                try:
+                    span = spans[-1]
+                except IndexError:  # the span closed since the copy was taken
+                    continue
+                if ident == me or frame is None:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                key = ";".join([span] + stack[::-1])
+                with self._lock:
+                    self.samples[key] += 1
+
+    def report(self, name, top=15):
+        """Functions most often on top of the stack while `name` was the innermost open span"""
+        leaves = Counter()
+        with self._lock:
+            for key, count in self.samples.items():
+                span, _, stack = key.partition(";")
+                if span == name:
+                    leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values())
+        lines = [f"{count:>6} {100 * count / total:5.1f}%  {leaf}" for leaf, count in leaves.most_common(top)]
+        return "\n".join(lines)
+
+    def dump(self, directory):
+        """samples.folded, ready for flamegraph.pl or speedscope"""
+        os.makedirs(directory, exist_ok=True)
+        with self._lock, open(os.path.join(directory, "samples.folded"), "w") as f:
+            for key, count in self.samples.most_common():
+                f.write(f"{key} {count}\n")
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+PROFILERS = {"cprofile": CProfiler, "sample": StackSampler}
+
+
+def enable_profiling(mode, registry=REGISTRY):
+    """Attach a profiler ("cprofile" or "sample") to every span, replacing any previous one"""
+    if mode not in PROFILERS:
+        raise ValueError(f"Unknown profiler {mode!r}; choose from {tuple(PROFILERS)}")
+    disable_profiling(registry)
+    registry.profiler = PROFILERS[mode]() if mode == "cprofile" else StackSampler(registry)
+    return registry.profiler
+
+
+def disable_profiling(registry=REGISTRY):
+    profiler, registry.profiler = registry.profiler, None
+    if hasattr(profiler, "close"):
+        profiler.close()
@@ -0,0 +1,204 @@
+"""Latency histograms and peak-memory tracking for named spans of work.
+
+Wrap a hot path with `timed`, as a decorator or a context manager. Every span records its wall
+time in a fixed-bucket histogram (Prometheus style, so quantiles can be estimated and snapshots
+merged) and how far it pushed the process's peak RSS. Generator functions are timed until they
+are exhausted, with the delay to the first item recorded as `<name>.first`.
+
+    @timed("stock.calculate_indicators")
+    def calculate_indicators(df): ...
+
+    with timed("stock.chart"):
+        fig = make_subplots(...)
+"""
+import functools
+import inspect
+import sys
+import threading
+import time
+
+# Upper bounds in seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process in bytes (None where it cannot be measured)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KB on Linux
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where it cannot be measured)"""
+    peak = peak_rss_bytes()
+    return None if peak is None else peak / 1024 ** 2
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with count, sum and max"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Estimate by linear interpolation inside the bucket, as Prometheus' histogram_quantile does"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_s": self.sum / self.count if self.count else None,
+            "p50_s": self.quantile(0.5),
+            "p95_s": self.quantile(0.95),
+            "p99_s": self.quantile(0.99),
+            "max_s": self.max if self.count else None,
+        }
+
+
+class Registry:
+    """Thread-safe store of span histograms plus the hooks the profilers attach to"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.rss_growth = {}  # span -> bytes the process peak RSS grew while it ran
+        self.errors = {}
+        self.profiler = None  # set by src.metrics.profiling.enable_profiling
+        self.active = {}  # thread id -> stack of open span names (read by the sampling profiler)
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, rss_growth=0, error=False):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.observe(seconds)
+            if rss_growth:
+                self.rss_growth[name] = self.rss_growth.get(name, 0) + rss_growth
+            if error:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def start(self, name, profile=True):
+        """Open a span; with profile=False it is timed but invisible to the profilers"""
+        state = None
+        if profile:
+            self.active.setdefault(threading.get_ident(), []).append(name)
+            state = self.profiler.start(name) if self.profiler is not None else None
+        return name, time.perf_counter(), peak_rss_bytes() or 0, profile, state
+
+    def stop(self, token, error=False):
+        name, start, rss_before, profile, state = token
+        seconds = time.perf_counter() - start
+        if profile:
+            if state is not None:
+                self.profiler.stop(name, state)
+            ident = threading.get_ident()
+            stack = self.active.get(ident)
+            if stack:
+                stack.pop()
+                if not stack:
+                    self.active.pop(ident, None)  # Streamlit runs each rerun on a new thread
+        self.observe(name, seconds, (peak_rss_bytes() or 0) - rss_before, error)
+        return seconds
+
+    def snapshot(self):
+        """{span: summary + rss_growth_bytes + errors}, plus the process peak RSS"""
+        with self._lock:
+            spans = {name: {**hist.summary(), "rss_growth_bytes": self.rss_growth.get(name, 0),
+                            "errors": self.errors.get(name, 0)}
+                     for name, hist in sorted(self.histograms.items())}
+        return {"time": time.time(), "peak_rss_bytes": peak_rss_bytes(), "spans": spans}
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.rss_growth.clear()
+            self.errors.clear()
+
+
+REGISTRY = Registry()
+
+
+class timed:
+    """Time a block (`with timed(name):`) or every call of a function (`@timed(name)`)"""
+
+    def __init__(self, name, registry=None):
+        self.name = name
+        self.registry = registry or REGISTRY
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(self.registry.start(self.name))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.stop(self._tokens.pop(), error=exc_type is not None)
+        return False
+
+    def __call__(self, func):
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def gen_wrapper(*args, **kwargs):
+                return (yield from timed_stream(self.name, func(*args, **kwargs), self.registry))
+            return gen_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = self.registry.start(self.name)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                self.registry.stop(token, error=True)
+                raise
+            self.registry.stop(token)
+            return result
+        return wrapper
+
+
+def timed_stream(name, iterable, registry=None):
+    """Yield from `iterable`, recording time to the first item (`name.first`) and to the end (`name`)"""
+    registry = registry or REGISTRY
+    # Not profiled: the span is suspended at every yield while the consumer's code runs
+    token = registry.start(name, profile=False)
+    start, first, error = token[1], True, False
+    try:
+        for item in iterable:
+            if first:
+                registry.observe(f"{name}.first", time.perf_counter() - start)
+                first = False
+            yield item
+    except BaseException as exc:
+        error = not isinstance(exc, GeneratorExit)
+        raise
+    finally:
+        registry.stop(token, error=error)
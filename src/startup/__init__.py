@@ -0,0 +1,3 @@
+from src.startup.lazy import LazyModule, Preloader, lazy_import, preload, preload_status
+
+__all__ = ["LazyModule", "Preloader", "lazy_import", "preload", "preload_status"]
@@ -0,0 +1,163 @@
+"""Cold-start benchmark for the Streamlit apps.
+
+Each app's module-level imports run in a fresh interpreter under `python -X importtime`, so the
+numbers are what a new Streamlit worker pays before it can paint anything. With --run the whole
+script is also executed once through Streamlit's AppTest, which times the first render.
+
+Results can be saved as a baseline and later runs compared against it; the exit status is 1 when
+an app got slower than the tolerance allows, so the check can gate a CI job.
+
+    python -m src.startup.importtime --update          # record .cache/startup_baseline.json
+    python -m src.startup.importtime                   # compare against it
+    python -m src.startup.importtime --apps voice resume --run
+"""
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+PROJECTS_DIR = os.path.join(ROOT, "projects")
+BASELINE_PATH = os.path.join(ROOT, ".cache", "startup_baseline.json")
+MARKER = "--- app imports ---"
+SCRIPT_MARKER = "--- script run ---"
+
+APPS = {
+    "resume": os.path.join("AI Resume Screener", "resume_app.py"),
+    "voice": os.path.join("Voice AI Assistant", "voice_app.py"),
+    "real_estate": os.path.join("Real Estate", "real_estate_app.py"),
+    "stock": os.path.join("Stock Price Prediction", "main.py"),
+    "mutual_fund": os.path.join("Mutual Fund", "mutual_fund_app.py"),
+    "youtube": os.path.join("YouTube Analysis", "youtube_app.py"),
+}
+
+
+def _module_imports(path):
+    """Just the module-level import statements of a script, compiled on their own"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return compile(ast.Module(body=nodes, type_ignores=[]), path, "exec")
+
+
+def _child(path, run):
+    """Runs inside the fresh interpreter: time the imports (and optionally one script run)"""
+    sys.path[:0] = [os.path.dirname(path), ROOT]
+    result = {"import_s": None, "script_s": None, "error": None}
+    code = _module_imports(path)
+
+    print(MARKER, file=sys.stderr, flush=True)
+    start = time.perf_counter()
+    try:
+        exec(code, {"__name__": "__startup__", "__file__": path})
+    except ImportError as exc:
+        result["error"] = f"missing {exc.name or exc}"
+        return result
+    result["import_s"] = time.perf_counter() - start
+
+    if run:
+        print(SCRIPT_MARKER, file=sys.stderr, flush=True)
+        try:
+            from streamlit.testing.v1 import AppTest
+        except ImportError:
+            result["error"] = "--run needs streamlit"
+            return result
+        start = time.perf_counter()
+        app = AppTest.from_file(path, default_timeout=600).run()
+        result["script_s"] = time.perf_counter() - start
+        if app.exception:
+            result["error"] = "script raised"
+    return result
+
+
+def _heaviest(stderr, top):
+    """[(module, cumulative seconds)] for the app's direct imports, heaviest first"""
+    # Imports made later (by the script run or background preloads) are not part of the cold start
+    lines = stderr.split(MARKER, 1)[-1].split(SCRIPT_MARKER, 1)[0].splitlines()
+    direct = []
+    for line in lines:
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if len(name) - len(name.lstrip()) == 1:  # depth 0: imported by the app itself
+            direct.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(direct, key=lambda item: -item[1])[:top]
+
+
+def measure(app, run=False, repeat=3, top=3):
+    """Best of `repeat` cold starts of one app (each in a new interpreter)"""
+    path = os.path.join(PROJECTS_DIR, APPS[app])
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-X", "importtime", "-m", "src.startup.importtime",
+                              "--child", path] + (["--run"] if run else []),
+                             capture_output=True, text=True, cwd=os.path.dirname(path),
+                             env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))})
+        if out.returncode:
+            return {"import_s": None, "script_s": None, "error": out.stderr.strip().splitlines()[-1], "heaviest": []}
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        result["heaviest"] = _heaviest(out.stderr, top)
+        if result["error"] or best is None or result["import_s"] < best["import_s"]:
+            best = result
+        if result["error"]:
+            break
+    return best
+
+
+def compare(results, baseline, tolerance=0.25, floor_s=0.05):
+    """Apps whose import (or script) time grew by more than tolerance and floor_s over the baseline"""
+    regressions = []
+    for app, result in results.items():
+        before = baseline.get(app)
+        if not before:
+            continue
+        for field in ("import_s", "script_s"):
+            old, new = before.get(field), result.get(field)
+            if old is not None and new is not None and new > old * (1 + tolerance) and new - old > floor_s:
+                regressions.append((app, field, old, new))
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure (and guard) cold-start time of the Streamlit apps")
+    parser.add_argument("--apps", nargs="+", choices=sorted(APPS), default=sorted(APPS))
+    parser.add_argument("--run", action="store_true", help="also time one full script run via AppTest")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.run)))
+        sys.exit(0)
+
+    results = {}
+    print(f"{'app':<12} {'imports s':>10} {'script s':>9}  heaviest imports")
+    for app in args.apps:
+        r = results[app] = measure(app, run=args.run, repeat=args.repeat)
+        imports = "n/a" if r["import_s"] is None else f"{r['import_s']:.2f}"
+        script = "n/a" if r["script_s"] is None else f"{r['script_s']:.2f}"
+        heaviest = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in r["heaviest"])
+        print(f"{app:<12} {imports:>10} {script:>9}  {r['error'] or heaviest}")
+
+    if args.update:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        previous = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f)
+        with open(args.baseline, "w") as f:
+            json.dump({**previous, **results}, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for app, field, old, new in regressions:
+            print(f"REGRESSION {app} {field}: {old:.2f}s -> {new:.2f}s")
+        sys.exit(1 if regressions else 0)
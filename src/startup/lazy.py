@@ -0,0 +1,116 @@
+"""Deferred imports and background model loading for the Streamlit apps.
+
+lazy_import() returns a stand-in that imports the real module on first attribute access, so a
+heavy package used in one branch of a page costs nothing on the others. preload() starts a loader
+in a background thread and returns its Future straight away: the page keeps rendering while the
+model loads, and only the code that needs the model waits on `.result()`.
+
+    plt = lazy_import("matplotlib.pyplot")
+    model = preload("flan-t5", load_model)
+    ...
+    backend = model.result()
+"""
+import importlib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LazyModule:
+    """Module proxy that imports `name` the first time one of its attributes is used"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        # import_module holds the import lock, so concurrent first uses still import once
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """The module if it is already imported, otherwise a LazyModule for it"""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+class Preloader:
+    """Runs each named loader once, in the background, and hands out its Future"""
+
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preload")
+        self._futures = {}
+        self._seconds = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, loader, *args, **kwargs):
+        """Future for loader(*args, **kwargs); later calls with the same key reuse the first one"""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._futures[key] = self._executor.submit(self._timed, key, loader, args, kwargs)
+            return future
+
+    def _timed(self, key, loader, args, kwargs):
+        start = time.perf_counter()
+        try:
+            return loader(*args, **kwargs)
+        finally:
+            self._seconds[key] = time.perf_counter() - start
+
+    def result(self, key, timeout=None):
+        return self._futures[key].result(timeout)
+
+    def forget(self, key):
+        """Drop a finished (typically failed) load so the next submit retries it"""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and future.done():
+                del self._futures[key]
+                self._seconds.pop(key, None)
+
+    def status(self):
+        """{key: {"state": loading|ready|failed, "seconds": load time or None}}"""
+        with self._lock:
+            futures = dict(self._futures)
+        report = {}
+        for key, future in futures.items():
+            if not future.done():
+                state = "loading"
+            elif future.exception() is not None:
+                state = "failed"
+            else:
+                state = "ready"
+            report[key] = {"state": state, "seconds": self._seconds.get(key)}
+        return report
+
+
+# One preloader per process, so every Streamlit session shares the same loads
+_preloader = Preloader()
+
+
+def preload(key, loader, *args, **kwargs):
+    """Start loader(*args, **kwargs) in the background (once per process) and return its Future"""
+    future = _preloader.submit(key, loader, *args, **kwargs)
+    if future.done() and future.exception() is not None:
+        # A failed load (e.g. no network for a download) is retried on the next rerun
+        _preloader.forget(key)
+        future = _preloader.submit(key, loader, *args, **kwargs)
+    return future
+
+
+def preload_status():
+    return _preloader.status()
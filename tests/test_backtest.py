@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "projects", "Stock Price Prediction"))
+
+from backtest import Backtester  # noqa: E402
+from engine import StockEngine  # noqa: E402
+from fetchers import SyntheticFetcher  # noqa: E402
+
+
+@pytest.fixture
+def frames():
+    synthetic = SyntheticFetcher()
+    frames = {symbol: synthetic(symbol, "1y") for symbol in ["A", "B", "C"]}
+    frames["B"] = frames["B"].drop(frames["B"].index[[60, 120, -10]])
+    frames["C"] = frames["C"].iloc[30:-5]  # listed late, stopped early
+    return frames
+
+
+def test_scores_match_get_decision_on_every_bar(frames):
+    scores = Backtester(frames).scores()
+    for symbol, df in frames.items():
+        expected = StockEngine.calculate_indicators(df.copy())
+        own = scores[symbol].dropna()
+        assert own.index.equals(expected.index[49:])  # warm until the 50-bar SMA exists
+        decisions, _ = StockEngine.classify(own.to_numpy())
+        for t, decision in zip(range(49, len(df)), decisions):
+            assert StockEngine.get_decision(expected.iloc[:t + 1])[0] == decision, (symbol, t)
+
+
+def test_gap_does_not_drop_the_return_across_it(frames):
+    bt = Backtester(frames)
+    always_long = {"buy_at": -100, "sell_at": -1000}
+    table = bt.run(always_long)
+    for symbol, df in frames.items():
+        # Signal on bar 49 (first scored bar), long from bar 50, entry cost charged on bar 50
+        returns = df["Close"].pct_change().iloc[50:].to_numpy(copy=True)
+        returns[0] -= bt.cost
+        assert table.loc[symbol, "Total Return %"] == pytest.approx((np.prod(1 + returns) - 1) * 100, rel=1e-9)
+        assert np.isfinite(table.loc[symbol, "Sharpe"])
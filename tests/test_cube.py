@@ -0,0 +1,24 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "projects", "YouTube Analysis"))
+
+from cube import TrendingCube  # noqa: E402
+
+
+def test_totals_are_exact_past_float_precision():
+    big = 2 ** 53
+    df = pd.DataFrame({
+        "channel_title": ["a", "a", "b", "a"],
+        "view_count": np.array([big, 1, 5, 1], dtype=np.int64),
+        "like_count": np.array([1, 2, 3, 4], dtype=np.uint32),
+        "comment_count": np.zeros(4, dtype=np.uint8),
+    })
+    cube = TrendingCube(df)
+    summary = cube.summary(cube.select("a"))
+    assert summary["videos"] == 3
+    assert summary["total_view_count"] == big + 2  # float64 sums drop both +1s
+    assert summary["total_like_count"] == 7
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "projects", "YouTube Analysis"))
+
+from ingest import SeenIds, SpaceSaving, TrendingStats  # noqa: E402
+
+
+def test_space_saving_tracks_every_heavy_hitter():
+    rng = np.random.default_rng(0)
+    keys = rng.zipf(1.3, 50_000) % 20_000
+    weights = rng.integers(1, 1_000, len(keys))
+    sketch = SpaceSaving(capacity=200)
+    for part in np.array_split(np.arange(len(keys)), 25):
+        sketch.update(pd.Series(weights[part]).groupby(keys[part]).sum().to_dict())
+
+    true = pd.Series(weights).groupby(keys).sum()
+    assert len(sketch.counts) == 200
+    for key, total in true[true > weights.sum() / 200].items():
+        assert key in sketch.counts
+    for key, count in sketch.counts.items():
+        assert count - sketch.errors[key] <= true[key] <= count
+    assert list(sketch.top(3).index) == list(true.nlargest(3).index)
+
+
+def test_merged_sketches_keep_their_error_bounds():
+    rng = np.random.default_rng(1)
+    keys = rng.zipf(1.2, 60_000) % 30_000
+    weights = rng.integers(1, 1_000, len(keys))
+    halves = []
+    for part in np.array_split(np.arange(len(keys)), 2):
+        sketch = SpaceSaving(capacity=150)
+        for chunk in np.array_split(part, 10):
+            sketch.update(pd.Series(weights[chunk]).groupby(keys[chunk]).sum().to_dict())
+        halves.append(sketch)
+    merged = halves[0].merge(halves[1])
+
+    true = pd.Series(weights).groupby(keys).sum()
+    assert len(merged.counts) == 150
+    for key, count in merged.counts.items():
+        assert count - merged.errors[key] <= true[key] <= count
+    for key in true[true > weights.sum() / 150].index:
+        assert key in merged.counts
+    merged.update({-1: 10 ** 9})  # the rebuilt heap still finds the smallest key to replace
+    assert merged.top(1).index[0] == -1 and len(merged.counts) == 150
+
+
+def test_seen_ids_false_positive_rate_and_fixed_size():
+    rng = np.random.default_rng(2)
+    added, others = rng.integers(0, 2 ** 63, (2, 100_000), dtype=np.uint64)
+    seen = SeenIds(expected=100_000, false_positive=1e-3)
+    size = seen.array.nbytes
+    seen.add(added)
+    assert seen.contains(added).all()
+    assert seen.contains(others).mean() < 2e-3
+    assert seen.estimated_count() == pytest.approx(100_000, rel=0.02)
+    assert seen.array.nbytes == size
+
+
+def _frame(ids, views):
+    return pd.DataFrame({"video_id": pd.array(ids, dtype="string"), "channel_title": "c",
+                         "view_count": views, "like_count": 1, "comment_count": 0})
+
+
+def test_duplicate_ids_count_once_across_chunks():
+    stats = TrendingStats(expected_ids=1_000)
+    stats.update(_frame(["a", "b", "a"], [10, 20, 99]))
+    stats.update(_frame(["b", "c"], [99, 30]))
+    assert stats.rows_read == 5
+    assert stats.summary()["videos"] == 3
+    assert stats.summary()["total_view_count"] == 60  # first occurrence wins
+
+
+def test_merge_rejects_shared_ids():
+    left, right = TrendingStats(expected_ids=1_000), TrendingStats(expected_ids=1_000)
+    left.update(_frame(["a", "b"], [1, 2]))
+    right.update(_frame(["c"], [3]))
+    assert left.merge(right).summary()["videos"] == 3
+
+    again = TrendingStats(expected_ids=1_000)
+    again.update(_frame(["b"], [5]))
+    with pytest.raises(ValueError):
+        left.merge(again)
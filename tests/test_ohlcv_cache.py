@@ -0,0 +1,51 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "projects", "Stock Price Prediction"))
+
+from cache import OHLCVCache  # noqa: E402
+
+
+class CountingFetcher:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, period):
+        self.calls.append((symbol, period))
+        index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=300, freq="D")
+        return pd.DataFrame({"Close": np.arange(300.0)}, index=index)
+
+
+def test_instances_sharing_a_directory_see_each_others_entries(tmp_path):
+    fetcher = CountingFetcher()
+    app, api = OHLCVCache(str(tmp_path), fetcher), OHLCVCache(str(tmp_path), fetcher)
+    app.get("TCS", "1y")
+    api.get("INFY", "1y")
+    assert len(api.get("TCS", "6mo")) < len(app.get("INFY", "1y"))
+    assert fetcher.calls == [("TCS", "1y"), ("INFY", "1y")]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_lru_eviction_across_instances(tmp_path):
+    fetcher = CountingFetcher()
+    first, second = OHLCVCache(str(tmp_path), fetcher, max_symbols=2), OHLCVCache(str(tmp_path), fetcher, max_symbols=2)
+    first.get("A")
+    second.get("B")
+    first.get("A")
+    second.get("C")  # B is now least recently used
+    assert sorted(os.listdir(tmp_path)) == ["A.json", "A.parquet", "C.json", "C.parquet"]
+    first.invalidate()
+    assert os.listdir(tmp_path) == []
+
+
+def test_data_replaced_under_stale_metadata_is_refetched(tmp_path):
+    fetcher = CountingFetcher()
+    cache = OHLCVCache(str(tmp_path), fetcher)
+    cache.get("TCS")
+    # Another process rewrote the data but has not written its metadata yet
+    pd.read_parquet(tmp_path / "TCS.parquet").tail(10).to_parquet(tmp_path / "TCS.parquet")
+    assert len(cache.get("TCS")) > 10
+    assert fetcher.calls == [("TCS", "1y"), ("TCS", "1y")]
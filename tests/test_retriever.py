@@ -0,0 +1,109 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("langchain_text_splitters")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "projects", "RAG From Scratch"))
+
+from retriever import APPROX_MIN_CHUNKS, HashingEmbedder, Retriever, _synthetic_corpus  # noqa: E402
+
+
+class CountingEmbedder(HashingEmbedder):
+    """HashingEmbedder that records every text it is asked to embed"""
+
+    def __init__(self):
+        super().__init__()
+        self.embedded = []
+
+    def __call__(self, texts):
+        self.embedded += list(texts)
+        return super().__call__(texts)
+
+
+def _paragraphs(prefix, n):
+    return [f"{prefix} paragraph {i}: " + " ".join(f"{prefix}{i}w{j}" for j in range(12)) for i in range(n)]
+
+
+def test_update_embeds_only_changed_chunks(tmp_path):
+    embedder = CountingEmbedder()
+    retriever = Retriever(str(tmp_path), embedder=embedder, index_type="flat")
+    a, b = _paragraphs("alpha", 4), _paragraphs("beta", 3)
+    docs = {"a.txt": "\n\n".join(a), "b.txt": "\n\n".join(b)}
+
+    stats = retriever.update(docs)
+    assert (stats["added"], stats["embedded"]) == (7, 7)
+
+    embedder.embedded.clear()
+    a[2] = "alpha paragraph 2 rewritten with entirely new wording"
+    docs["a.txt"] = "\n\n".join(a)
+    stats = retriever.update(docs)
+    assert embedder.embedded == [a[2]]
+    assert (stats["added"], stats["removed"], stats["kept"]) == (1, 1, 6)
+
+    embedder.embedded.clear()
+    stats = retriever.update({"a.txt": docs["a.txt"], "c.txt": b[0]})  # b removed, one paragraph moved to c
+    assert embedder.embedded == []
+    assert (stats["added"], stats["embedded"], stats["removed"]) == (1, 0, 3)
+    assert {hit["source"] for hit in retriever.search(b[0], k=1)} == {"c.txt"}
+
+    assert retriever.update({"a.txt": docs["a.txt"], "c.txt": b[0]})["embedded"] == 0
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf", "hnsw"])
+def test_reload_returns_the_same_hits(tmp_path, index_type):
+    texts = _synthetic_corpus(APPROX_MIN_CHUNKS + 500)
+    docs = {f"doc{i}": text for i, text in enumerate(texts)}
+    retriever = Retriever(str(tmp_path), embedder=HashingEmbedder(), index_type=index_type, chunk_size=10 ** 6)
+    retriever.update(docs)
+    del docs["doc3"], docs["doc7"]
+    retriever.update(docs)
+    assert retriever.built_kind == index_type
+
+    queries = _synthetic_corpus(20, seed=1) + [texts[3]]
+    before = retriever.search_batch(queries, k=5)
+    embedder = CountingEmbedder()
+    reloaded = Retriever(str(tmp_path), embedder=embedder, index_type=index_type, chunk_size=10 ** 6)
+    assert reloaded.built_kind == index_type and reloaded.update(docs)["embedded"] == 0
+    after = reloaded.search_batch(queries, k=5)
+    assert [[(h["source"], h["score"]) for h in hits] for hits in after] == \
+        [[(h["source"], h["score"]) for h in hits] for hits in before]
+
+
+def test_search_skips_tombstones_and_still_returns_k_live_hits(tmp_path):
+    texts = _synthetic_corpus(400)
+    docs = {f"doc{i}": text for i, text in enumerate(texts)}
+    retriever = Retriever(str(tmp_path), embedder=HashingEmbedder(), index_type="flat", chunk_size=10 ** 6)
+    retriever.update(docs)
+    removed = [f"doc{i}" for i in range(0, 400, 5)]  # 20%: below the compaction threshold
+    for source in removed:
+        del docs[source]
+    retriever.update(docs)
+    assert retriever.dead_mask().sum() == len(removed)  # still tombstones, not compacted
+
+    # Each query is a removed chunk's own text, so its dead row would be the best match
+    scores, ids = retriever.search_vectors(retriever.embedder([texts[i] for i in range(0, 400, 5)]), k=10)
+    assert (ids >= 0).all()
+    assert not retriever.dead_mask()[ids].any()
+    assert np.isfinite(scores).all()
+    hits = retriever.search(texts[0], k=10)
+    assert len(hits) == 10 and "doc0" not in {hit["source"] for hit in hits}
+
+
+def test_ivf_retrains_once_it_outgrows_its_centroids(tmp_path):
+    texts = _synthetic_corpus(6 * APPROX_MIN_CHUNKS)
+    retriever = Retriever(str(tmp_path), embedder=HashingEmbedder(), index_type="ivf", chunk_size=10 ** 6)
+    first = APPROX_MIN_CHUNKS + 100
+    retriever.update({f"doc{i}": text for i, text in enumerate(texts[:first])})
+    assert (retriever.built_kind, retriever.built_size) == ("ivf", first)
+
+    retriever.update({f"doc{i}": text for i, text in enumerate(texts[:3 * first])})
+    assert retriever.built_size == first  # new vectors added to the trained index
+    assert retriever.index.ntotal == 3 * first
+
+    retriever.update({f"doc{i}": text for i, text in enumerate(texts)})
+    assert retriever.built_size == len(texts)  # past 4x the training set: retrained
+    assert retriever.recall(_synthetic_corpus(50, seed=3), k=5) > 0.5
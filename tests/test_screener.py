@@ -0,0 +1,110 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "projects", "Stock Price Prediction"))
+
+from engine import StockEngine  # noqa: E402
+from fetchers import SyntheticFetcher  # noqa: E402
+from screener import StockScreener  # noqa: E402
+
+
+class FakeFetcher:
+    """Synthetic history, with scripted failures: {symbol: [outcome per attempt]}.
+
+    Outcomes are "ok", "raise", "empty" or "hang" (block until released); attempts past the
+    end of the script repeat its last outcome.
+    """
+
+    def __init__(self, script=None):
+        self.script = script or {}
+        self.calls = Counter()
+        self.release = threading.Event()
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+        self._synthetic = SyntheticFetcher()
+
+    def __call__(self, symbol, period="1y"):
+        with self._lock:
+            self.calls[symbol] += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            outcomes = self.script.get(symbol, ["ok"])
+            outcome = outcomes[min(self.calls[symbol], len(outcomes)) - 1]
+        try:
+            time.sleep(0.01)
+            if outcome == "raise":
+                raise ConnectionError(f"no route to {symbol}")
+            if outcome == "empty":
+                return self._synthetic(symbol, period).iloc[:0]
+            if outcome == "hang":
+                self.release.wait()
+            return self._synthetic(symbol, period)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def fetcher():
+    fake = FakeFetcher()
+    yield fake
+    fake.release.set()  # let abandoned workers finish
+
+
+def test_every_symbol_fetched_once_on_a_bounded_pool(fetcher):
+    symbols = [f"S{i}" for i in range(20)]
+    screener = StockScreener(fetcher=fetcher, max_workers=4)
+    table = screener.scan(symbols + symbols[:5])
+    assert sorted(table.index) == sorted(symbols)
+    assert set(fetcher.calls.values()) == {1}
+    assert fetcher.peak <= 4
+    assert screener.errors == {}
+
+
+def test_failures_are_retried_then_reported(fetcher):
+    fetcher.script = {"FLAKY": ["raise", "ok"], "DOWN": ["raise"], "EMPTY": ["empty"]}
+    screener = StockScreener(fetcher=fetcher, max_workers=4, retries=2, backoff=0.01)
+    table = screener.scan(["OK", "FLAKY", "DOWN", "EMPTY"])
+    assert sorted(table.index) == ["FLAKY", "OK"]
+    assert fetcher.calls == {"OK": 1, "FLAKY": 2, "DOWN": 3, "EMPTY": 3}
+    assert screener.errors == {"DOWN": "ConnectionError: no route to DOWN", "EMPTY": "empty response"}
+
+
+def test_hung_fetch_times_out_without_blocking_the_rest(fetcher):
+    fetcher.script = {"SLOW": ["hang"], "LATE": ["hang", "ok"]}
+    screener = StockScreener(fetcher=fetcher, max_workers=4, retries=1, timeout=0.3, backoff=0.0)
+    start = time.monotonic()
+    frames = screener.fetch_all(["SLOW", "LATE", "A", "B"])
+    assert time.monotonic() - start < 3
+    assert sorted(frames) == ["A", "B", "LATE"]
+    assert fetcher.calls["SLOW"] == 2
+    assert screener.errors == {"SLOW": "timed out after 0.3s"}
+
+
+def test_short_histories_are_skipped_with_a_reason(fetcher):
+    screener = StockScreener(fetcher=fetcher, min_bars=51)
+    table = screener.scan(["A", "B"], period="1mo")
+    assert table.empty
+    assert screener.errors == {"A": "only 21 bars", "B": "only 21 bars"}
+
+
+def test_scores_match_get_decision_when_a_symbol_misses_bars():
+    synthetic = SyntheticFetcher()
+    frames = {symbol: synthetic(symbol, "1y") for symbol in ["A", "B", "C", "D"]}
+    frames["B"] = frames["B"].drop(frames["B"].index[-10])
+    frames["C"] = frames["C"].drop(frames["C"].index[[5, 100, -3]])
+    frames["D"] = frames["D"].iloc[:-4]  # stopped trading before the others
+
+    table = StockScreener().score(frames)
+    for symbol, df in frames.items():
+        expected = StockEngine.calculate_indicators(df.copy())
+        decision, confidence, _ = StockEngine.get_decision(expected)
+        row = table.loc[symbol]
+        assert row["RSI"] == pytest.approx(expected["RSI"].iloc[-1])
+        assert row["Volatility %"] == pytest.approx(expected["Volatility"].iloc[-1] * 100)
+        assert (row["Decision"], row["Confidence"]) == (decision, confidence)
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "projects", "Mutual Fund"))
+
+from sip import future_value, project  # noqa: E402
+
+
+@pytest.mark.parametrize("years", [0.5, 1.25, 2.6, 7.9, 10.0, 12.0 + 1 / 12])
+@pytest.mark.parametrize("annual_return, step_up", [(12.0, 0.0), (12.0, 10.0), (0.0, 5.0), (12.0, 12.68)])
+def test_fractional_years_match_project(years, annual_return, step_up):
+    args = dict(monthly=5000, years=years, annual_return=annual_return, step_up=step_up,
+                lumpsum=20000, inflation=6.0)
+    path = project(**args)
+    months = int(round(years * 12))
+    assert future_value(**args) == pytest.approx(path.real_value[0, months - 1], rel=1e-10)
+
+
+def test_array_arguments_broadcast():
+    years = np.array([1.5, 3.0, 4.25])
+    path = project(1000, years, 10.0, step_up=5.0)
+    last = [path.value[k, int(round(y * 12)) - 1] for k, y in enumerate(years)]
+    np.testing.assert_allclose(future_value(1000, years, 10.0, step_up=5.0), last, rtol=1e-10)
@@ -0,0 +1,83 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "projects", "AI Resume Screener"))
+
+import skills  # noqa: E402
+from skills import SkillMatcher  # noqa: E402
+
+
+@pytest.fixture(params=["substring", "word scan"])
+def mode(request, monkeypatch):
+    # Short lists search each term; long ones take one pass over the words. Run both on every case
+    if request.param == "word scan":
+        monkeypatch.setattr(skills, "SCAN_ALL_MAX_ANCHORS", 0)
+    return request.param
+
+
+@pytest.mark.parametrize("text, skill, span", [
+    ("Built apps on .NET Core", ".NET", (14, 18)),
+    (".NET since 2015", ".NET", (0, 4)),
+    ("Grew reach with #hashtag campaigns", "#hashtag", (16, 24)),
+    ("Shipped C++ and C# services", "C++", (8, 11)),
+    ("Shipped C++ and C# services", "C#", (16, 18)),
+])
+def test_skills_that_start_or_end_with_punctuation(mode, text, skill, span):
+    matcher = SkillMatcher([".NET", "#hashtag", "C++", "C#", "C"])
+    assert matcher.positions(text)[skill] == [span]
+    assert skill in matcher.found(text)
+
+
+def test_punctuation_skill_must_stand_alone(mode):
+    matcher = SkillMatcher([".NET", "#hashtag"])
+    assert matcher.positions("asp.NET and tag#hashtag") == {}
+    assert matcher.found("asp.NET and tag#hashtag") == set()
+
+
+def test_terms_do_not_match_inside_other_words(mode):
+    matcher = SkillMatcher(["SQL", "C", "R", "Go"])
+    text = "NoSQL stores, C++ and a good record; I go to Go meetups and write SQL, C."
+    sql, c, go = text.index("SQL,"), text.index("C."), text.index("Go ")
+    assert matcher.positions(text) == {"SQL": [(sql, sql + 3)], "C": [(c, c + 1)], "Go": [(go, go + 2)]}
+
+
+def test_aliases_and_line_breaks(mode):
+    matcher = SkillMatcher(["Machine Learning", "Google Cloud Platform"])
+    found = matcher.positions("ML models on Google Cloud Platform; machine-\nlearning at scale")
+    assert found == {"Machine Learning": [(0, 2), (36, 53)], "Google Cloud Platform": [(13, 34)]}
+
+
+def test_longest_term_wins_at_a_spot(mode):
+    matcher = SkillMatcher(["Node", "Node.js"])
+    assert matcher.positions("node.js and node") == {"Node.js": [(0, 7)], "Node": [(12, 16)]}
+
+
+def test_found_agrees_with_positions(mode):
+    catalog = [".NET", "#hashtag", "SQL", "C", "C++", "R", "Machine Learning", "AWS", "Node.js", "CI/CD"]
+    text = "R, C and C++ on .NET; CI/CD to AWS (Amazon Web Services); ML, #hashtag, NoSQL, node.js"
+    for n in range(1, len(catalog) + 1):
+        matcher = SkillMatcher(catalog[:n])
+        assert matcher.found(text) == set(matcher.positions(text))
+
+
+@pytest.mark.parametrize("text", [
+    "My CV is attached for your review.",
+    "Full DL and TS details are enclosed.",
+    "Led R&D for the payments team.",
+    "The go-to person for releases. Go-to person for releases.",
+    "Wrote iOS apps in Objective-C.",
+    "Reported to the C-suite.",
+])
+def test_ordinary_resume_words_are_not_skills(mode, text):
+    matcher = SkillMatcher(["Computer Vision", "Deep Learning", "TypeScript", "R", "Go", "C"])
+    assert matcher.positions(text) == {}
+    assert matcher.found(text) == set()
+
+
+def test_acronym_compounds_still_count(mode):
+    matcher = SkillMatcher(["Machine Learning", "C", "R"])
+    text = "Built ML-based ranking in C and R; C/C++ and R/Python tooling."
+    assert set(matcher.positions(text)) == {"Machine Learning", "C", "R"}
+    assert len(matcher.positions(text)["C"]) == 2
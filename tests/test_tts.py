@@ -0,0 +1,64 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "projects", "Voice AI Assistant"))
+
+from tts import AudioCache, Speaker, split_sentences  # noqa: E402
+
+
+class FakeBackend:
+    """Records every phrase it is asked to synthesize; audio is the phrase itself"""
+
+    name = "fake"
+    mime = "audio/wav"
+
+    def __init__(self):
+        self.calls = []
+
+    def synthesize(self, text, lang="en"):
+        self.calls.append((text, lang))
+        return f"{lang}:{text}".encode()
+
+
+def test_split_sentences_joins_short_fragments():
+    text = "Hi. The weather is sunny today! Is it? Bring a hat and some water along. Ok."
+    assert split_sentences(text) == [
+        "Hi. The weather is sunny today!",
+        "Is it? Bring a hat and some water along. Ok.",
+    ]
+    assert split_sentences("  Short.  ") == ["Short."]
+    assert split_sentences("No terminal punctuation at all here") == ["No terminal punctuation at all here"]
+
+
+def test_stream_yields_sentences_in_order():
+    backend = FakeBackend()
+    speaker = Speaker(backend)
+    text = "The first sentence is here. The second sentence follows it."
+    assert list(speaker.stream(text)) == [
+        ("The first sentence is here.", b"en:The first sentence is here."),
+        ("The second sentence follows it.", b"en:The second sentence follows it."),
+    ]
+
+
+def test_repeated_phrases_hit_the_cache():
+    backend = FakeBackend()
+    speaker = Speaker(backend)
+    greeting = "Hello, how can I help you today?"
+    list(speaker.stream(f"{greeting} The answer is forty two."))
+    list(speaker.stream(f"{greeting}  The answer is\nforty two."))  # same text once whitespace is normalized
+    assert backend.calls == [(greeting, "en"), ("The answer is forty two.", "en")]
+    assert (speaker.cache.hits, speaker.cache.misses) == (2, 2)
+
+    speaker.synthesize(greeting, lang="fr")  # another language is another phrase
+    assert backend.calls[-1] == (greeting, "fr")
+
+
+def test_cache_evicts_least_recently_used_within_its_byte_budget():
+    backend = FakeBackend()
+    speaker = Speaker(backend, cache=AudioCache(max_bytes=30))
+    for phrase in ["aaaaaaaa", "bbbbbbbb", "aaaaaaaa", "cccccccc"]:  # 11 bytes of audio each
+        speaker.synthesize(phrase)
+    assert speaker.cache.size <= 30
+    speaker.synthesize("aaaaaaaa")
+    speaker.synthesize("bbbbbbbb")
+    assert [text for text, _ in backend.calls] == ["aaaaaaaa", "bbbbbbbb", "cccccccc", "bbbbbbbb"]
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "projects", "Walmart-Sales-Data-Analysis--SQL-Project"))
+
+from walmart_db import CSV_PATH, WalmartDB  # noqa: E402
+
+pytest.importorskip("duckdb")
+
+
+def test_sqlite_load_matches_duckdb():
+    lite = WalmartDB("sqlite").load_csv()
+    duck = WalmartDB("duckdb").load_csv()
+    for name in ["revenue_by_month", "cogs_by_month", "avg_rating_by_branch", "top_vat_city"]:
+        pd.testing.assert_frame_equal(lite.query(name), duck.query(name), check_dtype=False)
+    assert lite.query_sql("SELECT typeof(total), typeof(quantity) FROM sales LIMIT 1").values.tolist() == [["real", "integer"]]
+
+
+@pytest.fixture(params=["duckdb", "sqlite"])
+def backend(request):
+    return request.param
+
+
+def test_repeated_invoice_keeps_first_row_in_batch(backend):
+    from rollups import SalesRollups
+
+    df = pd.read_csv(CSV_PATH, nrows=50)
+    repeat = df.iloc[[0]].assign(Total=df["Total"].iloc[0] + 1_000)
+    batch = pd.concat([df.iloc[:25], repeat, df.iloc[25:]], ignore_index=True)
+    store = SalesRollups(WalmartDB(backend))
+    assert store.append(batch) == 50
+    total = store.con.execute("SELECT total FROM rollups WHERE grouping = 'all'").fetchone()[0]
+    assert total == pytest.approx(df["Total"].sum())
+
+
+def test_rollups_over_loaded_db_are_rebuilt(backend):
+    from rollups import SalesRollups
+
+    db = WalmartDB(backend).load_csv()
+    expected = db.query("revenue_by_month")
+    store = SalesRollups(db)
+    pd.testing.assert_frame_equal(store.report("revenue_by_month"), expected, check_dtype=False)
+    assert store.append(pd.read_csv(CSV_PATH, nrows=100)) == 0
+    pd.testing.assert_frame_equal(store.report("revenue_by_month"), expected, check_dtype=False)
+
+
+def test_loading_twice_appends(backend):
+    from rollups import SalesRollups
+
+    df = pd.read_csv(CSV_PATH, nrows=40)
+    db = WalmartDB(backend).load_frame(df)
+    db.load_frame(df.iloc[:10])
+    db.load_csv()
+    assert db.query_sql("SELECT COUNT(*) AS n FROM sales")["n"][0] == 1050
+    assert db.query_sql("SELECT COUNT(*) AS n FROM sales WHERE product_category IS NULL")["n"][0] == 0
+
+    unfinalized = WalmartDB(backend).load_frame(df.iloc[:10], finalize=False)
+    assert SalesRollups(unfinalized).append(df) == 30
+
+    store = SalesRollups(WalmartDB(backend))
+    store.append(df)  # creates sales, with product_category
+    store.db.load_frame(df.iloc[:10])
+    assert store.db.query_sql("SELECT COUNT(*) AS n FROM sales")["n"][0] == 50